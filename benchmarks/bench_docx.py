@@ -0,0 +1,111 @@
+"""
+Compare memory usage (peak RSS) and latency of in-memory transcription docx
+rendering with previous NamedTemporaryFile based implementation.
+
+Run from repository root:
+
+    python benchmarks/bench_docx.py --words 10000 50000
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, "testproject")]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testproject.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from docx import Document as docx_document  # noqa: E402
+from wagtail_transcription.views.mixins import ProcessTranscriptionMixin  # noqa: E402
+
+from payloads import make_words  # noqa: E402
+from rss import measure_rss, run_child  # noqa: E402
+
+
+class TempfileDocxRenderer(ProcessTranscriptionMixin):
+    """
+    Previous implementation, document was saved to temporary file
+    and read back into memory
+    """
+
+    def create_transcript_docx(self, words: list) -> io.BytesIO:
+        document = docx_document()
+        with tempfile.NamedTemporaryFile() as tmp:
+            for phrase in self.phreses_generator(words):
+                start_paragraph = document.add_paragraph()
+                run = start_paragraph.add_run(str(phrase.get("start")))
+                run.bold = True
+                document.add_paragraph(phrase.get("text") + "\n")
+
+            document.save(tmp.name)
+            io_output = io.BytesIO(tmp.read())
+
+        return io_output
+
+
+RENDERERS = {
+    "tempfile": TempfileDocxRenderer,
+    "in-memory": ProcessTranscriptionMixin,
+}
+
+
+def measure(renderer: ProcessTranscriptionMixin, words: list) -> dict:
+    started = time.perf_counter()
+    output = renderer.create_transcript_docx(words)
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "size_kib": len(output.getbuffer()) / 2**10,
+    }
+
+
+def measure_peak_in_child(name: str, count: int) -> float:
+    """
+    Peak RSS growth of single rendering in new process, lxml allocations
+    are not visible to tracemalloc
+    """
+
+    return run_child(__file__, ["--child", name, str(count)])["peak_mib"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        name, count = args.child
+        renderer, words = RENDERERS[name](), make_words(int(count))
+        peak_mib = measure_rss(lambda: renderer.create_transcript_docx(words))
+        print(json.dumps({"peak_mib": peak_mib}))
+        return
+
+    renderers = {name: renderer() for name, renderer in RENDERERS.items()}
+    print(f"{'words':>8} {'renderer':>10} {'seconds':>9} {'peak MiB':>9} {'KiB':>8}")
+    for count in args.words:
+        words = make_words(count)
+        for name, renderer in renderers.items():
+            # keep best run to reduce noise
+            result = min(
+                (measure(renderer, words) for _ in range(args.repeat)),
+                key=lambda r: r["seconds"],
+            )
+            result["peak_mib"] = measure_peak_in_child(name, count)
+            print(
+                f"{count:>8} {name:>10} {result['seconds']:>9.3f} "
+                f"{result['peak_mib']:>9.1f} {result['size_kib']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare phrase segmentation engine with previous string concatenation
+based phreses_generator on very long transcripts.
+
+Run from repository root:
+
+    python benchmarks/bench_phrases.py --words 10000 100000 1000000
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from wagtail_transcription.segmentation import PhraseSegmenter  # noqa: E402
+
+from payloads import make_words  # noqa: E402
+
+
+def legacy_phreses_generator(words: list):
+    """
+    Previous implementation of ProcessTranscriptionMixin.phreses_generator
+    """
+
+    phrase = {}
+    for word in words:
+        if phrase.get("speaker") != word["speaker"]:
+            if phrase:
+                yield phrase
+            phrase = {
+                "start": str(datetime.timedelta(milliseconds=word["start"]))[:-4],
+                "speaker": word["speaker"],
+                "text": word["text"] or "",
+            }
+        elif phrase["speaker"] == word["speaker"]:
+            phrase["text"] += f" {word['text']}" if word["text"] else ""
+    if phrase:
+        yield phrase
+
+
+def measure(generator, words: list, repeat: int) -> tuple:
+    best, phrases = None, 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        phrases = sum(1 for _ in generator(words))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, phrases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--words", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--single-speaker",
+        action="store_true",
+        help="All words are spoken by one speaker (worst case for legacy generator)",
+    )
+    parser.add_argument(
+        "--no-legacy",
+        action="store_true",
+        help="Skip legacy generator (quadratic for single speaker with 1M words)",
+    )
+    args = parser.parse_args()
+
+    engines = {
+        "legacy": legacy_phreses_generator,
+        "default": PhraseSegmenter().segment,
+        "pause+length": PhraseSegmenter(pause_gap=1500, max_length=1000).segment,
+    }
+    if args.no_legacy:
+        del engines["legacy"]
+    print(f"{'words':>9} {'engine':>13} {'seconds':>9} {'words/s':>12} {'phrases':>8}")
+    for count in args.words:
+        words = make_words(count, speakers="A" if args.single_speaker else "AB")
+        for name, generator in engines.items():
+            seconds, phrases = measure(generator, words, args.repeat)
+            print(
+                f"{count:>9} {name:>13} {seconds:>9.3f} "
+                f"{count / seconds:>12,.0f} {phrases:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Synthetic AssemblyAi payloads used by benchmarks
+"""
+
+import random
+
+VOCABULARY = [
+    "transcription",
+    "video",
+    "wagtail",
+    "the",
+    "a",
+    "is",
+    "and",
+    "speaker",
+    "recording",
+    "of",
+]
+
+
+def make_words(count: int, seed: int = 0, speakers: str = "AB") -> list:
+    """
+    Create list of words in AssemblyAi format. Speaker changes
+    every ~50 words and there is a longer pause every ~20 words
+    """
+
+    rng = random.Random(seed)
+    words, start, speaker = [], 0, speakers[0]
+    for _ in range(count):
+        if rng.random() < 0.02:
+            speaker = rng.choice(speakers)
+        end = start + rng.randint(150, 600)
+        words.append(
+            {
+                "text": rng.choice(VOCABULARY),
+                "start": start,
+                "end": end,
+                "confidence": round(rng.uniform(0.5, 1), 5),
+                "speaker": speaker,
+            }
+        )
+        start = end + (rng.randint(800, 3000) if rng.random() < 0.05 else rng.randint(0, 300))
+    return words
+
+
+# approximate number of words spoken in recordings of different length
+# (about 150 words per minute)
+PAYLOAD_SIZES = {
+    "10min": 1500,
+    "1h": 9000,
+    "5h": 45000,
+}
+
+
+def make_payload(words_count: int, seed: int = 0) -> dict:
+    """
+    Create AssemblyAi transcript response (GET /v2/transcript/<id>)
+    with words_count words
+    """
+
+    words = make_words(words_count, seed=seed)
+    return {
+        "id": f"benchmark-{words_count}",
+        "status": "completed",
+        "language_code": "en_us",
+        "audio_url": "https://example.com/audio.webm",
+        "audio_duration": words[-1]["end"] // 1000 if words else 0,
+        "speaker_labels": True,
+        "confidence": 0.93,
+        "text": " ".join(word["text"] for word in words),
+        "words": words,
+        "error": None,
+    }
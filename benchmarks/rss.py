@@ -0,0 +1,84 @@
+"""
+Peak resident memory of benchmarked code. tracemalloc sees only Python
+allocations, so stages that spend memory in C libraries (lxml used by
+python-docx) are measured with RSS of separate process
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+
+STATM_PATH = "/proc/self/statm"
+
+
+def get_rss_mib() -> float:
+    """
+    Current RSS on Linux, peak RSS of process on other systems
+    """
+
+    if os.path.exists(STATM_PATH):
+        with open(STATM_PATH) as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, other systems KiB
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 2**10
+
+
+def release_free_memory() -> None:
+    """
+    Return memory freed by setup to system, so allocations of measured
+    code raise RSS instead of reusing it
+    """
+
+    libc_name = ctypes.util.find_library("c")
+    if libc_name is None:
+        return
+    libc = ctypes.CDLL(libc_name)
+    if hasattr(libc, "malloc_trim"):
+        libc.malloc_trim(0)
+
+
+def measure_rss(func, interval: float = 0.001) -> float:
+    """
+    Return growth of RSS (MiB) of current process while func runs. RSS
+    is sampled in background thread
+    """
+
+    release_free_memory()
+    before = peak = get_rss_mib()
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not done.wait(interval):
+            peak = max(peak, get_rss_mib())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        func()
+    finally:
+        done.set()
+        sampler.join()
+    return round(max(peak, get_rss_mib()) - before, 3)
+
+
+def run_child(script: str, args: list) -> dict:
+    """
+    Run script in new interpreter and return JSON printed on its last
+    line of output
+    """
+
+    completed = subprocess.run(
+        [sys.executable, script, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
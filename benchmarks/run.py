@@ -0,0 +1,299 @@
+"""
+Benchmark suite for transcription pipeline. Every stage of processing
+received transcription is timed and memory profiled with synthetic
+AssemblyAi payloads of realistic sizes. Peak memory is measured with
+tracemalloc, except stages that create docx (lxml allocates outside of
+Python), their peak is growth of RSS measured in separate process.
+
+Run from repository root:
+
+    python benchmarks/run.py                # print results
+    python benchmarks/run.py --compare      # compare with baseline.json
+    python benchmarks/run.py --save         # update baseline.json
+"""
+
+import argparse
+from functools import cached_property
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+sys.path[:0] = [ROOT_DIR, os.path.join(ROOT_DIR, "testproject")]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testproject.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.files.base import File  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.template import loader  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from unittest import mock  # noqa: E402
+
+from wagtail_transcription.models import Transcription  # noqa: E402
+from wagtail_transcription.views import ReceiveTranscriptionView  # noqa: E402
+from wagtail_transcription.views.mixins import ProcessTranscriptionMixin  # noqa: E402
+
+from payloads import PAYLOAD_SIZES, make_payload  # noqa: E402
+from rss import measure_rss, run_child  # noqa: E402
+
+VIDEO_ID = "aaaaaaaaaaa"
+
+
+class Pipeline:
+    """
+    Prepared inputs of every stage, so each stage measures only its own work
+    """
+
+    def __init__(self, words_count: int, user):
+        self.user = user
+        self.payload = make_payload(words_count)
+        self.mixin = ProcessTranscriptionMixin()
+        self.transcription, _ = Transcription.objects.get_or_create(
+            video_id=VIDEO_ID,
+            defaults={"title": f"auto_transcription-{VIDEO_ID}"},
+        )
+        self.client = Client()
+        self.url = reverse(
+            "wagtail_transcription:receive_transcription",
+            kwargs={"video_id": VIDEO_ID, "user_id": user.id},
+        )
+
+    # inputs are created only when needed, so they do not raise peak
+    # RSS of process that measures other stage
+
+    @cached_property
+    def raw(self) -> bytes:
+        return json.dumps(self.payload).encode("utf-8")
+
+    @cached_property
+    def docx(self) -> bytes:
+        return self.mixin.create_transcript_docx(self.payload["words"]).getvalue()
+
+    def decode(self):
+        json.loads(self.raw.decode("utf-8"))
+
+    def phrases_generator(self):
+        for _ in self.mixin.phreses_generator(self.payload["words"]):
+            pass
+
+    def create_docx(self):
+        self.mixin.create_transcript_docx(self.payload["words"])
+
+    def save_file(self):
+        self.transcription.file.save(
+            f"auto_transcription-{VIDEO_ID}.docx",
+            File(io.BytesIO(self.docx)),
+            save=False,
+        )
+
+    def render_notification(self):
+        loader.render_to_string(
+            "wagtail_transcription/components/transcription_received_popup.html",
+            context={"transcription": self.transcription, "video_id": VIDEO_ID},
+        )
+
+    def receive_request(self):
+        Transcription.objects.filter(video_id=VIDEO_ID).update(
+            status=Transcription.STATUS_SUBMITTED
+        )
+        with mock.patch.object(
+            ReceiveTranscriptionView, "get_transcription", return_value=self.payload
+        ):
+            response = self.client.post(
+                self.url,
+                data=json.dumps({"status": "completed", "transcript_id": "benchmark"}),
+                content_type="application/json",
+            )
+        assert response.status_code in (200, 202), response.status_code
+
+
+STAGES = [
+    ("decode", Pipeline.decode),
+    ("phrases", Pipeline.phrases_generator),
+    ("docx", Pipeline.create_docx),
+    ("save", Pipeline.save_file),
+    ("notification", Pipeline.render_notification),
+    ("request", Pipeline.receive_request),
+]
+# stages measured with RSS in separate process
+RSS_STAGES = {"docx", "request"}
+
+
+def measure(func, repeat: int, peak_mib=None) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    if peak_mib is None:
+        # separate run, tracemalloc slows down measured code
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mib = round(peak / 2**20, 3)
+    return {
+        "seconds": round(statistics.median(timings), 6),
+        "peak_mib": peak_mib,
+    }
+
+
+def measure_rss_in_child(size: str, stage: str) -> float:
+    return run_child(__file__, ["--rss-child", size, stage])["peak_mib"]
+
+
+def run(sizes: list, stages: list, repeat: int) -> dict:
+    results = {}
+    user = get_user_model().objects.create_superuser(
+        username="benchmark", email="benchmark@example.com"
+    )
+    for size in sizes:
+        pipeline = Pipeline(PAYLOAD_SIZES[size], user)
+        results[size] = {}
+        for name, stage in STAGES:
+            if name in stages:
+                peak_mib = (
+                    measure_rss_in_child(size, name) if name in RSS_STAGES else None
+                )
+                results[size][name] = measure(
+                    lambda: stage(pipeline), repeat, peak_mib
+                )
+                print_row(size, name, results[size][name])
+    return results
+
+
+def run_rss_child(size: str, stage: str) -> dict:
+    """
+    Measure peak RSS of single stage run in this (fresh) process
+    """
+
+    user = get_user_model().objects.create_superuser(
+        username="benchmark", email="benchmark@example.com"
+    )
+    pipeline = Pipeline(PAYLOAD_SIZES[size], user)
+    func = dict(STAGES)[stage]
+    return {"peak_mib": measure_rss(lambda: func(pipeline))}
+
+
+def test_environment(func, *args):
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            MEDIA_ROOT=media_root,
+            TRANSCRIPTION_BACKGROUND_PROCESSING=False,
+        ):
+            return func(*args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def print_row(size: str, stage: str, result: dict, baseline: dict = None) -> None:
+    row = f"{size:>6} {stage:>13} {result['seconds']:>10.4f} {result['peak_mib']:>9.2f}"
+    if baseline:
+        ratio = result["seconds"] / baseline["seconds"] if baseline["seconds"] else 1
+        row += f" {baseline['seconds']:>10.4f} {ratio:>6.2f}x"
+    print(row)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Return list of (size, stage, ratio) that are slower than threshold
+    """
+
+    print("\nComparison with baseline")
+    print(f"{'size':>6} {'stage':>13} {'seconds':>10} {'peak MiB':>9} {'baseline':>10} {'ratio':>7}")
+    regressions = []
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            base = baseline.get("results", {}).get(size, {}).get(stage)
+            print_row(size, stage, result, base)
+            if base and base["seconds"] and result["seconds"] / base["seconds"] > threshold:
+                regressions.append((size, stage, result["seconds"] / base["seconds"]))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", nargs="+", choices=list(PAYLOAD_SIZES), default=list(PAYLOAD_SIZES)
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=[name for name, _ in STAGES],
+        default=[name for name, _ in STAGES],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="Save results as baseline")
+    parser.add_argument(
+        "--compare", action="store_true", help="Compare results with baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="Slowdown ratio reported as regression when comparing (default 1.5)",
+    )
+    parser.add_argument("--rss-child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss_child:
+        if connection.vendor != "sqlite":
+            # sqlite test database is in memory, others would replace
+            # test database of parent process
+            connection.settings_dict["TEST"]["NAME"] = (
+                connection.creation._get_test_db_name() + "_rss"
+            )
+        print(json.dumps(test_environment(run_rss_child, *args.rss_child)))
+        return
+
+    print(f"{'size':>6} {'stage':>13} {'seconds':>10} {'peak MiB':>9}")
+    results = test_environment(run, args.sizes, args.stages, args.repeat)
+
+    if args.save:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(
+                {
+                    "meta": {
+                        "python": platform.python_version(),
+                        "django": django.get_version(),
+                        "machine": platform.machine(),
+                        "repeat": args.repeat,
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+
+    if args.compare:
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for size, stage, ratio in regressions:
+                print(f"  {size} {stage}: {ratio:.2f}x slower")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
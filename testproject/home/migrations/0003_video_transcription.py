@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 06:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_create_homepage'),
+        ('wagtail_transcription', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homepage',
+            name='transcription',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtail_transcription.transcription'),
+        ),
+        migrations.AddField(
+            model_name='homepage',
+            name='video_id',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
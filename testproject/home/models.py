@@ -1,7 +1,28 @@
 from django.db import models
 
+from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from wagtail.models import Page
 
+from wagtail_transcription.edit_handlers import VideoTranscriptionPanel
+from wagtail_transcription.models import Transcription
+
 
 class HomePage(Page):
-    pass
+    video_id = models.CharField(max_length=255, blank=True)
+    transcription = models.ForeignKey(
+        Transcription,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    content_panels = Page.content_panels + [
+        MultiFieldPanel(
+            [
+                VideoTranscriptionPanel("video_id", transcription_field="transcription"),
+                FieldPanel("transcription"),
+            ],
+            heading="Video and Transcription",
+        ),
+    ]
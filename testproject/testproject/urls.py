@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.contrib import admin
 
 from wagtail.admin import urls as wagtailadmin_urls
@@ -8,10 +8,14 @@ from wagtail.documents import urls as wagtaildocs_urls
 
 from search import views as search_views
 from wagtail_transcription import urls as wagtail_transcription_urls
+import notifications.urls
 
 urlpatterns = [
     path("django-admin/", admin.site.urls),
     path("admin/transcription/", include(wagtail_transcription_urls)),
+    re_path(
+        r"^inbox/notifications/", include(notifications.urls, namespace="notifications")
+    ),
     path("admin/", include(wagtailadmin_urls)),
     path("documents/", include(wagtaildocs_urls)),
     path("search/", search_views.search, name="search"),
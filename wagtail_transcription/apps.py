@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class WagtailTranscriptionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'wagtail_transcription'
+
+    def ready(self):
+        from . import signals  # noqa
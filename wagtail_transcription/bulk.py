@@ -0,0 +1,273 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.template import loader
+from notifications.signals import notify
+
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.submission import (
+    VIDEO_ID_REGEX,
+    get_audio_url,
+    get_parent_instance,
+    submit_transcription,
+)
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import csv
+import logging
+import threading
+from typing import Callable, Iterable, Iterator, Union
+
+RESULT_SUBMITTED = "submitted"
+RESULT_QUEUED = "queued"
+RESULT_VALID = "valid"
+RESULT_SKIPPED = "skipped"
+RESULT_FAILED = "failed"
+
+
+def parse_target(target: str) -> dict:
+    """
+    Parse "app_label.ModelName:field_name[:transcription_field]"
+    """
+
+    parts = target.split(":")
+    if len(parts) not in (2, 3):
+        raise ValueError(
+            f'Invalid target "{target}", use app_label.ModelName:field_name:transcription_field'
+        )
+    return {
+        "model": apps.get_model(parts[0]),
+        "field_name": parts[1],
+        "transcription_field": parts[2] if len(parts) == 3 else "transcription",
+    }
+
+
+def get_model_targets(
+    model, field_name: str, transcription_field: str = "transcription"
+) -> Iterator[dict]:
+    """
+    Yield targets for all instances of model that have video id
+    but do not have transcription yet
+    """
+
+    queryset = (
+        model.objects.exclude(**{f"{field_name}__isnull": True})
+        .exclude(**{field_name: ""})
+        .filter(**{f"{transcription_field}__isnull": True})
+        .order_by("pk")
+    )
+    for instance in queryset.iterator():
+        yield {
+            "parent_instance_str": f"{model._meta.app_label}:{model.__name__}:{instance.pk}",
+            "field_name": field_name,
+            "transcription_field": transcription_field,
+            "video_id": getattr(instance, field_name),
+        }
+
+
+def read_csv_targets(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Yield targets from csv with parent_instance_str ("app:model_name:instance_id"),
+    field_name, transcription_field and video_id columns. If video_id is
+    empty it is read from parent instance
+    """
+
+    for row in csv.DictReader(lines):
+        yield {
+            "parent_instance_str": (row.get("parent_instance_str") or "").strip(),
+            "field_name": (row.get("field_name") or "").strip(),
+            "transcription_field": (
+                row.get("transcription_field") or "transcription"
+            ).strip(),
+            "video_id": (row.get("video_id") or "").strip(),
+        }
+
+
+class BulkTranscription:
+    """
+    Validate and submit transcriptions of many videos with bounded pool
+    of threads. Videos that already have transcription are skipped, so
+    interrupted run can be simply started again
+    """
+
+    def __init__(
+        self,
+        user,
+        workers: Union[int, None] = None,
+        dry_run: bool = False,
+        progress_callback: Union[Callable, None] = None,
+    ):
+        self.user = user
+        self.workers = max(
+            1, workers or getattr(settings, "TRANSCRIPTION_BULK_WORKERS", 4)
+        )
+        self.dry_run = dry_run
+        self.progress_callback = progress_callback
+        self.counts = {
+            RESULT_SUBMITTED: 0,
+            RESULT_QUEUED: 0,
+            RESULT_VALID: 0,
+            RESULT_SKIPPED: 0,
+            RESULT_FAILED: 0,
+        }
+
+    def run(self, targets: Iterable[dict]) -> dict:
+        """
+        Process all targets and return number of targets for every result
+        """
+
+        seen_video_ids = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            for target in targets:
+                video_id = target.get("video_id")
+                if video_id and video_id in seen_video_ids:
+                    self.report(target, RESULT_SKIPPED, "Duplicated video id")
+                    continue
+                seen_video_ids.add(video_id)
+
+                if self.workers == 1:
+                    self.report(*self.process_target(target))
+                    continue
+                # do not read more targets than workers can process
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self.collect(done)
+                pending.add(executor.submit(self.process_in_thread, target))
+            self.collect(pending)
+        return self.counts
+
+    def collect(self, futures: Iterable) -> None:
+        for future in futures:
+            self.report(*future.result())
+
+    def report(self, target: dict, result: str, message: str = "") -> None:
+        self.counts[result] += 1
+        if self.progress_callback is not None:
+            self.progress_callback(target, result, message, self.counts)
+
+    def process_in_thread(self, target: dict) -> tuple:
+        close_old_connections()
+        try:
+            return self.process_target(target)
+        finally:
+            connection.close()
+
+    def process_target(self, target: dict) -> tuple:
+        try:
+            result, message = self.submit(target)
+        except Exception as e:
+            logging.exception("message")
+            result, message = RESULT_FAILED, str(e) or repr(e)
+        return target, result, message
+
+    def submit(self, target: dict) -> tuple:
+        """
+        Validate target and request transcription. Returns (result, message)
+        """
+
+        parent_instance = get_parent_instance(target.get("parent_instance_str"))
+        if parent_instance is None:
+            return RESULT_FAILED, "Parent instance does not exist"
+        field_name = target.get("field_name")
+        transcription_field = target.get("transcription_field")
+        try:
+            video_id = target.get("video_id") or getattr(parent_instance, field_name)
+            transcription = getattr(parent_instance, transcription_field)
+        except (AttributeError, TypeError):
+            return RESULT_FAILED, "Invalid field_name or transcription_field"
+
+        if not video_id:
+            return RESULT_SKIPPED, "No video id"
+        if not VIDEO_ID_REGEX.match(str(video_id)):
+            return RESULT_FAILED, f'Invalid video id "{video_id}"'
+        if transcription is not None:
+            return RESULT_SKIPPED, "Instance already has transcription"
+        if (
+            Transcription.objects.filter(video_id=video_id)
+            .exclude(status=Transcription.STATUS_FAILED)
+            .exists()
+        ):
+            return RESULT_SKIPPED, "Transcription for video already exists"
+
+        audio_url = get_audio_url(video_id)
+        if self.dry_run:
+            return RESULT_VALID, ""
+        transcription = submit_transcription(
+            parent_instance,
+            field_name,
+            transcription_field,
+            video_id,
+            audio_url,
+            self.user.id,
+        )
+        if transcription.status == Transcription.STATUS_FAILED:
+            return RESULT_FAILED, transcription.error
+        if transcription.status == Transcription.STATUS_QUEUED:
+            # submission limits are reached, it will be submitted later
+            return RESULT_QUEUED, ""
+        return RESULT_SUBMITTED, ""
+
+
+def get_progress_cache_key(user_id: int) -> str:
+    return f"wagtail_transcription:bulk_transcription:{user_id}"
+
+
+def get_progress(user_id: int) -> Union[dict, None]:
+    """
+    Return progress of last bulk transcription started by user in admin
+    """
+
+    return cache.get(get_progress_cache_key(user_id))
+
+
+def _run_in_background(user, targets: list, dry_run: bool) -> None:
+    cache_key = get_progress_cache_key(user.id)
+    progress = {"total": len(targets), "counts": {}, "finished": False}
+
+    def save_progress(target, result, message, counts):
+        progress["counts"] = dict(counts)
+        cache.set(cache_key, progress, 60 * 60 * 24)
+
+    try:
+        close_old_connections()
+        counts = BulkTranscription(
+            user, dry_run=dry_run, progress_callback=save_progress
+        ).run(targets)
+        notify.send(
+            sender=user,
+            recipient=user,
+            verb="Message",
+            description=loader.render_to_string(
+                "wagtail_transcription/components/bulk_transcription_popup.html",
+                context={"counts": counts, "dry_run": dry_run},
+            ),
+        )
+    except Exception:
+        logging.exception("message")
+    finally:
+        progress["finished"] = True
+        cache.set(cache_key, progress, 60 * 60 * 24)
+        connection.close()
+
+
+def start_bulk_transcription(user, targets: list, dry_run: bool = False) -> bool:
+    """
+    Process targets in background thread and notify user when all
+    of them are processed. Returns False if bulk transcription
+    started by user is still running
+    """
+
+    progress = get_progress(user.id)
+    if progress is not None and not progress["finished"]:
+        return False
+    cache.set(
+        get_progress_cache_key(user.id),
+        {"total": len(targets), "counts": {}, "finished": False},
+        60 * 60 * 24,
+    )
+    threading.Thread(
+        target=_run_in_background, args=(user, targets, dry_run), daemon=True
+    ).start()
+    return True
@@ -0,0 +1,272 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Tuple, Type, Union
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Raised without sending request when upstream host failed
+    too many times in a row
+    """
+
+
+class CircuitBreaker:
+    """
+    Count consecutive failures of single host. After failure_threshold
+    failures requests fail fast for reset_timeout seconds, then one
+    trial request is allowed to check if host is back
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def before_request(self, host: str) -> None:
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit for {host} is open")
+            # half open, let through one trial request
+            self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class HttpClient:
+    """
+    Shared requests session with keep-alive connection pool per host,
+    default timeouts, retries with exponential backoff and circuit
+    breaker per host
+    """
+
+    # retry only when request could not be delivered or upstream
+    # asked to try again later
+    retry_status_codes = (429, 502, 503, 504)
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 30),
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_size: int = 10,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+    ):
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self.breakers_lock = threading.Lock()
+
+        # POST is only retried on connection errors (when request
+        # was not sent), so it is not possible to submit it twice
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.retry_status_codes,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_breaker(self, host: str) -> Type[CircuitBreaker]:
+        with self.breakers_lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout
+                )
+            return self.breakers[host]
+
+    def request(self, method: str, url: str, **kwargs) -> Type[requests.Response]:
+        host = urlsplit(url).netloc
+        breaker = self.get_breaker(host)
+        breaker.before_request(host)
+
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def get(self, url: str, **kwargs) -> Type[requests.Response]:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Type[requests.Response]:
+        return self.request("POST", url, **kwargs)
+
+
+class AsyncHttpClient(HttpClient):
+    """
+    Version of HttpClient for async views based on httpx. Connection
+    errors are raised as requests exceptions, so callers can handle
+    both clients the same way
+    """
+
+    # methods that can be retried when upstream asks to try again later
+    idempotent_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 30),
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_size: int = 10,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+    ):
+        if httpx is None:
+            raise ImproperlyConfigured(
+                "Async views require httpx, install wagtail-transcription[async]"
+            )
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers = {}
+        self.breakers_lock = threading.Lock()
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.session = httpx.AsyncClient(
+            timeout=timeout,
+            # limits of client are ignored when transport is passed
+            transport=httpx.AsyncHTTPTransport(
+                # transport retries only failed connections, so request
+                # is never sent twice
+                retries=retries,
+                limits=httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size
+                ),
+            ),
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        host = urlsplit(url).netloc
+        breaker = self.get_breaker(host)
+        breaker.before_request(host)
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                raise requests.ConnectionError(str(e)) from e
+            if (
+                response.status_code not in self.retry_status_codes
+                or method not in self.idempotent_methods
+                or attempt == self.retries
+            ):
+                break
+            await asyncio.sleep(self.backoff_factor * 2**attempt)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def get(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("POST", url, **kwargs)
+
+
+def get_client_options() -> dict:
+    return {
+        "timeout": getattr(settings, "TRANSCRIPTION_HTTP_TIMEOUT", (3.05, 30)),
+        "retries": getattr(settings, "TRANSCRIPTION_HTTP_RETRIES", 3),
+        "backoff_factor": getattr(settings, "TRANSCRIPTION_HTTP_BACKOFF_FACTOR", 0.5),
+        "pool_size": getattr(settings, "TRANSCRIPTION_HTTP_POOL_SIZE", 10),
+        "failure_threshold": getattr(
+            settings, "TRANSCRIPTION_CIRCUIT_BREAKER_THRESHOLD", 5
+        ),
+        "reset_timeout": getattr(
+            settings, "TRANSCRIPTION_CIRCUIT_BREAKER_RESET_TIMEOUT", 30
+        ),
+    }
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+# httpx client can be used only in event loop in which it was created
+_async_http_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> Type[HttpClient]:
+    """
+    Return process wide HttpClient configured from settings
+    """
+
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(**get_client_options())
+        return _http_client
+
+
+def get_async_http_client() -> Type[AsyncHttpClient]:
+    """
+    Return AsyncHttpClient of running event loop configured from settings
+    """
+
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        client = _async_http_clients[loop] = AsyncHttpClient(**get_client_options())
+    return client
+
+
+@receiver(setting_changed)
+def reset_http_client(setting: str, **kwargs) -> None:
+    global _http_client
+    if setting.startswith("TRANSCRIPTION_HTTP_") or setting.startswith(
+        "TRANSCRIPTION_CIRCUIT_BREAKER_"
+    ):
+        _http_client = None
+        _async_http_clients.clear()
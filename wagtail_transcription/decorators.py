@@ -1,16 +1,31 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.contrib.auth import REDIRECT_FIELD_NAME
 from django.contrib.auth.decorators import user_passes_test
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import resolve_url
 from django.template import loader
 from django.db.models import Q
 from django.db.models.functions import Lower
-from typing import List, Type, Callable, Union
+from typing import List, Tuple, Type, Callable, Union
 from django.http import HttpRequest, JsonResponse, HttpResponse
 from functools import wraps
 
 from django.apps import apps
 from .models import Transcription
+from .streams import get_stream_info
+from .timing import get_stage_timer
 import logging
 import pytube
+import warnings
+
+VIDEO_UNAVAILABLE_EXCEPTIONS = (
+    pytube.exceptions.VideoUnavailable,
+    pytube.exceptions.LiveStreamError,
+    pytube.exceptions.AgeRestrictedError,
+    pytube.exceptions.VideoRegionBlocked,
+    pytube.exceptions.MembersOnly,
+    pytube.exceptions.VideoPrivate,
+)
 
 
 def get_error_response(
@@ -37,13 +52,12 @@ def get_error_response(
     )
 
 
-def video_data_validation(
+def video_instance_validation(
     view_func: Type[Callable],
-) -> Type[JsonResponse]:
+) -> Type[Callable]:
     """
-    This decorator validate if video with specified id
-    is valid. If data is valid it pass additional YouTube
-    instance argument to function
+    This decorator validate if parent instance exists and if
+    transcription of video was not requested yet
     """
 
     @wraps(view_func)
@@ -53,72 +67,203 @@ def video_data_validation(
         **kwargs,
     ) -> Type[JsonResponse]:
 
-        data = request.POST
-        # get app name and model name if it exists
-        try:
-            app, model, instance_id = data.get("parent_instance_str").split(":")
-            model = apps.get_model(app, model)
-        except (AttributeError, ValueError, LookupError):
-            logging.exception("message")
-            # If there is error independent from user display easy error message
-            return get_error_response(
-                request,
-                "base.html",
-                msg="""Something went wrong. 
-                Please try again or upload transcription manually""",
-            )
-
-        # check if parent_instance has 'transcription_field' field
-        try:
-            parent_instance = model.objects.get(id=str(instance_id))
-            getattr(parent_instance, data.get("transcription_field"))
-        except (AttributeError, ValueError, LookupError):
-            logging.exception("message")
-            # If there is error independent from user display easy error message
-            return get_error_response(
-                request,
-                "no_parent_instance.html",
-                model_name=model.__name__,
-            )
-
-        # check if transcription for video with same id exists
-        # or is currently running
-        if Transcription.objects.filter(video_id=data.get("video_id")).exists():
-            return get_error_response(
-                request,
-                "same_video_transcription.html",
-                video_id=data.get("video_id"),
-            )
-
-        # try to get YouTube instance
-        try:
-            yt = pytube.YouTube(
-                f'https://www.youtube.com/watch?v={data.get("video_id")}'
-            )
-        except (pytube.exceptions.RegexMatchError):
-            logging.exception("message")
-            return get_error_response(request, "invalid_video_id.html")
-
-        try:
-            # check if can find audio url for specified video
-            if not yt.streams:
-                raise pytube.exceptions.VideoUnavailable
-        except (
-            pytube.exceptions.VideoUnavailable,
-            pytube.exceptions.LiveStreamError,
-            pytube.exceptions.AgeRestrictedError,
-            pytube.exceptions.VideoRegionBlocked,
-            pytube.exceptions.MembersOnly,
-            pytube.exceptions.VideoPrivate,
-        ) as e:
-            logging.exception("message")
-            return get_error_response(request, "base.html", msg=str(e))
+        with get_stage_timer(request).stage("db"):
+            error_response = validate_video_instance(request)
+        if error_response is not None:
+            return error_response
+        return view_func(request, *args, **kwargs)
+
+    return _wrap
+
+
+def video_data_validation(
+    view_func: Type[Callable],
+) -> Type[Callable]:
+    """
+    Deprecated, use get_video_stream in view instead. This decorator
+    validate if audio of video is available and pass additional
+    YouTube instance argument to function
+    """
+
+    warnings.warn(
+        "video_data_validation is deprecated, use get_video_stream instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+
+    @wraps(view_func)
+    def _wrap(
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
 
+        yt, error_response = get_youtube_instance(request, request.POST.get("video_id"))
+        if error_response is not None:
+            return error_response
         return view_func(request, yt, *args, **kwargs)
 
+    return video_instance_validation(_wrap)
+
+
+def async_video_instance_validation(
+    view_func: Type[Callable],
+) -> Type[Callable]:
+    """
+    Version of video_instance_validation decorator for async views,
+    database is checked with async ORM
+    """
+
+    @wraps(view_func)
+    async def _wrap(
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+
+        with get_stage_timer(request).stage("db"):
+            error_response = await avalidate_video_instance(request)
+        if error_response is not None:
+            return error_response
+        return await view_func(request, *args, **kwargs)
+
     return _wrap
 
 
+def validate_video_instance(
+    request: Type[HttpRequest],
+) -> Union[JsonResponse, None]:
+    """
+    Return error response if parent instance is invalid or
+    transcription of video already exists
+    """
+
+    data = request.POST
+    # get app name and model name if it exists
+    try:
+        app, model, instance_id = data.get("parent_instance_str").split(":")
+        model = apps.get_model(app, model)
+    except (AttributeError, ValueError, LookupError):
+        logging.exception("message")
+        # If there is error independent from user display easy error message
+        return get_error_response(
+            request,
+            "base.html",
+            msg="""Something went wrong.
+            Please try again or upload transcription manually""",
+        )
+
+    # check if parent_instance has 'transcription_field' field
+    try:
+        parent_instance = model.objects.get(id=str(instance_id))
+        getattr(parent_instance, data.get("transcription_field"))
+    except (AttributeError, ValueError, LookupError):
+        logging.exception("message")
+        # If there is error independent from user display easy error message
+        return get_error_response(
+            request,
+            "no_parent_instance.html",
+            model_name=model.__name__,
+        )
+
+    # check if transcription for video with same id exists
+    # or is currently running, failed transcription can be requested again
+    if (
+        Transcription.objects.filter(video_id=data.get("video_id"))
+        .exclude(status=Transcription.STATUS_FAILED)
+        .exists()
+    ):
+        return get_error_response(
+            request,
+            "same_video_transcription.html",
+            video_id=data.get("video_id"),
+        )
+    return None
+
+
+async def avalidate_video_instance(
+    request: Type[HttpRequest],
+) -> Union[JsonResponse, None]:
+    """
+    Async version of validate_video_instance
+    """
+
+    data = request.POST
+    try:
+        app, model, instance_id = data.get("parent_instance_str").split(":")
+        model = apps.get_model(app, model)
+    except (AttributeError, ValueError, LookupError):
+        logging.exception("message")
+        return get_error_response(
+            request,
+            "base.html",
+            msg="""Something went wrong.
+            Please try again or upload transcription manually""",
+        )
+
+    try:
+        parent_instance = await model.objects.aget(id=str(instance_id))
+        # related transcription is loaded from database
+        await sync_to_async(getattr)(parent_instance, data.get("transcription_field"))
+    except (AttributeError, ValueError, LookupError):
+        logging.exception("message")
+        return get_error_response(
+            request,
+            "no_parent_instance.html",
+            model_name=model.__name__,
+        )
+
+    if (
+        await Transcription.objects.filter(video_id=data.get("video_id"))
+        .exclude(status=Transcription.STATUS_FAILED)
+        .aexists()
+    ):
+        return get_error_response(
+            request,
+            "same_video_transcription.html",
+            video_id=data.get("video_id"),
+        )
+    return None
+
+
+def get_youtube_instance(
+    request: Type[HttpRequest], video_id: str
+) -> Tuple[Union[pytube.YouTube, None], Union[JsonResponse, None]]:
+    """
+    Deprecated, use get_video_stream instead. Return (YouTube instance, None)
+    if audio of video is available or (None, error response)
+    """
+
+    warnings.warn(
+        "get_youtube_instance is deprecated, use get_video_stream instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    _, error_response = get_video_stream(request, video_id)
+    if error_response is not None:
+        return None, error_response
+    return pytube.YouTube(f"https://www.youtube.com/watch?v={video_id}"), None
+
+
+def get_video_stream(
+    request: Type[HttpRequest], video_id: str
+) -> Tuple[Union[dict, None], Union[JsonResponse, None]]:
+    """
+    Return ({"audio_url", "length"}, None) if audio of video is available
+    or (None, error response). Resolved stream is cached until its url
+    expires
+    """
+
+    try:
+        return get_stream_info(video_id), None
+    except pytube.exceptions.RegexMatchError:
+        logging.exception("message")
+        return None, get_error_response(request, "invalid_video_id.html")
+    except VIDEO_UNAVAILABLE_EXCEPTIONS as e:
+        logging.exception("message")
+        return None, get_error_response(request, "base.html", msg=str(e))
+
+
 def staff_or_group_required(
     view_func: Union[Type[Callable], None] = None,
     redirect_field_name: str = REDIRECT_FIELD_NAME,
@@ -140,6 +285,41 @@ def staff_or_group_required(
         login_url=login_url,
         redirect_field_name=redirect_field_name,
     )
+    if view_func and iscoroutinefunction(view_func):
+        return _async_staff_or_group_required(
+            view_func, redirect_field_name, login_url, group_names
+        )
     if view_func:
         return actual_decorator(view_func)
     return actual_decorator
+
+
+def _async_staff_or_group_required(
+    view_func: Type[Callable],
+    redirect_field_name: str,
+    login_url: str,
+    group_names: List[int],
+) -> Type[Callable]:
+    """
+    staff_or_group_required for async views, user_passes_test supports
+    them only since Django 5.1
+    """
+
+    def test_func(user) -> bool:
+        return user.is_active and (
+            user.is_staff
+            or user.groups.annotate(lower_name=Lower("name"))
+            .filter(Q(lower_name__in=[g.lower() for g in group_names]))
+            .exists()
+        )
+
+    @wraps(view_func)
+    async def _wrap(request: Type[HttpRequest], *args, **kwargs):
+        user = await request.auser()
+        if await sync_to_async(test_func)(user):
+            return await view_func(request, *args, **kwargs)
+        return redirect_to_login(
+            request.get_full_path(), resolve_url(login_url), redirect_field_name
+        )
+
+    return _wrap
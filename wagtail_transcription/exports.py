@@ -0,0 +1,187 @@
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.payloads import load_raw_payload
+from wagtail_transcription.segmentation import PhraseSegmenter, format_timestamp
+
+import hashlib
+import html
+import json
+from typing import Iterable, Type, Union
+
+# change to generate all exports again after renderers changed
+EXPORT_VERSION = 1
+EXPORTS_DIRECTORY = "transcription_exports"
+
+
+def format_subtitle_timestamp(milliseconds: int, separator: str) -> str:
+    """
+    Format milliseconds as "HH:MM:SS,mmm" (SRT) or "HH:MM:SS.mmm" (WebVTT)
+    """
+
+    seconds, milliseconds = divmod(int(milliseconds), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+def render_srt(phrases: Iterable[dict]) -> str:
+    cues = []
+    for number, phrase in enumerate(phrases, start=1):
+        start = format_subtitle_timestamp(phrase["start_ms"], ",")
+        end = format_subtitle_timestamp(phrase["end_ms"], ",")
+        cues.append(f"{number}\n{start} --> {end}\n{phrase['text']}\n")
+    return "\n".join(cues)
+
+
+def render_vtt(phrases: Iterable[dict]) -> str:
+    cues = ["WEBVTT\n"]
+    for phrase in phrases:
+        start = format_subtitle_timestamp(phrase["start_ms"], ".")
+        end = format_subtitle_timestamp(phrase["end_ms"], ".")
+        # cue text can not contain &, < and > (nor "-->") unescaped
+        text = html.escape(phrase["text"], quote=False)
+        if phrase.get("speaker"):
+            # voice span keeps speaker of phrase
+            text = f"<v {html.escape(phrase['speaker'], quote=False)}>{text}"
+        cues.append(f"{start} --> {end}\n{text}\n")
+    return "\n".join(cues)
+
+
+def render_txt(phrases: Iterable[dict]) -> str:
+    return "\n".join(
+        f"{format_timestamp(phrase['start_ms'])}\n{phrase['text']}\n"
+        for phrase in phrases
+    )
+
+
+def render_json(phrases: Iterable[dict]) -> str:
+    return json.dumps(
+        [
+            {
+                "start_ms": phrase["start_ms"],
+                "end_ms": phrase["end_ms"],
+                "speaker": phrase.get("speaker") or "",
+                "text": phrase["text"],
+            }
+            for phrase in phrases
+        ],
+        ensure_ascii=False,
+    )
+
+
+# format: (renderer, content type, file extension)
+EXPORT_FORMATS = {
+    "srt": (render_srt, "application/x-subrip; charset=utf-8", "srt"),
+    "vtt": (render_vtt, "text/vtt; charset=utf-8", "vtt"),
+    "txt": (render_txt, "text/plain; charset=utf-8", "txt"),
+    "json": (render_json, "application/json", "json"),
+}
+
+
+def get_export_key(
+    transcription: Type[Transcription], export_format: str, segmenter: PhraseSegmenter
+) -> str:
+    """
+    Hash identifying version of export, it changes when transcription
+    file or raw payload is replaced or phrases are segmented differently
+    """
+
+    source = ":".join(
+        str(part)
+        for part in (
+            EXPORT_VERSION,
+            export_format,
+            transcription.get_file_hash(),
+            transcription.raw_payload.name,
+            segmenter.pause_gap,
+            segmenter.max_length,
+        )
+    )
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def get_export_name(
+    transcription: Type[Transcription], export_format: str, key: str
+) -> str:
+    extension = EXPORT_FORMATS[export_format][2]
+    return f"{EXPORTS_DIRECTORY}/{transcription.video_id}/{key[:20]}.{extension}"
+
+
+def delete_exports(video_ids: Iterable[str]) -> None:
+    """
+    Delete all stored exports of videos, they are created again for
+    current transcript version when they are requested
+    """
+
+    storage = Transcription._meta.get_field("file").storage
+    for video_id in video_ids:
+        directory = f"{EXPORTS_DIRECTORY}/{video_id}"
+        try:
+            _, names = storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in names:
+            storage.delete(f"{directory}/{name}")
+
+
+def get_export_phrases(
+    transcription: Type[Transcription], segmenter: PhraseSegmenter
+) -> Union[list, None]:
+    """
+    Phrases of transcript segmented from stored raw payload or, for
+    transcriptions received before payloads were stored, from search
+    segments. None if transcription does not have any of them
+    """
+
+    payload = load_raw_payload(transcription)
+    if payload is not None:
+        return list(segmenter.segment(payload.get("words") or []))
+    segments = list(transcription.segments.order_by("position"))
+    if not segments:
+        return None
+    phrases = []
+    for segment, following in zip(segments, segments[1:] + [None]):
+        end_ms = segment.end_ms
+        if end_ms <= segment.start_ms and following is not None:
+            # segments indexed from docx know only start of phrase
+            end_ms = following.start_ms
+        phrases.append(
+            {
+                "start": format_timestamp(segment.start_ms),
+                "speaker": segment.speaker,
+                "text": segment.text,
+                "start_ms": segment.start_ms,
+                "end_ms": max(end_ms, segment.start_ms),
+            }
+        )
+    return phrases
+
+
+def get_export(
+    transcription: Type[Transcription],
+    export_format: str,
+    segmenter: PhraseSegmenter,
+    key: Union[str, None] = None,
+) -> Union[str, None]:
+    """
+    Return storage name of export, it is rendered and saved only if it
+    does not exist yet. None is returned if transcript is not available
+    """
+
+    storage = Transcription._meta.get_field("file").storage
+    key = key or get_export_key(transcription, export_format, segmenter)
+    name = get_export_name(transcription, export_format, key)
+    if storage.exists(name):
+        return name
+
+    phrases = get_export_phrases(transcription, segmenter)
+    if phrases is None:
+        return None
+    content = EXPORT_FORMATS[export_format][0](phrases).encode("utf-8")
+    return storage.save(name, ContentFile(content))
+
+
+def get_export_max_age() -> int:
+    return getattr(settings, "TRANSCRIPTION_EXPORT_MAX_AGE", 60 * 5)
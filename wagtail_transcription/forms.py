@@ -0,0 +1,67 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+from wagtail_transcription.bulk import get_model_targets, parse_target, read_csv_targets
+
+import io
+import itertools
+
+
+class BulkTranscriptionForm(forms.Form):
+    """
+    Form used to request transcriptions of many videos in admin
+    """
+
+    targets = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={"rows": 4}),
+        help_text=(
+            "One app_label.ModelName:field_name:transcription_field per line. "
+            "All instances with video id and without transcription are processed"
+        ),
+    )
+    csv_file = forms.FileField(
+        required=False,
+        help_text=(
+            "Csv file with parent_instance_str, field_name, "
+            "transcription_field and video_id columns"
+        ),
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        help_text="Only validate videos, do not request transcriptions",
+    )
+
+    def clean_targets(self) -> list:
+        try:
+            return [
+                parse_target(line.strip())
+                for line in self.cleaned_data["targets"].splitlines()
+                if line.strip()
+            ]
+        except (ValueError, LookupError) as e:
+            raise ValidationError(str(e))
+
+    def clean(self) -> dict:
+        cleaned_data = super().clean()
+        if not cleaned_data.get("targets") and not cleaned_data.get("csv_file"):
+            raise ValidationError("Specify targets or csv file")
+        return cleaned_data
+
+    def get_targets(self) -> list:
+        targets = itertools.chain.from_iterable(
+            get_model_targets(**target) for target in self.cleaned_data["targets"]
+        )
+        csv_file = self.cleaned_data.get("csv_file")
+        if csv_file:
+            lines = io.TextIOWrapper(csv_file.file, encoding="utf-8-sig")
+            targets = itertools.chain(targets, read_csv_targets(lines))
+        return list(targets)
+
+
+class TranscriptSearchForm(forms.Form):
+    """
+    Form used to search text of transcripts in admin
+    """
+
+    q = forms.CharField(label="Search transcripts", max_length=255)
@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from wagtail_transcription.models import StatusVersion, Transcription
+
+import time
+from typing import Union
+
+
+class TokenBucket:
+    """
+    Token bucket shared by all processes through Django cache (only if
+    cache backend is shared, LocMemCache keeps bucket per process).
+    Bucket holds at most capacity tokens and is refilled with capacity
+    tokens every period seconds
+    """
+
+    def __init__(self, key: str, capacity: int, period: float):
+        self.key = key
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+
+    def consume(self, tokens: int = 1) -> bool:
+        """
+        Take tokens from bucket. Returns False if there is not
+        enough tokens or bucket is locked by other process for too long
+        """
+
+        lock_key = f"{self.key}:lock"
+        for _ in range(50):
+            if cache.add(lock_key, True, 5):
+                break
+            time.sleep(0.01)
+        else:
+            return False
+
+        try:
+            now = time.time()
+            state = cache.get(self.key) or {"tokens": self.capacity, "updated": now}
+            available = min(
+                self.capacity,
+                state["tokens"] + (now - state["updated"]) * self.rate,
+            )
+            allowed = available >= tokens
+            if allowed:
+                available -= tokens
+            cache.set(
+                self.key,
+                {"tokens": available, "updated": now},
+                int(self.period * 2) + 1,
+            )
+            return allowed
+        finally:
+            cache.delete(lock_key)
+
+
+def get_submit_bucket() -> Union[TokenBucket, None]:
+    """
+    Bucket limiting requests to AssemblyAi to TRANSCRIPTION_SUBMIT_RATE
+    (number of requests, seconds) or None if rate is not limited
+    """
+
+    rate = getattr(settings, "TRANSCRIPTION_SUBMIT_RATE", None)
+    if not rate:
+        return None
+    capacity, period = rate
+    return TokenBucket("wagtail_transcription:submit_rate", capacity, period)
+
+
+def get_in_flight_count() -> int:
+    """
+    Number of transcriptions submitted to AssemblyAi that were not received
+    yet, including queued ones that are being submitted or wait for retry
+    """
+
+    return Transcription.objects.filter(
+        Q(status=Transcription.STATUS_SUBMITTED)
+        | Q(
+            status=Transcription.STATUS_QUEUED,
+            submit_attempts__gt=0,
+            next_submit_at__gt=timezone.now(),
+        )
+    ).count()
+
+
+def get_available_submissions(limit: int) -> int:
+    """
+    Number of transcriptions (at most limit) that can be submitted without
+    exceeding TRANSCRIPTION_MAX_IN_FLIGHT. Must be called in transaction,
+    other dispatchers wait until it ends, so transcriptions claimed in it
+    are counted by them
+    """
+
+    max_in_flight = getattr(settings, "TRANSCRIPTION_MAX_IN_FLIGHT", None)
+    if max_in_flight is None:
+        return limit
+    StatusVersion.objects.lock()
+    return max(0, min(limit, max_in_flight - get_in_flight_count()))
+
+
+def consume_submission_token() -> bool:
+    """
+    Take token of TRANSCRIPTION_SUBMIT_RATE for claimed transcription.
+    Returns False if rate limit is reached
+    """
+
+    bucket = get_submit_bucket()
+    return bucket is None or bucket.consume()
@@ -0,0 +1,113 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+
+from wagtail_transcription.bulk import (
+    BulkTranscription,
+    get_model_targets,
+    parse_target,
+    read_csv_targets,
+)
+
+import itertools
+
+
+class Command(BaseCommand):
+    """
+    Request transcriptions for many existing videos at once. Instances
+    that already have transcription are skipped, so command can be
+    started again after it was interrupted
+    """
+
+    help = "Validate and request transcriptions of many videos in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="*",
+            help=(
+                "app_label.ModelName:field_name[:transcription_field], "
+                "all instances with video id and without transcription are processed"
+            ),
+        )
+        parser.add_argument(
+            "--csv",
+            help=(
+                "Csv file with parent_instance_str, field_name, "
+                "transcription_field and video_id columns"
+            ),
+        )
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Username of user that will be notified about transcriptions",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of videos processed at the same time",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Process at most this number of targets",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only validate videos, do not request transcriptions",
+        )
+
+    def handle(self, *args, **options):
+        if not options["targets"] and not options["csv"]:
+            raise CommandError("Specify targets or --csv file")
+
+        try:
+            user = get_user_model().objects.get(
+                **{get_user_model().USERNAME_FIELD: options["user"]}
+            )
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" does not exist')
+
+        try:
+            models = [parse_target(target) for target in options["targets"]]
+        except (ValueError, LookupError) as e:
+            raise CommandError(str(e))
+
+        targets = itertools.chain.from_iterable(
+            get_model_targets(**target) for target in models
+        )
+        csv_file = None
+        if options["csv"]:
+            csv_file = open(options["csv"], newline="")
+            targets = itertools.chain(targets, read_csv_targets(csv_file))
+        if options["limit"] is not None:
+            targets = itertools.islice(targets, options["limit"])
+
+        bulk = BulkTranscription(
+            user,
+            workers=options["workers"],
+            dry_run=options["dry_run"],
+            progress_callback=self.report_progress,
+        )
+        try:
+            counts = bulk.run(targets)
+        finally:
+            if csv_file is not None:
+                csv_file.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{result}: {count}" for result, count in counts.items())
+            )
+        )
+
+    def report_progress(
+        self, target: dict, result: str, message: str, counts: dict
+    ) -> None:
+        processed = sum(counts.values())
+        line = f"[{processed}] {target.get('parent_instance_str')} {target.get('video_id') or ''}: {result}"
+        if message:
+            line += f" ({message})"
+        self.stdout.write(line)
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.search import index_transcript, read_docx_phrases
+
+import logging
+
+
+class Command(BaseCommand):
+    """
+    Store text of transcripts received before transcript search was
+    added (or of edited docx files), so they can be searched. Text is
+    read from transcription docx files
+    """
+
+    help = "Index text of transcription docx files for transcript search"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Index again transcriptions that already have stored text",
+        )
+
+    def handle(self, *args, **options):
+        transcriptions = Transcription.objects.filter(
+            status=Transcription.STATUS_DONE
+        ).exclude(file="")
+        if not options["all"]:
+            transcriptions = transcriptions.filter(segments__isnull=True)
+
+        indexed = failed = 0
+        for transcription in transcriptions.distinct().iterator():
+            try:
+                with transcription.file.open("rb") as file:
+                    segments = index_transcript(transcription, read_docx_phrases(file))
+            except Exception:
+                logging.exception("message")
+                failed += 1
+                continue
+            indexed += 1
+            self.stdout.write(f"Indexed {transcription.video_id}: {segments} phrases")
+        self.stdout.write(f"Indexed {indexed} transcriptions, {failed} failed")
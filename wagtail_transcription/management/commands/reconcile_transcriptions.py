@@ -0,0 +1,181 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.submission import notify_failed_submission
+
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import logging
+import time
+from typing import Type
+
+# statuses of finished AssemblyAi transcript, any other status (also
+# missing one) is checked again later
+FINISHED_TRANSCRIPT_STATUSES = ("completed", "error")
+
+
+class Command(BaseCommand):
+    """
+    Check status of submitted transcriptions that were not received by
+    webhook (e.g. webhook was lost during deploy or BASE_URL was wrong)
+    or were left in processing by dead worker and process finished ones
+    the same way as webhook does. Every transcription is checked with
+    exponential backoff
+    """
+
+    help = "Finish transcriptions whose webhook was lost or delayed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Maximum number of transcriptions checked in one run",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of transcriptions checked at the same time",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60.0,
+            help="Seconds between runs",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Check stale transcriptions once and exit",
+        )
+
+    def handle(self, *args, **options):
+        self.view_class = import_string(
+            getattr(
+                settings,
+                "RECEIVE_TRANSCRIPTION_VIEW",
+                "wagtail_transcription.views.ReceiveTranscriptionView",
+            )
+        )
+        try:
+            while True:
+                self.reconcile(options["batch_size"], options["concurrency"])
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping reconciliation")
+
+    def get_stale_transcriptions(self, batch_size: int) -> list:
+        """
+        Submitted transcriptions that were not received within
+        TRANSCRIPTION_RECONCILE_AFTER seconds and transcriptions left in
+        processing for more than TRANSCRIPTION_JOB_LOCK_TIMEOUT seconds
+        that are due to be checked
+        """
+
+        now = timezone.now()
+        reconcile_after = getattr(settings, "TRANSCRIPTION_RECONCILE_AFTER", 60 * 15)
+        lock_timeout = getattr(settings, "TRANSCRIPTION_JOB_LOCK_TIMEOUT", 600)
+        not_received = Q(status=Transcription.STATUS_SUBMITTED) & (
+            Q(
+                next_check_at__isnull=True,
+                submitted_at__lte=now - datetime.timedelta(seconds=reconcile_after),
+            )
+            | Q(next_check_at__lte=now)
+        )
+        not_finished = Q(
+            status__in=[Transcription.STATUS_PROCESSING, Transcription.STATUS_RENDERING],
+            processing_at__lt=now - datetime.timedelta(seconds=lock_timeout),
+        ) & (Q(next_check_at__isnull=True) | Q(next_check_at__lte=now))
+        return list(
+            Transcription.objects.filter(not_received | not_finished).order_by(
+                "submitted_at"
+            )[:batch_size]
+        )
+
+    def reconcile(self, batch_size: int, concurrency: int) -> None:
+        transcriptions = self.get_stale_transcriptions(batch_size)
+        if not transcriptions:
+            return
+        if concurrency <= 1:
+            results = map(self.safe_check, transcriptions)
+            self.report(results)
+            return
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            self.report(executor.map(self.check_in_thread, transcriptions))
+
+    def report(self, results) -> None:
+        for video_id, result in results:
+            self.stdout.write(f"Checked transcription {video_id}: {result}")
+
+    def check_in_thread(self, transcription: Type[Transcription]) -> tuple:
+        close_old_connections()
+        try:
+            return self.safe_check(transcription)
+        finally:
+            connection.close()
+
+    def safe_check(self, transcription: Type[Transcription]) -> tuple:
+        try:
+            return transcription.video_id, self.check(transcription)
+        except Exception:
+            logging.exception("message")
+            # failed check must not be repeated by every run
+            try:
+                self.schedule_next_check(transcription)
+            except Exception:
+                logging.exception("message")
+            return transcription.video_id, "error"
+
+    def check(self, transcription: Type[Transcription]) -> str:
+        """
+        Check transcript in AssemblyAi and finish transcription if it is
+        completed or failed. Returns result of check
+        """
+
+        max_attempts = getattr(settings, "TRANSCRIPTION_RECONCILE_MAX_ATTEMPTS", 10)
+        if not transcription.transcript_id or transcription.requested_by_id is None:
+            # transcription can not be checked, allow to request it again
+            self.fail(transcription, "Transcription was not received")
+            return "failed"
+
+        view = self.view_class()
+        transcription_response = view.get_transcription(transcription.transcript_id)
+        status = transcription_response.get("status")
+        if status not in FINISHED_TRANSCRIPT_STATUSES:
+            # pending, unknown or missing status, check again later
+            if transcription.check_attempts + 1 >= max_attempts:
+                self.fail(transcription, "Transcription was not finished in time")
+                return "failed"
+            self.schedule_next_check(transcription)
+            return status or "unknown"
+
+        # completed or error, process it like webhook would
+        return view.handle_transcription(
+            video_id=transcription.video_id,
+            user_id=transcription.requested_by_id,
+            status=status,
+            transcript_id=transcription.transcript_id,
+            transcription_response=transcription_response,
+        )
+
+    def fail(self, transcription: Type[Transcription], error: str) -> None:
+        # failed transcription can be requested again
+        transcription.set_status(Transcription.STATUS_FAILED, error=error)
+        if transcription.requested_by_id is not None:
+            notify_failed_submission(transcription, error)
+
+    def schedule_next_check(self, transcription: Type[Transcription]) -> None:
+        reconcile_after = getattr(settings, "TRANSCRIPTION_RECONCILE_AFTER", 60 * 15)
+        delay = min(reconcile_after * 2**transcription.check_attempts, 60 * 60 * 6)
+        Transcription.objects.filter(pk=transcription.pk).update(
+            check_attempts=transcription.check_attempts + 1,
+            next_check_at=timezone.now() + datetime.timedelta(seconds=delay),
+        )
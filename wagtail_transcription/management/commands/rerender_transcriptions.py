@@ -0,0 +1,172 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.dateparse import parse_date
+
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.rerender import (
+    OUTPUTS,
+    init_worker,
+    render_payload,
+    set_view,
+    write_results,
+)
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import itertools
+import os
+import time
+
+
+class Command(BaseCommand):
+    """
+    Render transcription files, search text and word timings again from
+    stored AssemblyAi payloads, e.g. after layout of docx changed.
+    Payloads are read and rendered in pool of processes, results are
+    written to database with bulk queries in batches
+    """
+
+    help = "Render stored transcriptions again from their raw payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes, 1 renders in this process",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of transcriptions written to database at once",
+        )
+        parser.add_argument(
+            "--outputs",
+            default=",".join(OUTPUTS),
+            help=f"Comma separated outputs to render ({', '.join(OUTPUTS)})",
+        )
+        parser.add_argument(
+            "--status",
+            action="append",
+            help="Render only transcriptions with status (default done)",
+        )
+        parser.add_argument(
+            "--since", help="Render only transcriptions created since YYYY-MM-DD"
+        )
+        parser.add_argument(
+            "--until", help="Render only transcriptions created before YYYY-MM-DD"
+        )
+        parser.add_argument(
+            "--tag", action="append", help="Render only transcriptions with tag"
+        )
+        parser.add_argument(
+            "--video-id", action="append", help="Render only transcription of video"
+        )
+
+    def handle(self, *args, **options):
+        outputs = [output.strip() for output in options["outputs"].split(",")]
+        unknown = set(outputs) - set(OUTPUTS)
+        if unknown:
+            raise CommandError(f"Unknown outputs: {', '.join(sorted(unknown))}")
+
+        transcriptions = self.get_queryset(options)
+        total = transcriptions.count()
+        self.stdout.write(f"Rendering {total} transcriptions")
+        if not total:
+            return
+
+        items = transcriptions.values_list("pk", "video_id", "raw_payload").iterator(
+            chunk_size=options["batch_size"]
+        )
+        render = partial(render_payload, outputs=outputs)
+        view_path = getattr(
+            settings,
+            "RECEIVE_TRANSCRIPTION_VIEW",
+            "wagtail_transcription.views.ReceiveTranscriptionView",
+        )
+        self.started = time.monotonic()
+        self.rendered = self.failed = 0
+        if options["workers"] <= 1:
+            set_view(view_path)
+            self.write(map(render, items), total, options["batch_size"])
+            return
+
+        # list of items is read before pool starts, so forked workers
+        # do not share database connection with this process
+        items = list(items)
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            initializer=init_worker,
+            initargs=(view_path,),
+        ) as executor:
+            self.write(
+                self.imap(executor, render, items, options["workers"] * 4),
+                total,
+                options["batch_size"],
+            )
+
+    def get_queryset(self, options):
+        transcriptions = Transcription.objects.filter(
+            status__in=options["status"] or [Transcription.STATUS_DONE]
+        ).exclude(raw_payload="")
+        for option, lookup in (("since", "gte"), ("until", "lt")):
+            if options[option]:
+                date = parse_date(options[option])
+                if date is None:
+                    raise CommandError(f"--{option} has to be date YYYY-MM-DD")
+                transcriptions = transcriptions.filter(
+                    **{f"created_at__date__{lookup}": date}
+                )
+        if options["tag"]:
+            transcriptions = transcriptions.filter(
+                tags__name__in=options["tag"]
+            ).distinct()
+        if options["video_id"]:
+            transcriptions = transcriptions.filter(video_id__in=options["video_id"])
+        return transcriptions.order_by("pk")
+
+    def imap(self, executor, func, items, window: int):
+        """
+        Ordered map over process pool that keeps at most window items
+        in flight, so payloads and results are not all held in memory
+        """
+
+        items = iter(items)
+        futures = deque(
+            executor.submit(func, item) for item in itertools.islice(items, window)
+        )
+        while futures:
+            result = futures.popleft().result()
+            for item in itertools.islice(items, 1):
+                futures.append(executor.submit(func, item))
+            yield result
+
+    def write(self, results, total: int, batch_size: int) -> None:
+        batch = []
+        for result in results:
+            if "error" in result:
+                self.failed += 1
+                self.stderr.write(
+                    f"Rendering {result['video_id']} failed: {result['error']}"
+                )
+            else:
+                batch.append(result)
+            if len(batch) >= batch_size:
+                self.flush(batch, total)
+                batch = []
+        self.flush(batch, total)
+
+    def flush(self, batch: list, total: int) -> None:
+        if batch:
+            write_results(batch)
+            self.rendered += len(batch)
+        elapsed = time.monotonic() - self.started
+        rate = self.rendered / elapsed if elapsed else 0
+        self.stdout.write(
+            f"Rendered {self.rendered}/{total} transcriptions, "
+            f"{self.failed} failed ({rate:.1f}/s)"
+        )
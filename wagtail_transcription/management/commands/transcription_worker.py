@@ -0,0 +1,130 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils.module_loading import import_string
+
+from wagtail_transcription.models import TranscriptionJob
+from wagtail_transcription.submission import submit_queued_transcriptions
+
+import logging
+import threading
+from typing import Type
+
+
+class Command(BaseCommand):
+    """
+    Process webhook deliveries recorded by ReceiveTranscriptionView when
+    TRANSCRIPTION_BACKGROUND_PROCESSING setting is enabled and outputs of
+    transcripts processed during webhook request
+    """
+
+    help = "Fetch, render, store and notify about received transcriptions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "TRANSCRIPTION_WORKER_CONCURRENCY", 1),
+            help="Number of jobs processed at the same time",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait before checking for new jobs",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process all pending jobs and exit",
+        )
+
+    def handle(self, *args, **options):
+        self.view_class = import_string(
+            getattr(
+                settings,
+                "RECEIVE_TRANSCRIPTION_VIEW",
+                "wagtail_transcription.views.ReceiveTranscriptionView",
+            )
+        )
+        self.stop_event = threading.Event()
+        concurrency = max(1, options["concurrency"])
+
+        threads = [
+            threading.Thread(
+                target=self.run_worker,
+                args=(options["poll_interval"], options["once"]),
+                name=f"transcription-worker-{i}",
+                daemon=True,
+            )
+            for i in range(concurrency)
+        ]
+        self.stdout.write(f"Starting {concurrency} transcription worker(s)")
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping transcription workers")
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+
+    def run_worker(self, poll_interval: float, once: bool) -> None:
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                job = TranscriptionJob.objects.claim()
+                if job is None:
+                    # submit transcriptions queued because of submission limits
+                    self.submit_queued()
+                    if once:
+                        break
+                    self.stop_event.wait(poll_interval)
+                    continue
+                self.process_job(job)
+                # received transcription is not in flight anymore
+                self.submit_queued()
+        finally:
+            connection.close()
+
+    def submit_queued(self) -> None:
+        try:
+            submitted = submit_queued_transcriptions()
+        except Exception:
+            logging.exception("message")
+            return
+        if submitted:
+            self.stdout.write(f"Submitted {submitted} queued transcription(s)")
+
+    def process_job(self, job: Type[TranscriptionJob]) -> None:
+        view = self.view_class()
+        try:
+            if job.kind == TranscriptionJob.KIND_OUTPUTS:
+                response_type = view.handle_outputs(job.video_id, job.transcript_id)
+            else:
+                response_type = view.handle_transcription(
+                    video_id=job.video_id,
+                    user_id=job.user_id,
+                    status=job.transcript_status,
+                    transcript_id=job.transcript_id,
+                    raise_errors=True,
+                )
+        except Exception as e:
+            logging.exception("message")
+            job.fail(repr(e))
+            if (
+                job.kind == TranscriptionJob.KIND_TRANSCRIPT
+                and job.status == TranscriptionJob.STATUS_FAILED
+            ):
+                # all attempts were used, keep failed transcription
+                view.fail_transcription(job.video_id, job.user_id, job.last_error)
+            return
+
+        job.complete()
+        self.stdout.write(
+            f"Processed {job.kind} of transcription {job.video_id}: {response_type}"
+        )
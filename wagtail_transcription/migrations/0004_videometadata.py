@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0003_transcriptionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=255, unique=True)),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('channel_title', models.CharField(blank=True, max_length=255)),
+                ('thumbnail', models.URLField(blank=True, max_length=500)),
+                ('duration', models.PositiveIntegerField(blank=True, null=True)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Video metadata',
+                'verbose_name_plural': 'Video metadata',
+            },
+        ),
+    ]
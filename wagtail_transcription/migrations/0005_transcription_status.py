@@ -0,0 +1,80 @@
+# Generated by Django 5.0.14 on 2026-10-18 06:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def set_status(apps, schema_editor):
+    Transcription = apps.get_model("wagtail_transcription", "Transcription")
+    Transcription.objects.filter(completed=True).update(
+        status="done", done_at=models.F("created_at")
+    )
+    # not completed legacy transcriptions were already sent to AssemblyAi
+    Transcription.objects.filter(completed=False).update(
+        status="submitted", submitted_at=models.F("created_at")
+    )
+    Transcription.objects.update(queued_at=models.F("created_at"))
+
+
+def set_completed(apps, schema_editor):
+    Transcription = apps.get_model("wagtail_transcription", "Transcription")
+    Transcription.objects.filter(status="done").update(completed=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0004_videometadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcription',
+            name='done_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='processing_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='queued_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='rendering_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('submitted', 'Submitted'), ('processing', 'Processing'), ('rendering', 'Rendering'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='submitted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(set_status, set_completed),
+        migrations.RemoveField(
+            model_name='transcription',
+            name='completed',
+        ),
+        migrations.AddIndex(
+            model_name='transcription',
+            index=models.Index(condition=models.Q(('status__in', ['queued', 'submitted', 'processing', 'rendering'])), fields=['status', 'video_id'], name='wagtail_transcription_active'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-18 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0006_transcription_submission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcription',
+            name='check_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='next_check_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='transcript_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+    ]
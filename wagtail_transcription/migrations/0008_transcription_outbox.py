@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0007_transcription_transcript_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcription',
+            name='next_submit_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transcription',
+            name='submit_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.14 on 2026-10-18 07:15
+
+import django.db.models.deletion
+import wagtail_transcription.models.segment
+from django.db import migrations, models
+
+SEARCH_INDEX_NAME = "wagtail_transcription_segment_search"
+
+
+def create_search_index(apps, schema_editor):
+    # tsvector column exists only on PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX {SEARCH_INDEX_NAME} ON "
+        "wagtail_transcription_transcriptsegment USING gin (search_vector)"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {SEARCH_INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0008_transcription_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('start_ms', models.PositiveIntegerField()),
+                ('end_ms', models.PositiveIntegerField()),
+                ('speaker', models.CharField(blank=True, max_length=255)),
+                ('text', models.TextField()),
+                ('search_vector', wagtail_transcription.models.segment.TranscriptSearchVectorField(editable=False, null=True)),
+                ('transcription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='segments', to='wagtail_transcription.transcription')),
+            ],
+            options={
+                'ordering': ['transcription', 'position'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='transcriptsegment',
+            constraint=models.UniqueConstraint(fields=('transcription', 'position'), name='wagtail_transcription_segment_position'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
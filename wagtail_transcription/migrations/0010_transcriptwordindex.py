@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 07:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0009_transcriptsegment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptWordIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('word_count', models.PositiveIntegerField(default=0)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('transcription', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='word_index', to='wagtail_transcription.transcription')),
+            ],
+            options={
+                'verbose_name': 'Transcript word index',
+                'verbose_name_plural': 'Transcript word indexes',
+            },
+        ),
+    ]
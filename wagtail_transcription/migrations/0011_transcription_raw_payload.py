@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0010_transcriptwordindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcription',
+            name='raw_payload',
+            field=models.FileField(blank=True, editable=False, upload_to='transcription_payloads'),
+        ),
+    ]
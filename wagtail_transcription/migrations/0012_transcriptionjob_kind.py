@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0011_transcription_raw_payload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcriptionjob',
+            name='kind',
+            field=models.CharField(choices=[('transcript', 'Transcript'), ('outputs', 'Transcript outputs')], default='transcript', max_length=16),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-18 08:09
+
+from django.db import migrations, models
+
+
+def create_status_version(apps, schema_editor):
+    StatusVersion = apps.get_model("wagtail_transcription", "StatusVersion")
+    StatusVersion.objects.create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_transcription', '0012_transcriptionjob_kind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_status_version, migrations.RunPython.noop),
+    ]
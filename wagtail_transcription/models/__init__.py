@@ -1 +1,6 @@
-from .transcription import Transcription  # noqa
+from .transcription import Transcription, TranscriptionQuerySet  # noqa
+from .job import TranscriptionJob  # noqa
+from .video_metadata import VideoMetadata  # noqa
+from .segment import TranscriptSegment  # noqa
+from .word_index import TranscriptWordIndex  # noqa
+from .status_version import StatusVersion  # noqa
@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+import datetime
+from typing import Union
+
+
+class TranscriptionJobQuerySet(models.QuerySet):
+    def claim(self) -> Union["TranscriptionJob", None]:
+        """
+        Lock and return first job that is ready to be processed. Jobs
+        left in running state by dead workers are claimed again after
+        TRANSCRIPTION_JOB_LOCK_TIMEOUT seconds
+        """
+
+        now = timezone.now()
+        lock_timeout = getattr(settings, "TRANSCRIPTION_JOB_LOCK_TIMEOUT", 600)
+        ready = Q(status=TranscriptionJob.STATUS_PENDING, available_at__lte=now) | Q(
+            status=TranscriptionJob.STATUS_RUNNING,
+            locked_at__lt=now - datetime.timedelta(seconds=lock_timeout),
+        )
+
+        with transaction.atomic():
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(ready)
+                .order_by("available_at", "id")
+                .first()
+            )
+            if job is None:
+                return None
+
+            # conditional update protects databases without row locks
+            claimed = self.filter(
+                pk=job.pk, status=job.status, locked_at=job.locked_at
+            ).update(
+                status=TranscriptionJob.STATUS_RUNNING,
+                locked_at=now,
+                attempts=job.attempts + 1,
+                updated_at=now,
+            )
+            if not claimed:
+                return None
+
+        job.status = TranscriptionJob.STATUS_RUNNING
+        job.locked_at = now
+        job.attempts += 1
+        return job
+
+
+class TranscriptionJob(models.Model):
+    """
+    Webhook delivery from AssemblyAi (or outputs of transcript received
+    by webhook) waiting to be processed by transcription_worker
+    management command
+    """
+
+    # fetch, render and store received transcript
+    KIND_TRANSCRIPT = "transcript"
+    # store raw payload, search segments and word index of transcript
+    # that was rendered while AssemblyAi waited for webhook response
+    KIND_OUTPUTS = "outputs"
+    KIND_CHOICES = [
+        (KIND_TRANSCRIPT, "Transcript"),
+        (KIND_OUTPUTS, "Transcript outputs"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(
+        max_length=16,
+        choices=KIND_CHOICES,
+        default=KIND_TRANSCRIPT,
+    )
+    video_id = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    transcript_id = models.CharField(max_length=255, blank=True)
+    # status of transcript reported by AssemblyAi ("completed", "error")
+    transcript_status = models.CharField(max_length=32, blank=True)
+
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TranscriptionJobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Transcription job"
+        verbose_name_plural = "Transcription jobs"
+        ordering = ["available_at", "id"]
+        indexes = [
+            models.Index(
+                fields=["status", "available_at"],
+                name="wagtail_transcription_job_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.video_id} ({self.status})"
+
+    def complete(self) -> None:
+        self.status = self.STATUS_DONE
+        self.locked_at = None
+        self.last_error = ""
+        self.save(update_fields=["status", "locked_at", "last_error", "updated_at"])
+
+    def fail(self, error: str) -> None:
+        """
+        Schedule job for retry with exponential backoff or mark it as
+        failed after TRANSCRIPTION_JOB_MAX_ATTEMPTS attempts
+        """
+
+        max_attempts = getattr(settings, "TRANSCRIPTION_JOB_MAX_ATTEMPTS", 5)
+        if self.attempts >= max_attempts:
+            self.status = self.STATUS_FAILED
+        else:
+            self.status = self.STATUS_PENDING
+            self.available_at = timezone.now() + datetime.timedelta(
+                seconds=30 * 2 ** (self.attempts - 1)
+            )
+        self.locked_at = None
+        self.last_error = error
+        self.save(
+            update_fields=[
+                "status",
+                "available_at",
+                "locked_at",
+                "last_error",
+                "updated_at",
+            ]
+        )
@@ -0,0 +1,46 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+from .transcription import Transcription
+
+
+class TranscriptSearchVectorField(SearchVectorField):
+    """
+    tsvector column on PostgreSQL. Other databases store nothing in it
+    and search segments text directly
+    """
+
+    def db_type(self, connection) -> str:
+        if connection.vendor == "postgresql":
+            return super().db_type(connection)
+        return models.TextField().db_type(connection)
+
+
+class TranscriptSegment(models.Model):
+    """
+    Phrase of received transcript stored as plain text, so transcripts
+    can be searched without reading docx files
+    """
+
+    transcription = models.ForeignKey(
+        Transcription, on_delete=models.CASCADE, related_name="segments"
+    )
+    position = models.PositiveIntegerField()
+    start_ms = models.PositiveIntegerField()
+    end_ms = models.PositiveIntegerField()
+    speaker = models.CharField(max_length=255, blank=True)
+    text = models.TextField()
+    # GIN index on PostgreSQL is created by migration
+    search_vector = TranscriptSearchVectorField(null=True, editable=False)
+
+    class Meta:
+        ordering = ["transcription", "position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["transcription", "position"],
+                name="wagtail_transcription_segment_position",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.transcription_id}:{self.position}"
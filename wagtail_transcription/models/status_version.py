@@ -0,0 +1,32 @@
+from django.db import models
+from django.db.models import F
+
+
+class StatusVersionQuerySet(models.QuerySet):
+    def get_version(self) -> int:
+        return self.filter(pk=1).values_list("version", flat=True).first() or 0
+
+    async def aget_version(self) -> int:
+        return await self.filter(pk=1).values_list("version", flat=True).afirst() or 0
+
+    def bump(self) -> None:
+        if not self.filter(pk=1).update(version=F("version") + 1):
+            # row is created by migration, it was deleted since
+            self.get_or_create(pk=1)
+
+    def lock(self) -> None:
+        # row stays locked until end of transaction
+        self.select_for_update().get_or_create(pk=1)
+
+
+class StatusVersion(models.Model):
+    """
+    Single row with number that is increased every time any
+    Transcription is changed. It is shared by all processes and reading
+    it is cheap, so clients can check for changes without listing
+    transcriptions
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+
+    objects = StatusVersionQuerySet.as_manager()
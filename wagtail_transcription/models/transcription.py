@@ -1,13 +1,64 @@
-from wagtail.documents.models import AbstractDocument
+from wagtail.documents.models import AbstractDocument, DocumentQuerySet
 from wagtail.admin.panels import FieldPanel
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
 from wagtail.snippets.models import register_snippet
 from django.core.exceptions import ValidationError
+from .status_version import StatusVersion
 import re
 
 
+STATUS_QUEUED = "queued"
+STATUS_SUBMITTED = "submitted"
+STATUS_PROCESSING = "processing"
+STATUS_RENDERING = "rendering"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+# transcriptions that are not finished yet
+IN_PROGRESS_STATUSES = [
+    STATUS_QUEUED,
+    STATUS_SUBMITTED,
+    STATUS_PROCESSING,
+    STATUS_RENDERING,
+]
+
+
+class TranscriptionQuerySet(DocumentQuerySet):
+    def in_progress(self) -> "TranscriptionQuerySet":
+        """
+        Transcriptions that are not done and did not fail. Served
+        by partial index on not finished transcriptions
+        """
+
+        return self.filter(status__in=IN_PROGRESS_STATUSES)
+
+    def update(self, **kwargs) -> int:
+        updated = super().update(**kwargs)
+        if updated:
+            # queryset updates (also bulk_update) do not send signals
+            transaction.on_commit(StatusVersion.objects.bump, using=self.db)
+        return updated
+
+
 @register_snippet
 class Transcription(AbstractDocument):
+    STATUS_QUEUED = STATUS_QUEUED
+    STATUS_SUBMITTED = STATUS_SUBMITTED
+    STATUS_PROCESSING = STATUS_PROCESSING
+    STATUS_RENDERING = STATUS_RENDERING
+    STATUS_DONE = STATUS_DONE
+    STATUS_FAILED = STATUS_FAILED
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_SUBMITTED, "Submitted"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_RENDERING, "Rendering"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
     video_id = models.CharField(
         max_length=255,
         blank=True,
@@ -15,13 +66,52 @@ class Transcription(AbstractDocument):
         unique=True,
     )
     verified = models.BooleanField(default=False)
-    completed = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+    )
+    # time of every status transition
+    queued_at = models.DateTimeField(default=timezone.now)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    processing_at = models.DateTimeField(null=True, blank=True)
+    rendering_at = models.DateTimeField(null=True, blank=True)
+    done_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    # stored so queued transcription can be submitted later
+    audio_url = models.URLField(max_length=2000, blank=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    # queued transcription is outbox of submissions to AssemblyAi,
+    # next_submit_at is lease of dispatcher or time of next retry
+    submit_attempts = models.PositiveIntegerField(default=0)
+    next_submit_at = models.DateTimeField(null=True, blank=True)
+
+    # id of transcript in AssemblyAi, used to check status of
+    # transcriptions that were not received by webhook
+    transcript_id = models.CharField(max_length=255, blank=True, db_index=True)
+    check_attempts = models.PositiveIntegerField(default=0)
+    next_check_at = models.DateTimeField(null=True, blank=True)
+
+    # compressed AssemblyAi transcript response, files derived from
+    # transcript can be created again without requesting AssemblyAi
+    raw_payload = models.FileField(
+        upload_to="transcription_payloads", blank=True, editable=False
+    )
+
+    objects = TranscriptionQuerySet.as_manager()
 
     panels = [
         FieldPanel("title"),
         FieldPanel("video_id"),
         FieldPanel("verified"),
-        FieldPanel("completed"),
+        FieldPanel("status"),
         FieldPanel("file"),
         FieldPanel("tags"),
     ]
@@ -29,6 +119,50 @@ class Transcription(AbstractDocument):
     class Meta(AbstractDocument.Meta):
         verbose_name = "Transcription"
         verbose_name_plural = "Transcriptions"
+        indexes = [
+            # small index used by status polling, only not finished
+            # transcriptions are stored in it
+            models.Index(
+                fields=["status", "video_id"],
+                name="wagtail_transcription_active",
+                condition=Q(status__in=IN_PROGRESS_STATUSES),
+            ),
+        ]
+
+    @property
+    def completed(self) -> bool:
+        return self.status == self.STATUS_DONE
+
+    @completed.setter
+    def completed(self, value: bool) -> None:
+        self.set_status(self.STATUS_DONE if value else self.STATUS_QUEUED, save=False)
+
+    def set_status(self, status: str, error: str = "", save: bool = True) -> None:
+        """
+        Move transcription to new status and record time of transition
+        """
+
+        self.status = status
+        setattr(self, f"{status}_at", timezone.now())
+        self.error = error
+        if save:
+            self.save(update_fields=["status", f"{status}_at", "error"])
+
+    def set_submitted(self, transcript_id: str) -> None:
+        self.transcript_id = transcript_id
+        self.check_attempts = 0
+        self.next_check_at = None
+        self.set_status(self.STATUS_SUBMITTED, save=False)
+        self.save(
+            update_fields=[
+                "status",
+                "submitted_at",
+                "error",
+                "transcript_id",
+                "check_attempts",
+                "next_check_at",
+            ]
+        )
 
     def validate_video_id(self) -> None:
         if self.video_id is None:
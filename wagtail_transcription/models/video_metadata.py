@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class VideoMetadata(models.Model):
+    """
+    YouTube video data (title, channel, thumbnail, duration) fetched
+    from YouTube Data API. Used as persistent fallback of cache
+    """
+
+    video_id = models.CharField(max_length=255, unique=True)
+    title = models.CharField(max_length=255, blank=True)
+    channel_title = models.CharField(max_length=255, blank=True)
+    thumbnail = models.URLField(max_length=500, blank=True)
+    # duration in seconds
+    duration = models.PositiveIntegerField(null=True, blank=True)
+    fetched_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Video metadata"
+        verbose_name_plural = "Video metadata"
+
+    def __str__(self) -> str:
+        return self.title or self.video_id
+
+    def as_dict(self) -> dict:
+        return {
+            "video_id": self.video_id,
+            "title": self.title,
+            "channel_title": self.channel_title,
+            "thumbnail": self.thumbnail,
+            "duration": self.duration,
+            "fetched_at": self.fetched_at.timestamp(),
+        }
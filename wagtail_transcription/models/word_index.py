@@ -0,0 +1,26 @@
+from django.db import models
+
+from .transcription import Transcription
+
+
+class TranscriptWordIndex(models.Model):
+    """
+    Word timings of received transcript packed in binary blob
+    (see wagtail_transcription.word_index), kept outside of
+    Transcription so listing transcriptions does not load it
+    """
+
+    transcription = models.OneToOneField(
+        Transcription, on_delete=models.CASCADE, related_name="word_index"
+    )
+    data = models.BinaryField()
+    word_count = models.PositiveIntegerField(default=0)
+    duration_ms = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Transcript word index"
+        verbose_name_plural = "Transcript word indexes"
+
+    def __str__(self) -> str:
+        return str(self.transcription_id)
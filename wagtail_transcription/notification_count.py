@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def get_cache_key(user_id: int) -> str:
+    return f"wagtail_transcription:notification_unread_count:{user_id}"
+
+
+def get_timeout() -> int:
+    """
+    Number of seconds after which cached counter is counted again.
+    Counter is updated by signals and reset when all notifications are
+    marked as read, timeout only covers other bulk updates that do not
+    send signals. LocMemCache does not see updates made by other
+    processes (webhook, worker, commands), so counter is kept only
+    shortly by default
+    """
+
+    default = 2 if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache) else 60 * 5
+    return getattr(settings, "TRANSCRIPTION_NOTIFICATION_COUNT_TIMEOUT", default)
+
+
+def get_unread_count(user) -> int:
+    """
+    Return number of unread notifications of user. Database is
+    queried only if counter is not cached yet
+    """
+
+    return cache.get_or_set(
+        get_cache_key(user.pk),
+        user.notifications.unread().count,
+        get_timeout(),
+    )
+
+
+def change_unread_count(user_id: int, delta: int) -> None:
+    try:
+        cache.incr(get_cache_key(user_id), delta)
+    except ValueError:
+        # counter is not cached, it will be counted on next read
+        pass
+
+
+def reset_unread_count(user_id: int) -> None:
+    # counter is counted again on next read
+    cache.delete(get_cache_key(user_id))
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.db.models import Model
+
+import gzip
+import io
+import json
+from typing import IO, Type, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# file extension of every supported compression
+EXTENSIONS = {"gzip": "json.gz", "zstd": "json.zst"}
+
+
+def get_compression() -> str:
+    compression = getattr(settings, "TRANSCRIPTION_PAYLOAD_COMPRESSION", "gzip")
+    if compression not in EXTENSIONS:
+        raise ImproperlyConfigured(
+            f"TRANSCRIPTION_PAYLOAD_COMPRESSION has to be one of {list(EXTENSIONS)}"
+        )
+    if compression == "zstd" and zstandard is None:
+        raise ImproperlyConfigured(
+            "zstd compression requires zstandard, install wagtail-transcription[zstd]"
+        )
+    return compression
+
+
+def compress_payload(payload: dict, compression: str = "gzip") -> bytes:
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def open_payload(file: IO, name: str) -> IO:
+    """
+    Return stream that decompresses file while it is read, compression
+    is recognized by file extension
+    """
+
+    if name.endswith(EXTENSIONS["zstd"]):
+        if zstandard is None:
+            raise ImproperlyConfigured(
+                f"{name} is compressed with zstd, install wagtail-transcription[zstd]"
+            )
+        return zstandard.ZstdDecompressor().stream_reader(file)
+    return gzip.GzipFile(fileobj=file, mode="rb")
+
+
+def store_raw_payload(transcription: Type[Model], payload: dict) -> None:
+    """
+    Save AssemblyAi transcript response of transcription compressed in
+    storage, replacing previously stored one
+    """
+
+    compression = get_compression()
+    name = f"{transcription.video_id}.{EXTENSIONS[compression]}"
+    if transcription.raw_payload:
+        transcription.raw_payload.delete(save=False)
+    transcription.raw_payload.save(
+        name, ContentFile(compress_payload(payload, compression)), save=False
+    )
+    transcription.save(update_fields=["raw_payload"])
+
+
+def read_payload(name: str, storage: Type[Storage]) -> dict:
+    """
+    Read and decompress payload file from storage as stream
+    """
+
+    with storage.open(name, "rb") as file:
+        with open_payload(file, name) as stream:
+            return json.load(io.TextIOWrapper(stream, encoding="utf-8"))
+
+
+def load_raw_payload(transcription: Type[Model]) -> Union[dict, None]:
+    """
+    Read and decompress stored AssemblyAi transcript response or return
+    None if transcription does not have it
+    """
+
+    if not transcription.raw_payload:
+        return None
+    return read_payload(
+        transcription.raw_payload.name, transcription.raw_payload.storage
+    )
@@ -0,0 +1,147 @@
+import django
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from wagtail_transcription.exports import delete_exports
+from wagtail_transcription.models import Transcription, TranscriptWordIndex
+from wagtail_transcription.payloads import read_payload
+from wagtail_transcription.search import build_segments, replace_segments
+from wagtail_transcription.word_index import WordIndex, encode_word_index
+
+from functools import partial
+import hashlib
+import logging
+from typing import Iterable
+
+# outputs that can be rendered from raw payload
+OUTPUTS = ("docx", "search", "words")
+
+_view = None
+
+
+def set_view(view_path: str) -> None:
+    """
+    Set view used to render transcriptions in current process
+    """
+
+    global _view
+    _view = import_string(view_path)()
+
+
+def init_worker(view_path: str) -> None:
+    """
+    Initializer of worker process, processes started with spawn have
+    to set up django again
+    """
+
+    django.setup()
+    set_view(view_path)
+
+
+def render_payload(item: tuple, outputs: Iterable[str] = OUTPUTS) -> dict:
+    """
+    Render outputs of one transcription from its stored payload. Runs in
+    worker process and does not use database, only storage. Returns
+    rendered outputs or error
+    """
+
+    pk, video_id, payload_name = item
+    try:
+        storage = Transcription._meta.get_field("raw_payload").storage
+        words = read_payload(payload_name, storage).get("words") or []
+        result = {"pk": pk, "video_id": video_id}
+        if "docx" in outputs:
+            result["docx"] = _view.create_transcript_docx(words).getvalue()
+        if "search" in outputs:
+            result["phrases"] = list(_view.phreses_generator(words))
+        if "words" in outputs:
+            result["word_index"] = encode_word_index(words)
+        return result
+    except Exception as e:
+        logging.exception("message")
+        return {"pk": pk, "video_id": video_id, "error": repr(e)}
+
+
+def write_results(results: list) -> None:
+    """
+    Save rendered docx files in storage and update database with bulk
+    queries in one transaction. Replaced files are deleted after commit
+    """
+
+    pks = [result["pk"] for result in results]
+    transcriptions = Transcription.objects.only("pk", "video_id", "file").in_bulk(pks)
+    documents, replaced_files, segments, word_indexes = [], [], [], {}
+    for result in results:
+        transcription = transcriptions.get(result["pk"])
+        if transcription is None:
+            continue
+        if "docx" in result:
+            if transcription.file:
+                replaced_files.append(transcription.file.name)
+            storage = transcription.file.storage
+            transcription.file.name = storage.save(
+                transcription.file.field.generate_filename(
+                    transcription, f"auto_transcription-{transcription.video_id}.docx"
+                ),
+                ContentFile(result["docx"]),
+            )
+            transcription.file_size = len(result["docx"])
+            transcription.file_hash = hashlib.sha1(result["docx"]).hexdigest()
+            documents.append(transcription)
+        if "phrases" in result:
+            segments.extend(build_segments(transcription.pk, result["phrases"]))
+        if "word_index" in result:
+            word_indexes[transcription.pk] = result["word_index"]
+
+    with transaction.atomic():
+        Transcription.objects.bulk_update(
+            documents, ["file", "file_size", "file_hash"], batch_size=500
+        )
+        if any("phrases" in result for result in results):
+            indexed = [result["pk"] for result in results if "phrases" in result]
+            replace_segments(indexed, segments)
+        if word_indexes:
+            replace_word_indexes(word_indexes)
+        if replaced_files:
+            transaction.on_commit(partial(delete_files, replaced_files))
+        if documents:
+            # exports of replaced transcripts are not requested anymore
+            transaction.on_commit(
+                partial(delete_exports, [document.video_id for document in documents])
+            )
+
+
+def delete_files(names: list) -> None:
+    storage = Transcription._meta.get_field("file").storage
+    for name in names:
+        storage.delete(name)
+
+
+def replace_word_indexes(word_indexes: dict) -> None:
+    """
+    Update word indexes {transcription_id: data} of transcriptions and
+    create missing ones
+    """
+
+    now = timezone.now()
+    existing = {
+        word_index.transcription_id: word_index
+        for word_index in TranscriptWordIndex.objects.filter(
+            transcription_id__in=list(word_indexes)
+        ).only("pk", "transcription_id")
+    }
+    updated, created = [], []
+    for pk, data in word_indexes.items():
+        index = WordIndex(data)
+        word_index = existing.get(pk) or TranscriptWordIndex(transcription_id=pk)
+        word_index.data = data
+        word_index.word_count = len(index)
+        word_index.duration_ms = index.duration
+        word_index.updated_at = now
+        (updated if word_index.pk else created).append(word_index)
+    TranscriptWordIndex.objects.bulk_update(
+        updated, ["data", "word_count", "duration_ms", "updated_at"], batch_size=100
+    )
+    TranscriptWordIndex.objects.bulk_create(created, batch_size=100)
@@ -0,0 +1,210 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils.html import escape
+from docx import Document as docx_document
+
+from wagtail_transcription.models import Transcription, TranscriptSegment
+from wagtail_transcription.segmentation import format_timestamp, parse_timestamp
+
+import re
+from typing import IO, Iterable, Iterator, Type, Union
+
+# ts_headline and fallback mark matches with control characters, so
+# snippet text can be escaped before matches are wrapped in <mark>
+START_SEL = "\x02"
+STOP_SEL = "\x03"
+# number of characters around first match in fallback snippet
+SNIPPET_CONTEXT = 60
+
+
+def get_search_config() -> str:
+    """
+    PostgreSQL text search configuration used to index transcripts
+    """
+    return getattr(settings, "TRANSCRIPTION_SEARCH_CONFIG", "english")
+
+
+def uses_search_vector() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def build_segments(transcription_id: int, phrases: Iterable[dict]) -> list:
+    return [
+        TranscriptSegment(
+            transcription_id=transcription_id,
+            position=position,
+            start_ms=phrase["start_ms"],
+            end_ms=phrase["end_ms"],
+            speaker=phrase.get("speaker") or "",
+            text=phrase["text"],
+        )
+        for position, phrase in enumerate(phrases)
+        if phrase["text"].strip()
+    ]
+
+
+def replace_segments(transcription_ids: list, segments: list) -> None:
+    """
+    Replace stored segments of transcriptions, must be called in
+    transaction
+    """
+
+    TranscriptSegment.objects.filter(transcription_id__in=transcription_ids).delete()
+    TranscriptSegment.objects.bulk_create(segments, batch_size=500)
+    if uses_search_vector():
+        TranscriptSegment.objects.filter(
+            transcription_id__in=transcription_ids
+        ).update(search_vector=SearchVector("text", config=get_search_config()))
+
+
+def index_transcript(
+    transcription: Type[Transcription], phrases: Iterable[dict]
+) -> int:
+    """
+    Replace stored segments of transcription with phrases of its
+    transcript. Returns number of stored segments
+    """
+
+    segments = build_segments(transcription.pk, phrases)
+    with transaction.atomic():
+        replace_segments([transcription.pk], segments)
+    return len(segments)
+
+
+def read_docx_phrases(file: IO) -> Iterator[dict]:
+    """
+    Read phrases back from transcription docx (timestamp paragraph
+    followed by text paragraph). Used to index transcriptions that were
+    received before segments were stored
+    """
+
+    start = 0
+    for paragraph in docx_document(file).paragraphs:
+        text = paragraph.text.strip()
+        timestamp = parse_timestamp(text)
+        if timestamp is not None:
+            start = timestamp
+        elif text:
+            yield {"start_ms": start, "end_ms": start, "speaker": "", "text": text}
+
+
+def mark_snippet(snippet: str) -> str:
+    return (
+        escape(snippet).replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
+    )
+
+
+def make_snippet(text: str, terms: list) -> str:
+    """
+    Cut text around first matched term and mark all matched terms
+    """
+
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return text[: SNIPPET_CONTEXT * 2]
+    start = text.rfind(" ", 0, max(match.start() - SNIPPET_CONTEXT, 0)) + 1
+    end = text.find(" ", match.end() + SNIPPET_CONTEXT)
+    end = len(text) if end == -1 else end
+    snippet = pattern.sub(
+        lambda m: f"{START_SEL}{m.group(0)}{STOP_SEL}", text[start:end]
+    )
+    return ("... " if start else "") + snippet + (" ..." if end < len(text) else "")
+
+
+def search_segments(query: str, limit: int) -> list:
+    """
+    Return segments matching query ordered by rank, with rank and
+    snippet annotated
+    """
+
+    config = get_search_config()
+    search_query = SearchQuery(query, search_type="websearch", config=config)
+    return list(
+        TranscriptSegment.objects.filter(search_vector=search_query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), search_query),
+            snippet=SearchHeadline(
+                "text",
+                search_query,
+                config=config,
+                start_sel=START_SEL,
+                stop_sel=STOP_SEL,
+                min_words=10,
+                max_words=30,
+            ),
+        )
+        .select_related("transcription")
+        .order_by("-rank", "transcription_id", "position")[:limit]
+    )
+
+
+def search_segments_fallback(query: str, limit: int) -> list:
+    """
+    Search segments on databases without tsvector. Every term has to be
+    contained in segment, segments are ranked by number of matches
+    """
+
+    terms = query.split()
+    if not terms:
+        return []
+    segments = TranscriptSegment.objects.select_related("transcription")
+    for term in terms:
+        segments = segments.filter(text__icontains=term)
+    max_scanned = getattr(settings, "TRANSCRIPTION_SEARCH_FALLBACK_LIMIT", 1000)
+
+    results = []
+    for segment in segments.order_by("transcription_id", "position")[:max_scanned]:
+        text = segment.text.lower()
+        matches = sum(text.count(term.lower()) for term in terms)
+        segment.rank = matches / (1 + len(text.split()))
+        segment.snippet = make_snippet(segment.text, terms)
+        results.append(segment)
+    results.sort(key=lambda segment: -segment.rank)
+    return results[:limit]
+
+
+def search_transcripts(query: str, limit: int = 20) -> list:
+    """
+    Return best matching transcript segments as list of dicts with
+    transcription data, timestamp of segment and snippet with matches
+    marked by <mark> tags
+    """
+
+    query = query.strip()
+    if not query:
+        return []
+    if uses_search_vector():
+        segments = search_segments(query, limit)
+    else:
+        segments = search_segments_fallback(query, limit)
+
+    return [
+        {
+            "transcription_id": segment.transcription_id,
+            "video_id": segment.transcription.video_id,
+            "title": segment.transcription.title,
+            "position": segment.position,
+            "start": format_timestamp(segment.start_ms),
+            "start_ms": segment.start_ms,
+            "start_seconds": segment.start_ms // 1000,
+            "speaker": segment.speaker,
+            "snippet": mark_snippet(segment.snippet),
+            "rank": float(segment.rank),
+        }
+        for segment in segments
+    ]
+
+
+def get_search_limit(limit: Union[str, int, None], default: int = 20) -> int:
+    try:
+        return max(1, min(int(limit), 100))
+    except (TypeError, ValueError):
+        return default
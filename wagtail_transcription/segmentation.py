@@ -0,0 +1,99 @@
+import re
+from typing import Iterable, Iterator, Union
+
+TIMESTAMP_REGEX = re.compile(r"^(\d+):(\d{2}):(\d{2})(?:\.(\d{1,6}))?$")
+
+
+def format_timestamp(milliseconds: int) -> str:
+    """
+    Format milliseconds as "H:MM:SS.ss" (same format as
+    str(datetime.timedelta) shortened to hundredths of a second)
+    """
+
+    seconds, milliseconds = divmod(int(milliseconds), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{milliseconds // 10:02d}"
+
+
+def parse_timestamp(timestamp: str) -> Union[int, None]:
+    """
+    Convert timestamp created by format_timestamp back to milliseconds
+    or return None if text is not a timestamp
+    """
+
+    match = TIMESTAMP_REGEX.match(timestamp.strip())
+    if not match:
+        return None
+    hours, minutes, seconds, fraction = match.groups()
+    milliseconds = int((fraction or "0").ljust(3, "0")[:3])
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + milliseconds
+
+
+class PhraseSegmenter:
+    """
+    Split AssemblyAi words into phrases. By default new phrase starts
+    only when speaker changes. Additionally phrase can be split when
+    pause between words is longer than pause_gap milliseconds or when
+    phrase text would be longer than max_length characters.
+
+    Words of each phrase are collected in list and joined once, so cost
+    is linear even if one speaker talks for hours.
+    """
+
+    def __init__(
+        self,
+        pause_gap: Union[int, None] = None,
+        max_length: Union[int, None] = None,
+    ):
+        self.pause_gap = pause_gap
+        self.max_length = max_length
+
+    def make_phrase(
+        self, speaker: str, start: int, end: int, texts: list
+    ) -> dict:
+        return {
+            "start": format_timestamp(start),
+            "speaker": speaker,
+            "text": " ".join(texts),
+            "start_ms": start,
+            "end_ms": end,
+        }
+
+    def segment(self, words: Iterable[dict]) -> Iterator[dict]:
+        pause_gap = self.pause_gap
+        max_length = self.max_length
+        make_phrase = self.make_phrase
+
+        texts = None
+        speaker = start = end = length = None
+        for word in words:
+            text = word["text"]
+            word_start = word["start"]
+
+            if texts is not None and (
+                word["speaker"] != speaker
+                or (pause_gap is not None and word_start - end > pause_gap)
+                or (
+                    max_length is not None
+                    and text
+                    and length + len(text) + 1 > max_length
+                )
+            ):
+                yield make_phrase(speaker, start, end, texts)
+                texts = None
+
+            if texts is None:
+                # first word is kept even if it is empty
+                texts = [text or ""]
+                speaker = word["speaker"]
+                start = word_start
+                length = len(texts[0])
+            elif text:
+                texts.append(text)
+                length += len(text) + 1
+            end = word.get("end", word_start)
+
+        if texts is not None:
+            # return last phrase
+            yield make_phrase(speaker, start, end, texts)
@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from notifications.models import Notification
+
+from .exports import delete_exports
+from .models import StatusVersion, Transcription
+from .notification_count import change_unread_count
+
+from functools import partial
+from typing import Union
+
+
+def get_export_source(instance) -> Union[tuple, None]:
+    """
+    Fields that identify version of exports, None if they are deferred
+    """
+
+    if "file_hash" not in instance.__dict__ or "raw_payload" not in instance.__dict__:
+        return None
+    raw_payload = instance.__dict__["raw_payload"]
+    return instance.file_hash, getattr(raw_payload, "name", raw_payload) or ""
+
+
+@receiver(post_init, sender=Transcription)
+def transcription_loaded(sender, instance, **kwargs) -> None:
+    # remember loaded version to delete exports of replaced transcript
+    instance._loaded_export_source = get_export_source(instance)
+
+
+@receiver(post_save, sender=Transcription)
+def transcription_saved(sender, instance, created, **kwargs) -> None:
+    # clients waiting for status changes are answered after commit
+    transaction.on_commit(StatusVersion.objects.bump)
+    source = get_export_source(instance)
+    loaded_source = instance._loaded_export_source
+    instance._loaded_export_source = source
+    if created or None in (source, loaded_source) or source == loaded_source:
+        return
+    transaction.on_commit(partial(delete_exports, [instance.video_id]))
+
+
+@receiver(post_delete, sender=Transcription)
+def transcription_deleted(sender, instance, **kwargs) -> None:
+    transaction.on_commit(StatusVersion.objects.bump)
+    # keep files if transaction is rolled back
+    if instance.raw_payload:
+        transaction.on_commit(partial(instance.raw_payload.delete, save=False))
+    if instance.video_id:
+        transaction.on_commit(partial(delete_exports, [instance.video_id]))
+
+
+def update_unread_count(instance, delta: int) -> None:
+    if delta:
+        # counter is changed only if notification is really saved
+        transaction.on_commit(partial(change_unread_count, instance.recipient_id, delta))
+
+
+@receiver(post_init, sender=Notification)
+def notification_loaded(sender, instance, **kwargs) -> None:
+    # remember loaded value to detect notifications marked as read or unread
+    instance._loaded_unread = instance.__dict__.get("unread")
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs) -> None:
+    if created:
+        delta = int(instance.unread)
+    elif instance._loaded_unread is None:
+        delta = 0
+    else:
+        delta = int(instance.unread) - int(instance._loaded_unread)
+    instance._loaded_unread = instance.unread
+    update_unread_count(instance, delta)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs) -> None:
+    update_unread_count(instance, -int(instance.unread))
@@ -27,34 +27,97 @@ function ChangeTranscription(transcription_btn, video_id){
     });
 }
 
-function CheckNewAndRunningTranscriptions(transcription_btns){
-    // Check if new transcription is processing
+function UpdateTranscriptionBtns(transcription_btns, r){
     // Hide processing transcription when it will complete
+    transcription_btns.forEach(btn => {
+        if(r[btn.parentNode.querySelector('input').value] == true){
+            btn.innerHTML = 'Transcription in process ...';
+            btn.dataset.active = false;
+        }else if(r[btn.parentNode.querySelector('input').value] != true && btn.dataset.active == 'false'){
+            btn.innerHTML = 'Auto Transcription';
+            delete btn.dataset.active;
+            let video_id = btn.parentNode.querySelector('input').value;
+            ChangeTranscription(btn, video_id);
+        }
+    })
+}
+
+function GetVideoIds(transcription_btns){
+    // Ids of videos displayed on page, server returns only their status
+    let video_ids = [];
+    transcription_btns.forEach(btn => {
+        let video_id = btn.parentNode.querySelector('input').value;
+        if (video_id) video_ids.push(video_id);
+    })
+    return video_ids.join(',');
+}
 
-    fetch(processing_transcriptions_url ,{
+let processing_transcriptions = {};
+let processing_transcriptions_etag = null;
+
+function CheckNewAndRunningTranscriptions(transcription_btns){
+    // Check if new transcription is processing. If nothing changed
+    // since last check server responds with 304 without body
+    let headers = {};
+    if (processing_transcriptions_etag){
+        headers['If-None-Match'] = processing_transcriptions_etag;
+    }
+    fetch(processing_transcriptions_url + '?' + new URLSearchParams({video_ids: GetVideoIds(transcription_btns)}) ,{
         method: 'GET',
+        headers: headers,
+        cache: 'no-store',
+    })
+    .then(response => {
+        if (response.status == 304) return processing_transcriptions;
+        processing_transcriptions_etag = response.headers.get('ETag');
+        return response.json();
     })
-    .then(response => response.json())
     .then(r => {
-        transcription_btns.forEach(btn => {
-            if(r[btn.parentNode.querySelector('input').value] == true){
-                btn.innerHTML = 'Transcription in process ...';
-                btn.dataset.active = false;
-            }else if(r[btn.parentNode.querySelector('input').value] != true && btn.dataset.active == 'false'){
-                btn.innerHTML = 'Auto Transcription';
-                delete btn.dataset.active;
-                let video_id = btn.parentNode.querySelector('input').value;
-                ChangeTranscription(btn, video_id);
-            }
-        })
+        processing_transcriptions = r;
+        UpdateTranscriptionBtns(transcription_btns, r);
     });
 }
 
-document.addEventListener("DOMContentLoaded", () => {
-    let transcription_btns = document.querySelectorAll("[name='auto-transcription-btn']");
-
+function PollTranscriptions(transcription_btns){
+    // Fallback used when long polling request can not be kept open
     CheckNewAndRunningTranscriptions(transcription_btns);
     setInterval(function() {
         CheckNewAndRunningTranscriptions(transcription_btns);
     }, 15000)
+}
+
+function WaitForTranscriptionsChange(transcription_btns, version){
+    // Server responds when any transcription changes
+    let started = Date.now();
+    let params = new URLSearchParams({version: version, video_ids: GetVideoIds(transcription_btns)});
+    fetch(wait_processing_transcriptions_url + '?' + params ,{
+        method: 'GET',
+    })
+    .then(response => {
+        if (!response.ok) throw new Error(response.statusText);
+        return response.json();
+    })
+    .then(r => {
+        if (r.transcriptions){
+            UpdateTranscriptionBtns(transcription_btns, r.transcriptions);
+        }else if (Date.now() - started < 1000){
+            // request was not kept open (long polling is disabled)
+            PollTranscriptions(transcription_btns);
+            return;
+        }
+        WaitForTranscriptionsChange(transcription_btns, r.version);
+    })
+    .catch(() => PollTranscriptions(transcription_btns));
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    let transcription_btns = document.querySelectorAll("[name='auto-transcription-btn']");
+    if (!transcription_btns.length) return;
+
+    if (typeof wait_processing_transcriptions_url === 'undefined'){
+        PollTranscriptions(transcription_btns);
+    }else{
+        // first request returns current state immediately
+        WaitForTranscriptionsChange(transcription_btns, '');
+    }
 });
\ No newline at end of file
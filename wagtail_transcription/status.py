@@ -0,0 +1,20 @@
+from wagtail_transcription.models import StatusVersion
+
+
+def get_status_version() -> str:
+    """
+    Return version that changes every time any Transcription is saved,
+    updated or deleted. Version is read from single database row, so
+    changes made by every process (webhook, workers, commands) are seen
+    without listing transcriptions
+    """
+
+    return str(StatusVersion.objects.get_version())
+
+
+async def aget_status_version() -> str:
+    """
+    Async version of get_status_version
+    """
+
+    return str(await StatusVersion.objects.aget_version())
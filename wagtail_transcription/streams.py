@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.core.cache import cache
+
+import pytube
+import time
+from typing import Union
+from urllib.parse import parse_qs, urlparse
+
+
+def get_cache_key(video_id: str) -> str:
+    return f"wagtail_transcription:video_stream:{video_id}"
+
+
+def get_url_margin() -> int:
+    """
+    Number of seconds before expiration after which audio url is not
+    used anymore, so assemblyai has time to download audio
+    """
+    return getattr(settings, "TRANSCRIPTION_STREAM_URL_MARGIN", 60 * 10)
+
+
+def get_url_expires_at(audio_url: str) -> Union[float, None]:
+    """
+    Return timestamp from "expire" parameter of signed googlevideo url
+    or None if url does not expire
+    """
+
+    try:
+        return float(parse_qs(urlparse(audio_url).query)["expire"][0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+def get_url_ttl(audio_url: str) -> Union[float, None]:
+    """
+    Return number of seconds for which audio url can be used
+    or None if url does not expire
+    """
+
+    expires_at = get_url_expires_at(audio_url)
+    if expires_at is None:
+        return None
+    return expires_at - time.time() - get_url_margin()
+
+
+def is_url_fresh(audio_url: str) -> bool:
+    ttl = get_url_ttl(audio_url)
+    return ttl is None or ttl > 0
+
+
+def resolve_stream(video_id: str) -> dict:
+    """
+    Fetch audio stream of YouTube video with pytube. Raises pytube
+    exceptions if video is not available
+    """
+
+    yt = pytube.YouTube(f"https://www.youtube.com/watch?v={video_id}")
+    # check if can find audio url for specified video
+    if not yt.streams:
+        raise pytube.exceptions.VideoUnavailable(video_id)
+    return {"audio_url": yt.streams[0].url, "length": yt.length}
+
+
+def get_stream_info(video_id: str) -> dict:
+    """
+    Return {"audio_url", "length"} of YouTube video. Resolved stream is
+    cached until its signed url is about to expire, so validating the
+    same video again does not fetch and decipher YouTube player again
+    """
+
+    cache_key = get_cache_key(video_id)
+    stream = cache.get(cache_key)
+    if stream is not None and is_url_fresh(stream["audio_url"]):
+        return stream
+
+    stream = resolve_stream(video_id)
+    ttl = get_url_ttl(stream["audio_url"])
+    if ttl is None:
+        ttl = getattr(settings, "TRANSCRIPTION_STREAM_CACHE_TTL", 60 * 60)
+    if ttl > 0:
+        cache.set(cache_key, stream, int(ttl))
+    return stream
+
+
+def get_fresh_audio_url(video_id: str, audio_url: str) -> str:
+    """
+    Return audio_url if it is still valid or resolve stream of video again
+    """
+
+    if is_url_fresh(audio_url):
+        return audio_url
+    cache.delete(get_cache_key(video_id))
+    return get_stream_info(video_id)["audio_url"]
@@ -0,0 +1,413 @@
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import F, Model, Q
+from django.shortcuts import reverse
+from django.template import loader
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from notifications.signals import notify
+
+from wagtail_transcription.client import get_async_http_client, get_http_client
+from wagtail_transcription.limits import (
+    consume_submission_token,
+    get_available_submissions,
+)
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.streams import get_fresh_audio_url, get_stream_info
+
+import datetime
+import logging
+import pytube
+import re
+import requests
+from typing import Callable, Type, Union
+
+ASSEMBLY_TRANSCRIPT_URL = "https://api.assemblyai.com/v2/transcript"
+VIDEO_ID_REGEX = re.compile(r"^[a-zA-Z0-9_-]{11}$")
+
+
+def get_parent_instance(parent_instance_str: str) -> Union[Type[Model], None]:
+    """
+    Get model instance from its str representation "app:model_name:instance_id"
+    """
+
+    try:
+        app, model, instance_id = parent_instance_str.split(":")
+        return apps.get_model(app, model).objects.get(id=str(instance_id))
+    except (AttributeError, ValueError, LookupError, ObjectDoesNotExist):
+        return None
+
+
+def get_audio_url(video_id: str) -> str:
+    """
+    Return url of audio stream of YouTube video. Raises pytube
+    exceptions if video is not available
+    """
+
+    return get_stream_info(video_id)["audio_url"]
+
+
+def get_or_create_transcription(
+    video_id: str, audio_url: str = "", user_id: Union[int, None] = None
+) -> Type[Transcription]:
+    """
+    Create queued transcription or queue again transcription
+    that failed previously
+    """
+
+    transcription = (
+        Transcription.objects.select_for_update()
+        .filter(video_id=video_id, status=Transcription.STATUS_FAILED)
+        .first()
+    )
+    if transcription is None:
+        return Transcription.objects.create(
+            title=f"auto_transcription-{video_id}",
+            video_id=video_id,
+            audio_url=audio_url,
+            requested_by_id=user_id,
+        )
+    transcription.audio_url = audio_url
+    transcription.requested_by_id = user_id
+    # late delivery of previous transcript must not finish new request
+    transcription.transcript_id = ""
+    transcription.submit_attempts = 0
+    transcription.next_submit_at = None
+    transcription.set_status(Transcription.STATUS_QUEUED, save=False)
+    transcription.save(
+        update_fields=[
+            "status",
+            "queued_at",
+            "error",
+            "audio_url",
+            "requested_by",
+            "transcript_id",
+            "submit_attempts",
+            "next_submit_at",
+        ]
+    )
+    return transcription
+
+
+def request_audio_transcription(audio_url: str, video_id: str, user_id: int) -> dict:
+    """
+    Send transcription request to assemblyai
+    """
+
+    r = get_http_client().post(
+        ASSEMBLY_TRANSCRIPT_URL, **get_transcription_request(audio_url, video_id, user_id)
+    )
+    return r.json()
+
+
+async def arequest_audio_transcription(
+    audio_url: str, video_id: str, user_id: int
+) -> dict:
+    """
+    Async version of request_audio_transcription
+    """
+
+    r = await get_async_http_client().post(
+        ASSEMBLY_TRANSCRIPT_URL, **get_transcription_request(audio_url, video_id, user_id)
+    )
+    return r.json()
+
+
+def get_request_view_class() -> type:
+    """
+    View class used to request transcriptions, its
+    request_audio_transcription is used by every submission
+    """
+
+    if hasattr(settings, "REQUEST_TRANSCRIPTION_VIEW"):
+        return import_string(settings.REQUEST_TRANSCRIPTION_VIEW)
+    if getattr(settings, "TRANSCRIPTION_ASYNC_VIEWS", False):
+        return import_string("wagtail_transcription.views.AsyncRequestTranscriptionView")
+    return import_string("wagtail_transcription.views.RequestTranscriptionView")
+
+
+def send_transcription_request(audio_url: str, video_id: str, user_id: int) -> dict:
+    """
+    Send transcription request with request_audio_transcription of
+    REQUEST_TRANSCRIPTION_VIEW
+    """
+
+    view = get_request_view_class().for_submission(audio_url, video_id, user_id)
+    return view.request_audio_transcription()
+
+
+async def asend_transcription_request(
+    audio_url: str, video_id: str, user_id: int
+) -> dict:
+    """
+    Async version of send_transcription_request, sync views send request
+    in thread
+    """
+
+    view = get_request_view_class().for_submission(audio_url, video_id, user_id)
+    if hasattr(view, "arequest_audio_transcription"):
+        return await view.arequest_audio_transcription()
+    return await sync_to_async(view.request_audio_transcription)()
+
+
+def get_transcription_request(audio_url: str, video_id: str, user_id: int) -> dict:
+    # webhook_url will be then used by assemblyai to send
+    # request about finished transcription or errors
+    webhook_url = settings.BASE_URL.strip("/") + reverse(
+        "wagtail_transcription:receive_transcription",
+        kwargs={"video_id": video_id, "user_id": user_id},
+    )
+    return {
+        "json": {
+            "audio_url": audio_url,
+            "webhook_url": webhook_url,
+            "speaker_labels": True,
+        },
+        "headers": {
+            "authorization": settings.ASSEMBLY_API_TOKEN,
+            "content-type": "application/json",
+        },
+    }
+
+
+def submit_transcription(
+    parent_instance: Type[Model],
+    field_name: str,
+    transcription_field: str,
+    video_id: str,
+    audio_url: str,
+    user_id: int,
+) -> Type[Transcription]:
+    """
+    Create queued transcription, set it for parent instance and request
+    it from assemblyai after transaction is committed. Transcription
+    fails if assemblyai does not accept request and stays queued if
+    submission limits are reached
+    """
+
+    with transaction.atomic():
+        transcription = get_or_create_transcription(video_id, audio_url, user_id)
+        setattr(parent_instance, field_name, video_id)
+        setattr(parent_instance, transcription_field, transcription)
+        parent_instance.save()
+
+    submit_queued_transcriptions(ids=[transcription.pk])
+    transcription.refresh_from_db()
+    return transcription
+
+
+def notify_failed_submission(transcription: Type[Transcription], error: str) -> None:
+    user = transcription.requested_by
+    notify.send(
+        sender=user,
+        recipient=user,
+        verb="Message",
+        description=loader.render_to_string(
+            "wagtail_transcription/components/transcription_received_popup.html",
+            context={
+                "error": True,
+                "video_id": transcription.video_id,
+                "extra_text": error,
+            },
+        ),
+    )
+
+
+def claim_queued_transcriptions(
+    limit: int, ids: Union[list, None] = None
+) -> list:
+    """
+    Lock queued transcriptions that are due to be submitted and lease
+    them for TRANSCRIPTION_JOB_LOCK_TIMEOUT seconds, so other dispatchers
+    do not send them again while request is in progress. Rate token is
+    taken only for claimed transcription
+    """
+
+    now = timezone.now()
+    lock_timeout = getattr(settings, "TRANSCRIPTION_JOB_LOCK_TIMEOUT", 600)
+    lease = now + datetime.timedelta(seconds=lock_timeout)
+    queryset = (
+        Transcription.objects.select_for_update(skip_locked=True)
+        .filter(status=Transcription.STATUS_QUEUED, requested_by__isnull=False)
+        .filter(Q(next_submit_at__isnull=True) | Q(next_submit_at__lte=now))
+        .exclude(audio_url="")
+        .order_by("queued_at", "id")
+    )
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+
+    claimed = []
+    with transaction.atomic():
+        for transcription in queryset[: get_available_submissions(limit)]:
+            # conditional update protects databases without row locks
+            if not Transcription.objects.filter(
+                pk=transcription.pk,
+                status=Transcription.STATUS_QUEUED,
+                next_submit_at=transcription.next_submit_at,
+            ).update(
+                next_submit_at=lease, submit_attempts=F("submit_attempts") + 1
+            ):
+                continue
+            if not consume_submission_token():
+                # rate limit is reached, release claimed transcription
+                Transcription.objects.filter(pk=transcription.pk).update(
+                    next_submit_at=transcription.next_submit_at,
+                    submit_attempts=F("submit_attempts") - 1,
+                )
+                break
+            transcription.next_submit_at = lease
+            transcription.submit_attempts += 1
+            claimed.append(transcription)
+    return claimed
+
+
+def retry_submission(
+    transcription: Type[Transcription], error: str, notify_failed: bool = True
+) -> None:
+    """
+    Submit transcription again with exponential backoff or fail it
+    after TRANSCRIPTION_SUBMIT_MAX_ATTEMPTS attempts
+    """
+
+    max_attempts = getattr(settings, "TRANSCRIPTION_SUBMIT_MAX_ATTEMPTS", 5)
+    if transcription.submit_attempts < max_attempts:
+        transcription.next_submit_at = timezone.now() + datetime.timedelta(
+            seconds=30 * 2 ** (transcription.submit_attempts - 1)
+        )
+        transcription.error = error
+        transcription.save(update_fields=["next_submit_at", "error"])
+        return
+    transcription.set_status(Transcription.STATUS_FAILED, error=error)
+    if notify_failed:
+        notify_failed_submission(transcription, error)
+
+
+def submit_queued_transcriptions(
+    limit: Union[int, None] = None,
+    ids: Union[list, None] = None,
+    send: Union[Callable, None] = None,
+    notify_failed: bool = True,
+) -> int:
+    """
+    Dispatch outbox of queued transcriptions, oldest first, until
+    TRANSCRIPTION_MAX_IN_FLIGHT or TRANSCRIPTION_SUBMIT_RATE limits are
+    reached. Transcriptions are claimed in batches of
+    TRANSCRIPTION_SUBMIT_BATCH_SIZE in short transaction and requests are
+    sent after it is committed. Returns number of submitted transcriptions
+    """
+
+    send = send or send_transcription_request
+    batch_size = getattr(settings, "TRANSCRIPTION_SUBMIT_BATCH_SIZE", 10)
+    submitted = 0
+    while limit is None or submitted < limit:
+        size = batch_size if limit is None else min(batch_size, limit - submitted)
+        batch = claim_queued_transcriptions(size, ids)
+        if not batch:
+            break
+
+        available = True
+        for transcription in batch:
+            if not refresh_audio_url(transcription, notify_failed):
+                continue
+            try:
+                response = send(
+                    transcription.audio_url,
+                    transcription.video_id,
+                    transcription.requested_by_id,
+                )
+            except requests.RequestException as e:
+                # assemblyai is not available, try again later
+                logging.exception("message")
+                retry_submission(transcription, repr(e), notify_failed)
+                available = False
+                continue
+            submitted += handle_submission_response(
+                transcription, response, notify_failed
+            )
+        if not available:
+            break
+    return submitted
+
+
+async def asubmit_queued_transcriptions(
+    ids: Union[list, None] = None,
+    send: Union[Callable, None] = None,
+    notify_failed: bool = True,
+) -> int:
+    """
+    Async version of submit_queued_transcriptions used by async views.
+    Only one batch is dispatched, remaining transcriptions are submitted
+    by transcription_worker
+    """
+
+    send = send or asend_transcription_request
+    batch_size = getattr(settings, "TRANSCRIPTION_SUBMIT_BATCH_SIZE", 10)
+    batch = await sync_to_async(claim_queued_transcriptions)(batch_size, ids)
+    submitted = 0
+    for transcription in batch:
+        if not await sync_to_async(refresh_audio_url)(transcription, notify_failed):
+            continue
+        try:
+            response = await send(
+                transcription.audio_url,
+                transcription.video_id,
+                transcription.requested_by_id,
+            )
+        except requests.RequestException as e:
+            logging.exception("message")
+            await sync_to_async(retry_submission)(transcription, repr(e), notify_failed)
+            continue
+        submitted += await sync_to_async(handle_submission_response)(
+            transcription, response, notify_failed
+        )
+    return submitted
+
+
+def refresh_audio_url(
+    transcription: Type[Transcription], notify_failed: bool = True
+) -> bool:
+    """
+    Resolve audio url of transcription again if it expires before
+    assemblyai can download audio. Returns False if transcription
+    can not be sent now
+    """
+
+    try:
+        audio_url = get_fresh_audio_url(transcription.video_id, transcription.audio_url)
+    except pytube.exceptions.PytubeError as e:
+        # video is not available anymore
+        logging.exception("message")
+        transcription.set_status(Transcription.STATUS_FAILED, error=str(e))
+        if notify_failed:
+            notify_failed_submission(transcription, str(e))
+        return False
+    except Exception as e:
+        logging.exception("message")
+        retry_submission(transcription, repr(e), notify_failed)
+        return False
+
+    if audio_url != transcription.audio_url:
+        transcription.audio_url = audio_url
+        transcription.save(update_fields=["audio_url"])
+    return True
+
+
+def handle_submission_response(
+    transcription: Type[Transcription], response: dict, notify_failed: bool = True
+) -> bool:
+    """
+    Mark transcription as submitted or failed based on assemblyai
+    response. Returns True if transcription was submitted
+    """
+
+    if response.get("id") is not None:
+        transcription.set_submitted(response["id"])
+        return True
+    error = response.get("error") or "Transcription was not requested"
+    transcription.set_status(Transcription.STATUS_FAILED, error=error)
+    if notify_failed:
+        notify_failed_submission(transcription, error)
+    return False
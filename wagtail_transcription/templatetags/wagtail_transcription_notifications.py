@@ -6,11 +6,10 @@ Adjusts format_html usage to satisfy Django 6+ requirement for args/kwargs.
 from distutils.version import StrictVersion  # pylint: disable=deprecated-module
 
 from django import get_version
-from django.core.cache import cache
 from django.template import Library
 from django.utils.html import format_html
 
-from notifications import settings
+from wagtail_transcription.notification_count import get_unread_count
 
 try:
     from django.urls import reverse
@@ -21,11 +20,8 @@ register = Library()
 
 
 def get_cached_notification_unread_count(user):
-    return cache.get_or_set(
-        "cache_notification_unread_count",
-        user.notifications.unread().count,
-        settings.get_config()["CACHE_TIMEOUT"],
-    )
+    # counter is cached per user and updated by signals
+    return get_unread_count(user)
 
 
 def notifications_unread(context):
@@ -48,7 +44,7 @@ else:  # pragma: no cover - legacy
 @register.filter
 def has_notification(user):
     if user:
-        return user.notifications.unread().exists()
+        return get_cached_notification_unread_count(user) > 0
     return False
 
 
@@ -87,7 +83,10 @@ def register_notify_callbacks(
         refresh=refresh_period,
         api_url=api_url,
         unread_url=reverse("notifications:unread"),
-        mark_all_unread_url=reverse("notifications:mark_all_as_read"),
+        # resets cached unread count, unlike notifications:mark_all_as_read
+        mark_all_unread_url=reverse(
+            "wagtail_transcription:mark_all_notifications_as_read"
+        ),
         fetch_count=fetch,
         mark_as_read=str(mark_as_read).lower(),
     )
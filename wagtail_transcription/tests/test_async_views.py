@@ -0,0 +1,167 @@
+from wagtail_transcription.decorators import staff_or_group_required
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.status import aget_status_version
+from wagtail_transcription.tokens import validated_video_data_token
+from wagtail_transcription.views import (
+    AsyncGetProcessingTranscriptionsView,
+    AsyncReceiveTranscriptionView,
+    AsyncRequestTranscriptionView,
+    AsyncWaitProcessingTranscriptionsView,
+)
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from home.models import HomePage
+from unittest import mock
+from wagtail.models import Page
+import asyncio
+import json
+import time
+
+
+class TestAsyncViews(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.user = User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com"
+        )
+        self.transcription = Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa", video_id="aaaaaaaaaaa"
+        )
+        self.transcription.set_submitted("abc")
+
+    def commit(self, func, *args, **kwargs):
+        # status version is increased after commit of change
+        with self.captureOnCommitCallbacks(execute=True):
+            return func(*args, **kwargs)
+
+    def set_user(self, request, user):
+        async def auser():
+            return user
+
+        request.user = user
+        request.auser = auser
+        return request
+
+    def create_page(self):
+        return Page.objects.get(depth=1).add_child(instance=HomePage(title="Video"))
+
+    async def test_receive_transcription(self):
+        view = AsyncReceiveTranscriptionView.as_view()
+        request = self.factory.post(
+            "/",
+            data=json.dumps({"status": "error", "transcript_id": "abc"}),
+            content_type="application/json",
+        )
+        with mock.patch.object(
+            AsyncReceiveTranscriptionView,
+            "aget_transcription",
+            return_value={"error": "Audio is too short"},
+        ) as aget_transcription:
+            r = await view(request, video_id="aaaaaaaaaaa", user_id=str(self.user.id))
+            self.assertEqual(json.loads(r.content), {"type": "error"})
+            # repeated delivery is not processed again
+            r = await view(request, video_id="aaaaaaaaaaa", user_id=str(self.user.id))
+            self.assertEqual(json.loads(r.content), {"type": "duplicate"})
+        aget_transcription.assert_awaited_once_with("abc")
+        transcription = await Transcription.objects.aget(pk=self.transcription.pk)
+        self.assertEqual(transcription.status, Transcription.STATUS_FAILED)
+        self.assertEqual(transcription.error, "Audio is too short")
+
+    async def test_request_transcription(self):
+        await sync_to_async(self.transcription.set_status)(Transcription.STATUS_FAILED)
+        page = await sync_to_async(self.create_page)()
+        token = validated_video_data_token.make_token(self.user, "aaaaaaaaaaa")
+        request = self.set_user(
+            self.factory.post(
+                "/",
+                data={
+                    "video_id": "aaaaaaaaaaa",
+                    "audio_url": "https://audio.example.com",
+                    "parent_instance_str": f"home:HomePage:{page.pk}",
+                    "field_name": "video_id",
+                    "transcription_field": "transcription",
+                },
+            ),
+            self.user,
+        )
+        with mock.patch(
+            "wagtail_transcription.views.transcription.async_views.arequest_audio_transcription",
+            return_value={"id": "def"},
+        ) as arequest_audio_transcription:
+            r = await AsyncRequestTranscriptionView.as_view()(request, token=token)
+        self.assertEqual(json.loads(r.content)["type"], "success")
+        arequest_audio_transcription.assert_awaited_once_with(
+            audio_url="https://audio.example.com",
+            video_id="aaaaaaaaaaa",
+            user_id=self.user.id,
+        )
+        transcription = await Transcription.objects.aget(pk=self.transcription.pk)
+        self.assertEqual(transcription.status, Transcription.STATUS_SUBMITTED)
+        self.assertEqual(transcription.transcript_id, "def")
+        page = await HomePage.objects.aget(pk=page.pk)
+        self.assertEqual(page.transcription_id, self.transcription.pk)
+
+    async def test_processing_transcriptions(self):
+        request = self.factory.get("/", data={"video_ids": "aaaaaaaaaaa,bbbbbbbbbbb"})
+        r = await AsyncGetProcessingTranscriptionsView.as_view()(request)
+        self.assertEqual(
+            json.loads(r.content), {"aaaaaaaaaaa": True, "bbbbbbbbbbb": False}
+        )
+        self.assertTrue(r.has_header("ETag"))
+        r = await AsyncGetProcessingTranscriptionsView.as_view()(
+            self.factory.get(
+                "/",
+                data={"video_ids": "aaaaaaaaaaa,bbbbbbbbbbb"},
+                headers={"If-None-Match": r.headers["ETag"]},
+            )
+        )
+        self.assertEqual(r.status_code, 304)
+
+    @override_settings(TRANSCRIPTION_LONG_POLL_TIMEOUT=0.05, TRANSCRIPTION_LONG_POLL_INTERVAL=0.01)
+    async def test_wait_processing_transcriptions(self):
+        view = AsyncWaitProcessingTranscriptionsView.as_view()
+        version = await aget_status_version()
+        r = await view(self.factory.get("/", data={"version": version}))
+        self.assertEqual(json.loads(r.content)["transcriptions"], None)
+
+        await sync_to_async(self.commit)(
+            Transcription.objects.create, title="Other", video_id="bbbbbbbbbbb"
+        )
+        r = await view(self.factory.get("/", data={"version": version}))
+        self.assertEqual(
+            json.loads(r.content)["transcriptions"],
+            {"aaaaaaaaaaa": True, "bbbbbbbbbbb": True},
+        )
+
+    @override_settings(TRANSCRIPTION_LONG_POLL_TIMEOUT=5, TRANSCRIPTION_LONG_POLL_INTERVAL=0.01)
+    async def test_wait_wakes_on_status_change(self):
+        view = AsyncWaitProcessingTranscriptionsView.as_view()
+        data = {"video_ids": "aaaaaaaaaaa", "version": await aget_status_version()}
+
+        async def finish_transcription():
+            await asyncio.sleep(0.1)
+            await sync_to_async(self.commit)(
+                Transcription.objects.filter(video_id="aaaaaaaaaaa").update,
+                status=Transcription.STATUS_DONE,
+            )
+
+        started = time.monotonic()
+        r, _ = await asyncio.gather(
+            view(self.factory.get("/", data=data)), finish_transcription()
+        )
+        # request waited for change and was answered before timeout
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(json.loads(r.content)["transcriptions"], {"aaaaaaaaaaa": False})
+
+    async def test_staff_or_group_required(self):
+        user = await User.objects.acreate(username="user")
+        view = staff_or_group_required(
+            AsyncGetProcessingTranscriptionsView.as_view(),
+            group_names=["moderators", "editors"],
+        )
+        r = await view(self.set_user(self.factory.get("/"), user))
+        self.assertEqual(r.status_code, 302)
+        r = await view(self.set_user(self.factory.get("/"), self.user))
+        self.assertEqual(r.status_code, 200)
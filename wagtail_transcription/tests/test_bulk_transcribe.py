@@ -0,0 +1,118 @@
+from wagtail_transcription import bulk, submission
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.wagtail_hooks import TranscriptionAdmin
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from home.models import HomePage
+from unittest import mock
+from wagtail.models import Page
+import io
+import tempfile
+
+
+class TestBulkTranscribe(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com", password="superuser123"
+        )
+        root = Page.objects.get(depth=1)
+        self.pages = [
+            root.add_child(instance=HomePage(title=f"Video {i}", video_id=video_id))
+            for i, video_id in enumerate(["aaaaaaaaaaa", "bbbbbbbbbbb", "", "invalid"])
+        ]
+        patcher = mock.patch.object(bulk, "get_audio_url", return_value="https://audio")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            submission, "request_audio_transcription", return_value={"id": "abc"}
+        )
+        self.request_audio_transcription = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def bulk_transcribe(self, *args, **kwargs):
+        stdout = io.StringIO()
+        call_command(
+            "bulk_transcribe", *args, user="superuser", workers=1, stdout=stdout, **kwargs
+        )
+        return stdout.getvalue()
+
+    def test_bulk_transcribe_model(self):
+        output = self.bulk_transcribe("home.HomePage:video_id:transcription")
+        self.assertIn("submitted: 2, queued: 0, valid: 0, skipped: 0, failed: 1", output)
+        self.assertEqual(self.request_audio_transcription.call_count, 2)
+        page = HomePage.objects.get(pk=self.pages[0].pk)
+        self.assertEqual(page.transcription.video_id, "aaaaaaaaaaa")
+        self.assertEqual(page.transcription.status, Transcription.STATUS_SUBMITTED)
+
+        # already submitted videos are not requested again
+        output = self.bulk_transcribe("home.HomePage:video_id:transcription")
+        self.assertIn("submitted: 0, queued: 0, valid: 0, skipped: 0, failed: 1", output)
+        self.assertEqual(self.request_audio_transcription.call_count, 2)
+
+    @override_settings(TRANSCRIPTION_MAX_IN_FLIGHT=1)
+    def test_bulk_transcribe_over_limit_is_queued(self):
+        output = self.bulk_transcribe("home.HomePage:video_id:transcription")
+        self.assertIn("submitted: 1, queued: 1, valid: 0, skipped: 0, failed: 1", output)
+        transcription = Transcription.objects.get(status=Transcription.STATUS_QUEUED)
+        self.assertEqual(transcription.audio_url, "https://audio")
+        self.assertEqual(transcription.requested_by, self.user)
+
+    def test_bulk_transcribe_csv(self):
+        Transcription.objects.create(title="Existing", video_id="ccccccccccc")
+        rows = [
+            "parent_instance_str,field_name,transcription_field,video_id",
+            f"home:HomePage:{self.pages[0].pk},video_id,transcription,aaaaaaaaaaa",
+            f"home:HomePage:{self.pages[1].pk},video_id,transcription,aaaaaaaaaaa",
+            f"home:HomePage:{self.pages[2].pk},video_id,transcription,ccccccccccc",
+            "home:HomePage:0,video_id,transcription,ddddddddddd",
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as f:
+            f.write("\n".join(rows))
+            f.flush()
+            output = self.bulk_transcribe(csv=f.name, dry_run=True)
+        self.assertIn("submitted: 0, queued: 0, valid: 1, skipped: 2, failed: 1", output)
+        self.assertIn("Duplicated video id", output)
+        self.assertIn("Transcription for video already exists", output)
+        self.assertIn("Parent instance does not exist", output)
+        self.request_audio_transcription.assert_not_called()
+
+    def test_assemblyai_error_fails_transcription(self):
+        self.request_audio_transcription.return_value = {"error": "Invalid audio"}
+        output = self.bulk_transcribe("home.HomePage:video_id")
+        self.assertIn("Invalid audio", output)
+        # transcription is committed before request, failed one can be requested again
+        transcription = HomePage.objects.get(pk=self.pages[0].pk).transcription
+        self.assertEqual(transcription.status, Transcription.STATUS_FAILED)
+        self.assertEqual(transcription.error, "Invalid audio")
+
+    def test_admin_view(self):
+        self.client.login(username="superuser", password="superuser123")
+        url = TranscriptionAdmin().url_helper.get_action_url("bulk_transcribe")
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with mock.patch(
+            "wagtail_transcription.wagtail_hooks.start_bulk_transcription",
+            return_value=True,
+        ) as start_bulk_transcription:
+            r = self.client.post(
+                url,
+                data={
+                    "targets": "home.HomePage:video_id:transcription",
+                    "csv_file": SimpleUploadedFile(
+                        "targets.csv",
+                        b"parent_instance_str,field_name,transcription_field,video_id\n"
+                        b"home:HomePage:1,video_id,transcription,ccccccccccc\n",
+                    ),
+                },
+            )
+        self.assertRedirects(r, url)
+        targets = start_bulk_transcription.call_args.args[1]
+        self.assertEqual(
+            [target["video_id"] for target in targets],
+            ["aaaaaaaaaaa", "bbbbbbbbbbb", "invalid", "ccccccccccc"],
+        )
+        # invalid target
+        r = self.client.post(url, data={"targets": "home.HomePage"})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Invalid target")
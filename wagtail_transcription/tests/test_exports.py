@@ -0,0 +1,152 @@
+from wagtail_transcription import exports
+from wagtail_transcription.exports import render_srt, render_vtt
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.views import ReceiveTranscriptionView
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls.base import reverse
+from unittest import mock
+import shutil
+import tempfile
+
+
+class TestExportRenderers(SimpleTestCase):
+    def setUp(self):
+        self.phrases = [
+            {"start_ms": 250, "end_ms": 900, "speaker": "A", "text": "Hello world"},
+            {"start_ms": 3661500, "end_ms": 3662000, "speaker": "B", "text": "Hi"},
+        ]
+
+    def test_srt(self):
+        self.assertEqual(
+            render_srt(self.phrases),
+            "1\n00:00:00,250 --> 00:00:00,900\nHello world\n\n"
+            "2\n01:01:01,500 --> 01:01:02,000\nHi\n",
+        )
+
+    def test_vtt(self):
+        self.assertEqual(
+            render_vtt(self.phrases),
+            "WEBVTT\n\n00:00:00.250 --> 00:00:00.900\n<v A>Hello world\n\n"
+            "01:01:01.500 --> 01:01:02.000\n<v B>Hi\n",
+        )
+
+    def test_vtt_escaping(self):
+        phrases = [
+            {"start_ms": 0, "end_ms": 900, "speaker": "<A>", "text": "R&D --> <b>"},
+        ]
+        self.assertEqual(
+            render_vtt(phrases),
+            "WEBVTT\n\n00:00:00.000 --> 00:00:00.900\n"
+            "<v &lt;A&gt;>R&amp;D --&gt; &lt;b&gt;\n",
+        )
+
+
+class TestTranscriptionExportView(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com", password="superuser123"
+        )
+        self.client.login(username="superuser", password="superuser123")
+        Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa",
+            video_id="aaaaaaaaaaa",
+            status=Transcription.STATUS_PROCESSING,
+        )
+        self.response = {
+            "words": [
+                {"text": "Hello", "start": 0, "end": 400, "speaker": "A"},
+                {"text": "Hi", "start": 1500, "end": 1800, "speaker": "B"},
+            ]
+        }
+        self.transcription = ReceiveTranscriptionView().process_transcription_response(
+            self.response, "aaaaaaaaaaa"
+        )
+
+    def get_export(self, export_format="srt", **kwargs):
+        return self.client.get(
+            reverse(
+                "wagtail_transcription:transcription_export",
+                kwargs={"video_id": "aaaaaaaaaaa", "export_format": export_format},
+            ),
+            **kwargs,
+        )
+
+    def test_export_is_rendered_once(self):
+        with mock.patch.object(
+            exports, "render_srt", wraps=exports.render_srt
+        ) as render_srt, mock.patch.dict(
+            exports.EXPORT_FORMATS,
+            {"srt": (render_srt, *exports.EXPORT_FORMATS["srt"][1:])},
+        ):
+            r = self.get_export()
+            self.assertEqual(r["Content-Type"], "application/x-subrip; charset=utf-8")
+            self.assertIn("max-age=300", r["Cache-Control"])
+            content = b"".join(r.streaming_content).decode()
+            self.assertTrue(
+                content.startswith("1\n00:00:00,000 --> 00:00:00,400\nHello")
+            )
+
+            # stored export is served
+            r = self.get_export()
+            self.assertEqual(b"".join(r.streaming_content).decode(), content)
+            # unchanged export is not sent again
+            r = self.get_export(HTTP_IF_NONE_MATCH=r["ETag"])
+            self.assertEqual(r.status_code, 304)
+        render_srt.assert_called_once()
+
+    def test_etag_changes_with_transcript(self):
+        etag = self.get_export(export_format="json")["ETag"]
+        # transcript is received again
+        self.response["words"][1]["text"] = "Bye"
+        ReceiveTranscriptionView().process_transcription_response(
+            self.response, "aaaaaaaaaaa"
+        )
+        r = self.get_export(export_format="json")
+        self.assertNotEqual(r["ETag"], etag)
+        self.assertIn('"text": "Bye"', b"".join(r.streaming_content).decode())
+
+    def get_stored_exports(self):
+        storage = Transcription._meta.get_field("file").storage
+        try:
+            return storage.listdir(f"{exports.EXPORTS_DIRECTORY}/aaaaaaaaaaa")[1]
+        except FileNotFoundError:
+            return []
+
+    def test_exports_deleted_when_transcript_changes(self):
+        self.get_export()
+        self.assertEqual(len(self.get_stored_exports()), 1)
+        # saving not changed transcript keeps exports
+        with self.captureOnCommitCallbacks(execute=True):
+            Transcription.objects.get(pk=self.transcription.pk).save()
+        self.assertEqual(len(self.get_stored_exports()), 1)
+
+        self.response["words"][1]["text"] = "Bye"
+        with self.captureOnCommitCallbacks(execute=True):
+            ReceiveTranscriptionView().process_transcription_response(
+                self.response, "aaaaaaaaaaa"
+            )
+        self.assertEqual(self.get_stored_exports(), [])
+
+    def test_exports_deleted_with_transcription(self):
+        self.get_export()
+        with self.captureOnCommitCallbacks(execute=True):
+            Transcription.objects.get(pk=self.transcription.pk).delete()
+        self.assertEqual(self.get_stored_exports(), [])
+
+    def test_export_from_segments(self):
+        Transcription.objects.filter(pk=self.transcription.pk).update(raw_payload="")
+        r = self.get_export(export_format="txt", data={"download": "1"})
+        self.assertIn("attachment", r["Content-Disposition"])
+        self.assertEqual(
+            b"".join(r.streaming_content).decode(),
+            "0:00:00.00\nHello\n\n0:00:01.50\nHi\n",
+        )
+
+    def test_unknown_format(self):
+        self.assertEqual(self.get_export(export_format="pdf").status_code, 404)
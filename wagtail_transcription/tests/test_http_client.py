@@ -0,0 +1,46 @@
+from wagtail_transcription.client import HttpClient, CircuitOpenError
+from django.test import SimpleTestCase
+from unittest import mock
+import requests
+
+
+class TestHttpClient(SimpleTestCase):
+    def setUp(self):
+        self.client = HttpClient(
+            timeout=(1, 2), retries=0, failure_threshold=2, reset_timeout=60
+        )
+
+    def test_default_timeout(self):
+        with mock.patch.object(self.client.session, "request") as request:
+            request.return_value.status_code = 200
+            self.client.get("https://api.assemblyai.com/v2/transcript/abc")
+        self.assertEqual(request.call_args.kwargs["timeout"], (1, 2))
+
+    def test_circuit_opens_after_failures(self):
+        with mock.patch.object(
+            self.client.session, "request", side_effect=requests.ConnectTimeout
+        ) as request:
+            for _ in range(2):
+                with self.assertRaises(requests.ConnectTimeout):
+                    self.client.get("https://api.assemblyai.com/v2/transcript")
+            with self.assertRaises(CircuitOpenError):
+                self.client.get("https://api.assemblyai.com/v2/transcript")
+        self.assertEqual(request.call_count, 2)
+
+        # other hosts are not affected
+        with mock.patch.object(self.client.session, "request") as request:
+            request.return_value.status_code = 200
+            self.client.get("https://www.googleapis.com/youtube/v3/videos")
+        request.assert_called_once()
+
+    def test_success_resets_failures(self):
+        with mock.patch.object(self.client.session, "request") as request:
+            request.return_value.status_code = 503
+            self.client.get("https://api.assemblyai.com/v2/transcript")
+            request.return_value.status_code = 200
+            self.client.get("https://api.assemblyai.com/v2/transcript")
+            request.return_value.status_code = 503
+            self.client.get("https://api.assemblyai.com/v2/transcript")
+        breaker = self.client.get_breaker("api.assemblyai.com")
+        self.assertEqual(breaker.failures, 1)
+        self.assertIsNone(breaker.opened_at)
@@ -0,0 +1,158 @@
+from wagtail_transcription import submission
+from wagtail_transcription.limits import TokenBucket, get_submit_bucket
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.submission import (
+    claim_queued_transcriptions,
+    submit_queued_transcriptions,
+)
+from wagtail_transcription.views import RequestTranscriptionView
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from notifications.models import Notification
+from unittest import mock
+import requests
+
+
+class CustomRequestTranscriptionView(RequestTranscriptionView):
+    def request_audio_transcription(self):
+        return {"id": f"custom-{self.request.POST['video_id']}-{self.request.user.id}"}
+
+
+class TestSubmissionLimits(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="user")
+
+    def test_token_bucket(self):
+        bucket = TokenBucket("test_bucket", capacity=2, period=60)
+        with mock.patch("wagtail_transcription.limits.time.time", return_value=1000):
+            self.assertTrue(bucket.consume())
+            self.assertTrue(bucket.consume())
+            self.assertFalse(bucket.consume())
+        # one token is refilled every 30 seconds
+        with mock.patch("wagtail_transcription.limits.time.time", return_value=1030):
+            self.assertTrue(bucket.consume())
+            self.assertFalse(bucket.consume())
+
+    @override_settings(TRANSCRIPTION_MAX_IN_FLIGHT=2, TRANSCRIPTION_SUBMIT_RATE=(5, 60))
+    def test_max_in_flight(self):
+        Transcription.objects.create(title="a", video_id="aaaaaaaaaaa").set_status(
+            Transcription.STATUS_SUBMITTED
+        )
+        for video_id in ["bbbbbbbbbbb", "ccccccccccc"]:
+            Transcription.objects.create(
+                title=video_id,
+                video_id=video_id,
+                audio_url="https://audio.example.com",
+                requested_by=self.user,
+            )
+        claimed = claim_queued_transcriptions(10)
+        self.assertEqual([t.video_id for t in claimed], ["bbbbbbbbbbb"])
+        # claimed transcription is in flight
+        self.assertEqual(claim_queued_transcriptions(10), [])
+        # rate token is taken only for claimed transcription
+        self.assertEqual(cache.get(get_submit_bucket().key)["tokens"], 4)
+
+    @override_settings(TRANSCRIPTION_SUBMIT_RATE=(1, 60))
+    def test_submit_queued_transcriptions(self):
+        for video_id in ["aaaaaaaaaaa", "bbbbbbbbbbb"]:
+            Transcription.objects.create(
+                title=video_id,
+                video_id=video_id,
+                audio_url="https://audio.example.com",
+                requested_by=self.user,
+            )
+        with mock.patch.object(
+            submission, "request_audio_transcription", return_value={"id": "abc"}
+        ) as request_audio_transcription:
+            # only one request is allowed by rate limit
+            self.assertEqual(submit_queued_transcriptions(), 1)
+        request_audio_transcription.assert_called_once_with(
+            audio_url="https://audio.example.com",
+            video_id="aaaaaaaaaaa",
+            user_id=self.user.id,
+        )
+        self.assertEqual(
+            Transcription.objects.get(video_id="aaaaaaaaaaa").status,
+            Transcription.STATUS_SUBMITTED,
+        )
+        # transcription claimed without rate token is released
+        transcription = Transcription.objects.get(video_id="bbbbbbbbbbb")
+        self.assertEqual(transcription.status, Transcription.STATUS_QUEUED)
+        self.assertEqual(transcription.submit_attempts, 0)
+        self.assertIsNone(transcription.next_submit_at)
+
+    def test_submit_queued_transcription_error(self):
+        Transcription.objects.create(
+            title="a",
+            video_id="aaaaaaaaaaa",
+            audio_url="https://audio.example.com",
+            requested_by=self.user,
+        )
+        with mock.patch.object(
+            submission, "request_audio_transcription", return_value={"error": "Invalid audio"}
+        ):
+            self.assertEqual(submit_queued_transcriptions(), 0)
+        transcription = Transcription.objects.get()
+        self.assertEqual(transcription.status, Transcription.STATUS_FAILED)
+        self.assertEqual(transcription.error, "Invalid audio")
+        self.assertIn("Invalid audio", Notification.objects.get(recipient=self.user).description)
+
+    def test_submit_queued_transcription_retry(self):
+        transcription = Transcription.objects.create(
+            title="a",
+            video_id="aaaaaaaaaaa",
+            audio_url="https://audio.example.com",
+            requested_by=self.user,
+        )
+        with mock.patch.object(
+            submission, "request_audio_transcription", side_effect=requests.ConnectionError
+        ) as request_audio_transcription:
+            self.assertEqual(submit_queued_transcriptions(), 0)
+            # transcription waits for retry
+            self.assertEqual(submit_queued_transcriptions(), 0)
+        request_audio_transcription.assert_called_once()
+        transcription.refresh_from_db()
+        self.assertEqual(transcription.status, Transcription.STATUS_QUEUED)
+        self.assertEqual(transcription.submit_attempts, 1)
+        self.assertGreater(transcription.next_submit_at, timezone.now())
+
+        # last attempt fails transcription
+        Transcription.objects.filter(pk=transcription.pk).update(
+            submit_attempts=4, next_submit_at=timezone.now()
+        )
+        with mock.patch.object(
+            submission, "request_audio_transcription", side_effect=requests.ConnectionError
+        ):
+            self.assertEqual(submit_queued_transcriptions(), 0)
+        transcription.refresh_from_db()
+        self.assertEqual(transcription.status, Transcription.STATUS_FAILED)
+        self.assertTrue(Notification.objects.filter(recipient=self.user).exists())
+
+    def test_claimed_transcription_is_not_claimed_again(self):
+        Transcription.objects.create(
+            title="a",
+            video_id="aaaaaaaaaaa",
+            audio_url="https://audio.example.com",
+            requested_by=self.user,
+        )
+        self.assertEqual(len(submission.claim_queued_transcriptions(10)), 1)
+        self.assertEqual(submission.claim_queued_transcriptions(10), [])
+
+    @override_settings(
+        REQUEST_TRANSCRIPTION_VIEW="wagtail_transcription.tests.test_limits.CustomRequestTranscriptionView"
+    )
+    def test_submit_with_custom_request_view(self):
+        Transcription.objects.create(
+            title="a",
+            video_id="aaaaaaaaaaa",
+            audio_url="https://audio.example.com",
+            requested_by=self.user,
+        )
+        # queued transcriptions are sent by overwritten view method
+        self.assertEqual(submit_queued_transcriptions(), 1)
+        self.assertEqual(
+            Transcription.objects.get().transcript_id, f"custom-aaaaaaaaaaa-{self.user.id}"
+        )
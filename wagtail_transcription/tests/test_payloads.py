@@ -0,0 +1,80 @@
+from wagtail_transcription import payloads
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.payloads import (
+    compress_payload,
+    load_raw_payload,
+    open_payload,
+)
+from wagtail_transcription.views import ReceiveTranscriptionView
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from docx import Document as docx_document
+import io
+import json
+import shutil
+import tempfile
+import unittest
+
+
+class TestPayloadCompression(SimpleTestCase):
+    def setUp(self):
+        self.payload = {"status": "completed", "words": [{"text": "żółw"}] * 100}
+
+    def test_gzip(self):
+        data = compress_payload(self.payload, "gzip")
+        self.assertLess(len(data), len(json.dumps(self.payload)))
+        stream = open_payload(io.BytesIO(data), "aaaaaaaaaaa.json.gz")
+        self.assertEqual(json.load(stream), self.payload)
+
+    @unittest.skipIf(payloads.zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        data = compress_payload(self.payload, "zstd")
+        stream = open_payload(io.BytesIO(data), "aaaaaaaaaaa.json.zst")
+        self.assertEqual(json.load(stream), self.payload)
+
+    @override_settings(TRANSCRIPTION_PAYLOAD_COMPRESSION="lzma")
+    def test_unsupported_compression(self):
+        with self.assertRaises(ImproperlyConfigured):
+            payloads.get_compression()
+
+
+class TestRawPayload(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa",
+            video_id="aaaaaaaaaaa",
+            status=Transcription.STATUS_PROCESSING,
+        )
+        self.response = {
+            "status": "completed",
+            "words": [{"text": "Hello", "start": 0, "end": 500, "speaker": "A"}],
+        }
+        self.transcription = ReceiveTranscriptionView().process_transcription_response(
+            self.response, "aaaaaaaaaaa"
+        )
+
+    def test_payload_is_stored(self):
+        transcription = Transcription.objects.get(pk=self.transcription.pk)
+        self.assertTrue(transcription.raw_payload.name.endswith(".json.gz"))
+        self.assertEqual(load_raw_payload(transcription), self.response)
+
+    def test_transcription_is_rendered_from_payload(self):
+        transcription = Transcription.objects.get(pk=self.transcription.pk)
+        ReceiveTranscriptionView().render_transcription(
+            transcription, load_raw_payload(transcription)
+        )
+        with transcription.file.open("rb") as file:
+            paragraphs = [p.text for p in docx_document(file).paragraphs]
+        self.assertEqual(paragraphs, ["0:00:00.00", "Hello\n"])
+
+    def test_payload_is_deleted_with_transcription(self):
+        storage = self.transcription.raw_payload.storage
+        name = self.transcription.raw_payload.name
+        with self.captureOnCommitCallbacks(execute=True):
+            self.transcription.delete()
+        self.assertFalse(storage.exists(name))
@@ -0,0 +1,62 @@
+from wagtail_transcription.views.mixins import ProcessTranscriptionMixin
+from wagtail_transcription.segmentation import PhraseSegmenter, format_timestamp
+from django.test import SimpleTestCase
+from docx import Document as docx_document
+
+
+class TestProcessTranscriptionMixin(SimpleTestCase):
+    def setUp(self):
+        self.mixin = ProcessTranscriptionMixin()
+        self.words = [
+            {"text": "Hello", "start": 250, "end": 500, "speaker": "A"},
+            {"text": "world", "start": 510, "end": 900, "speaker": "A"},
+            {"text": "Hi", "start": 1500, "end": 1800, "speaker": "B"},
+        ]
+
+    def test_create_transcript_docx(self):
+        output = self.mixin.create_transcript_docx(self.words)
+        self.assertEqual(output.tell(), 0)
+        paragraphs = [p.text for p in docx_document(output).paragraphs]
+        self.assertEqual(
+            paragraphs, ["0:00:00.25", "Hello world\n", "0:00:01.50", "Hi\n"]
+        )
+
+
+class TestPhraseSegmenter(SimpleTestCase):
+    def setUp(self):
+        self.words = [
+            {"text": "Hello", "start": 0, "end": 400, "speaker": "A"},
+            {"text": "there", "start": 450, "end": 800, "speaker": "A"},
+            {"text": "", "start": 850, "end": 900, "speaker": "A"},
+            {"text": "again", "start": 3000, "end": 3400, "speaker": "A"},
+            {"text": "Hi", "start": 3600000, "end": 3600300, "speaker": "B"},
+        ]
+
+    def test_format_timestamp(self):
+        self.assertEqual(format_timestamp(0), "0:00:00.00")
+        self.assertEqual(format_timestamp(1000), "0:00:01.00")
+        self.assertEqual(format_timestamp(61999), "0:01:01.99")
+        self.assertEqual(format_timestamp(36005250), "10:00:05.25")
+
+    def test_default_mode_splits_on_speaker_change(self):
+        phrases = list(PhraseSegmenter().segment(self.words))
+        self.assertEqual(
+            [(p["start"], p["speaker"], p["text"]) for p in phrases],
+            [
+                ("0:00:00.00", "A", "Hello there again"),
+                ("1:00:00.00", "B", "Hi"),
+            ],
+        )
+        self.assertEqual((phrases[0]["start_ms"], phrases[0]["end_ms"]), (0, 3400))
+
+    def test_pause_gap(self):
+        phrases = list(PhraseSegmenter(pause_gap=1000).segment(self.words))
+        self.assertEqual(
+            [p["text"] for p in phrases], ["Hello there", "again", "Hi"]
+        )
+
+    def test_max_length(self):
+        phrases = list(PhraseSegmenter(max_length=11).segment(self.words))
+        self.assertEqual(
+            [p["text"] for p in phrases], ["Hello there", "again", "Hi"]
+        )
@@ -0,0 +1,114 @@
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.views import ReceiveTranscriptionView
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from notifications.models import Notification
+from unittest import mock
+import datetime
+import io
+import shutil
+import tempfile
+
+
+class TestReconcileTranscriptions(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(username="user")
+        self.transcription = Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa",
+            video_id="aaaaaaaaaaa",
+            requested_by=self.user,
+        )
+        self.transcription.set_submitted("transcript-id")
+        # webhook was not received for an hour
+        Transcription.objects.filter(pk=self.transcription.pk).update(
+            submitted_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+    def reconcile(self, transcription_response):
+        stdout = io.StringIO()
+        with mock.patch.object(
+            ReceiveTranscriptionView,
+            "get_transcription",
+            return_value=transcription_response,
+        ) as get_transcription:
+            call_command(
+                "reconcile_transcriptions", once=True, concurrency=1, stdout=stdout
+            )
+        self.transcription.refresh_from_db()
+        return get_transcription, stdout.getvalue()
+
+    def test_completed_transcription_is_processed(self):
+        get_transcription, output = self.reconcile(
+            {
+                "status": "completed",
+                "words": [{"text": "Hello", "start": 0, "end": 500, "speaker": "A"}],
+            }
+        )
+        get_transcription.assert_called_once_with("transcript-id")
+        self.assertIn("Checked transcription aaaaaaaaaaa: success", output)
+        self.assertEqual(self.transcription.status, Transcription.STATUS_DONE)
+        self.assertTrue(self.transcription.file)
+        self.assertTrue(Notification.objects.filter(recipient=self.user).exists())
+
+    def test_pending_transcription_is_checked_later(self):
+        get_transcription, output = self.reconcile({"status": "processing"})
+        self.assertEqual(self.transcription.status, Transcription.STATUS_SUBMITTED)
+        self.assertEqual(self.transcription.check_attempts, 1)
+        self.assertGreater(self.transcription.next_check_at, timezone.now())
+
+        # next check is not due yet
+        get_transcription, output = self.reconcile({"status": "processing"})
+        get_transcription.assert_not_called()
+
+    def test_unknown_status_is_checked_later(self):
+        get_transcription, output = self.reconcile({"error": "Internal error"})
+        self.assertIn("Checked transcription aaaaaaaaaaa: unknown", output)
+        self.assertEqual(self.transcription.status, Transcription.STATUS_SUBMITTED)
+        self.assertEqual(self.transcription.check_attempts, 1)
+
+    def test_failed_check_is_retried_later(self):
+        with mock.patch.object(
+            ReceiveTranscriptionView, "get_transcription", side_effect=ValueError
+        ):
+            call_command(
+                "reconcile_transcriptions", once=True, concurrency=1, stdout=io.StringIO()
+            )
+        self.transcription.refresh_from_db()
+        self.assertEqual(self.transcription.status, Transcription.STATUS_SUBMITTED)
+        self.assertEqual(self.transcription.check_attempts, 1)
+        self.assertGreater(self.transcription.next_check_at, timezone.now())
+
+    def test_transcription_left_in_processing_is_processed(self):
+        # worker died while processing transcription
+        Transcription.objects.filter(pk=self.transcription.pk).update(
+            status=Transcription.STATUS_PROCESSING,
+            processing_at=timezone.now() - datetime.timedelta(minutes=1),
+        )
+        get_transcription, output = self.reconcile({"status": "completed"})
+        get_transcription.assert_not_called()
+
+        Transcription.objects.filter(pk=self.transcription.pk).update(
+            processing_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        get_transcription, output = self.reconcile(
+            {
+                "status": "completed",
+                "words": [{"text": "Hello", "start": 0, "end": 500, "speaker": "A"}],
+            }
+        )
+        self.assertIn("Checked transcription aaaaaaaaaaa: success", output)
+        self.assertEqual(self.transcription.status, Transcription.STATUS_DONE)
+
+    def test_transcription_without_transcript_id_fails(self):
+        Transcription.objects.filter(pk=self.transcription.pk).update(transcript_id="")
+        get_transcription, output = self.reconcile({})
+        get_transcription.assert_not_called()
+        self.assertEqual(self.transcription.status, Transcription.STATUS_FAILED)
+        self.assertEqual(self.transcription.error, "Transcription was not received")
@@ -0,0 +1,101 @@
+from wagtail_transcription.exports import EXPORTS_DIRECTORY
+from wagtail_transcription.models import (
+    Transcription,
+    TranscriptSegment,
+    TranscriptWordIndex,
+)
+from wagtail_transcription.views import ReceiveTranscriptionView
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from docx import Document as docx_document
+import io
+import shutil
+import tempfile
+
+
+class TestRerenderTranscriptions(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.transcriptions = []
+        for video_id in ["aaaaaaaaaaa", "bbbbbbbbbbb"]:
+            Transcription.objects.create(
+                title=f"auto_transcription-{video_id}",
+                video_id=video_id,
+                status=Transcription.STATUS_PROCESSING,
+            )
+            self.transcriptions.append(
+                ReceiveTranscriptionView().process_transcription_response(
+                    {
+                        "words": [
+                            {"text": "Hello", "start": 0, "end": 400, "speaker": "A"},
+                            {"text": "Hi", "start": 1500, "end": 1800, "speaker": "B"},
+                        ]
+                    },
+                    video_id,
+                )
+            )
+        # derived data was lost or has to be rendered in new format
+        TranscriptSegment.objects.all().delete()
+        TranscriptWordIndex.objects.all().delete()
+
+    def rerender(self, **options):
+        stdout = io.StringIO()
+        call_command("rerender_transcriptions", stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def assert_rendered(self, transcription):
+        old_file = transcription.file
+        transcription.refresh_from_db()
+        self.assertNotEqual(transcription.file.name, old_file.name)
+        self.assertFalse(old_file.storage.exists(old_file.name))
+        with transcription.file.open("rb") as file:
+            paragraphs = [p.text for p in docx_document(file).paragraphs]
+        self.assertEqual(paragraphs, ["0:00:00.00", "Hello\n", "0:00:01.50", "Hi\n"])
+        self.assertEqual(transcription.file_size, transcription.file.size)
+        self.assertEqual(transcription.segments.count(), 2)
+        self.assertEqual(transcription.word_index.word_count, 2)
+
+    def test_rerender_in_process(self):
+        storage = Transcription._meta.get_field("file").storage
+        export_name = storage.save(
+            f"{EXPORTS_DIRECTORY}/aaaaaaaaaaa/old.srt", ContentFile(b"old")
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            output = self.rerender(workers=1, batch_size=1)
+        self.assertIn("Rendered 2/2 transcriptions, 0 failed", output)
+        for transcription in self.transcriptions:
+            self.assert_rendered(transcription)
+        # export of previous render is not served anymore
+        self.assertFalse(storage.exists(export_name))
+
+    def test_rerender_in_process_pool(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            output = self.rerender(workers=2, video_id=["aaaaaaaaaaa"])
+        self.assertIn("Rendered 1/1 transcriptions, 0 failed", output)
+        self.assert_rendered(self.transcriptions[0])
+        self.assertFalse(
+            TranscriptSegment.objects.filter(
+                transcription=self.transcriptions[1]
+            ).exists()
+        )
+
+    def test_filters(self):
+        self.transcriptions[0].tags.add("lecture")
+        self.assertIn(
+            "Rendering 1 transcriptions", self.rerender(workers=1, tag=["lecture"])
+        )
+        self.assertIn("Rendering 0 transcriptions", self.rerender(status=["failed"]))
+        self.assertIn("Rendering 0 transcriptions", self.rerender(since="2999-01-01"))
+        with self.assertRaises(CommandError):
+            self.rerender(outputs="pdf")
+
+    def test_only_selected_outputs(self):
+        output = self.rerender(workers=1, outputs="words")
+        self.assertIn("Rendered 2/2", output)
+        self.assertEqual(TranscriptWordIndex.objects.count(), 2)
+        self.assertFalse(TranscriptSegment.objects.exists())
@@ -0,0 +1,85 @@
+from wagtail_transcription import streams, submission
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.streams import get_stream_info, get_url_expires_at
+from wagtail_transcription.submission import submit_queued_transcriptions
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from unittest import mock
+import pytube
+import time
+
+
+def signed_url(expires_at):
+    return f"https://rr1.googlevideo.com/videoplayback?expire={int(expires_at)}&itag=140"
+
+
+class TestStreamCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="user")
+
+    def resolve(self, expires_at):
+        return mock.patch.object(
+            streams,
+            "resolve_stream",
+            return_value={"audio_url": signed_url(expires_at), "length": 125},
+        )
+
+    def test_get_url_expires_at(self):
+        self.assertEqual(get_url_expires_at(signed_url(1700000000)), 1700000000)
+        self.assertIsNone(get_url_expires_at("https://audio.example.com"))
+
+    def test_stream_is_cached_until_url_expires(self):
+        with self.resolve(time.time() + 6 * 60 * 60) as resolve_stream:
+            first = get_stream_info("aaaaaaaaaaa")
+            self.assertEqual(get_stream_info("aaaaaaaaaaa"), first)
+        resolve_stream.assert_called_once_with("aaaaaaaaaaa")
+
+        # cached url would expire before assemblyai downloads audio
+        with mock.patch.object(
+            streams.time, "time", return_value=time.time() + 6 * 60 * 60 - 60
+        ), self.resolve(time.time() + 12 * 60 * 60) as resolve_stream:
+            get_stream_info("aaaaaaaaaaa")
+        resolve_stream.assert_called_once_with("aaaaaaaaaaa")
+
+    def test_url_about_to_expire_is_not_cached(self):
+        with self.resolve(time.time() + 60) as resolve_stream:
+            get_stream_info("aaaaaaaaaaa")
+            get_stream_info("aaaaaaaaaaa")
+        self.assertEqual(resolve_stream.call_count, 2)
+
+    def create_transcription(self, audio_url):
+        return Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa",
+            video_id="aaaaaaaaaaa",
+            audio_url=audio_url,
+            requested_by=self.user,
+        )
+
+    def test_expired_url_is_resolved_before_submission(self):
+        transcription = self.create_transcription(signed_url(time.time() - 60))
+        fresh_url = signed_url(time.time() + 6 * 60 * 60)
+        with self.resolve(time.time() + 6 * 60 * 60), mock.patch.object(
+            submission, "request_audio_transcription", return_value={"id": "abc"}
+        ) as request_audio_transcription:
+            self.assertEqual(submit_queued_transcriptions(), 1)
+        request_audio_transcription.assert_called_once_with(
+            audio_url=fresh_url, video_id="aaaaaaaaaaa", user_id=self.user.id
+        )
+        transcription.refresh_from_db()
+        self.assertEqual(transcription.audio_url, fresh_url)
+
+    def test_unavailable_video_fails_before_submission(self):
+        transcription = self.create_transcription(signed_url(time.time() - 60))
+        with mock.patch.object(
+            streams,
+            "resolve_stream",
+            side_effect=pytube.exceptions.VideoPrivate("aaaaaaaaaaa"),
+        ), mock.patch.object(
+            submission, "request_audio_transcription"
+        ) as request_audio_transcription:
+            self.assertEqual(submit_queued_transcriptions(), 0)
+        request_audio_transcription.assert_not_called()
+        transcription.refresh_from_db()
+        self.assertEqual(transcription.status, Transcription.STATUS_FAILED)
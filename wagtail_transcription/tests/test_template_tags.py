@@ -1,6 +1,11 @@
 from django.template import Context, Template
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls.base import reverse
+from notifications.signals import notify
 from wagtail_transcription.models import Transcription
+from wagtail_transcription.notification_count import get_timeout, get_unread_count
 
 class TestTranscriptionTemplateTags(TestCase):
 
@@ -36,4 +41,56 @@ class TestTranscriptionTemplateTags(TestCase):
 
         if rendered != f'wagtail_transcription:Transcription:{str(self.transcription.id)}':
             self.fail(f"get_app_model_id for value '{self.transcription}' should return 'wagtail_transcription:Transcription:{str(self.transcription.id)}'")
-    
+
+
+class TestNotificationUnreadCount(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='user')
+        self.other_user = User.objects.create(username='other_user')
+
+    def notify(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            return notify.send(sender=user, recipient=user, verb="Message")[0][1][0]
+
+    def test_unread_count_is_cached_per_user(self):
+        self.assertEqual(get_unread_count(self.user), 0)
+        self.assertEqual(get_unread_count(self.other_user), 0)
+        notification = self.notify(self.user)
+        self.notify(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user), 2)
+            self.assertEqual(get_unread_count(self.other_user), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.mark_as_read()
+        self.assertEqual(get_unread_count(self.user), 1)
+        # saving read notification again does not change counter
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.save()
+        self.assertEqual(get_unread_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.notifications.unread().delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user), 0)
+
+    def test_mark_all_as_read_resets_unread_count(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        self.notify(self.user)
+        self.assertEqual(get_unread_count(self.user), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            r = self.client.get(reverse("wagtail_transcription:mark_all_notifications_as_read"))
+        self.assertRedirects(r, reverse("notifications:unread"), fetch_redirect_response=False)
+        self.assertEqual(get_unread_count(self.user), 0)
+
+    def test_timeout_is_short_with_per_process_cache(self):
+        # increments made by other processes are not seen in LocMemCache
+        self.assertEqual(get_timeout(), 2)
+        with override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        ):
+            self.assertEqual(get_timeout(), 300)
@@ -0,0 +1,101 @@
+from wagtail_transcription.models import Transcription, TranscriptSegment
+from wagtail_transcription.search import read_docx_phrases, search_transcripts
+from wagtail_transcription.segmentation import parse_timestamp
+from wagtail_transcription.views import ReceiveTranscriptionView
+from wagtail_transcription.wagtail_hooks import TranscriptionAdmin
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls.base import reverse
+import io
+import shutil
+import tempfile
+
+
+class TestTranscriptSearch(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com", password="superuser123"
+        )
+        self.client.login(username="superuser", password="superuser123")
+        self.transcription = Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa",
+            video_id="aaaaaaaaaaa",
+            status=Transcription.STATUS_PROCESSING,
+        )
+        words = [
+            {"text": "Welcome", "start": 0, "end": 400, "speaker": "A"},
+            {"text": "everyone", "start": 450, "end": 800, "speaker": "A"},
+            {"text": "Photosynthesis", "start": 61000, "end": 61500, "speaker": "B"},
+            {"text": "<b>matters</b>", "start": 61600, "end": 62000, "speaker": "B"},
+        ]
+        ReceiveTranscriptionView().process_transcription_response(
+            {"words": words}, "aaaaaaaaaaa"
+        )
+        self.transcription.refresh_from_db()
+
+    def test_transcript_is_indexed_when_received(self):
+        segments = TranscriptSegment.objects.filter(transcription=self.transcription)
+        self.assertEqual(
+            [(s.position, s.start_ms, s.speaker) for s in segments],
+            [(0, 0, "A"), (1, 61000, "B")],
+        )
+        self.assertEqual(self.transcription.word_index.word_count, 4)
+
+    def test_search_transcripts(self):
+        results = search_transcripts("photosynthesis MATTERS")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["video_id"], "aaaaaaaaaaa")
+        self.assertEqual(results[0]["start"], "0:01:01.00")
+        # transcript text is escaped, only matches are marked
+        self.assertEqual(
+            results[0]["snippet"],
+            "<mark>Photosynthesis</mark> &lt;b&gt;<mark>matters</mark>&lt;/b&gt;",
+        )
+        self.assertEqual(search_transcripts("photosynthesis missing"), [])
+
+    def test_search_api(self):
+        r = self.client.get(
+            reverse("wagtail_transcription:search_transcripts"), {"q": "welcome"}
+        )
+        results = r.json()["results"]
+        self.assertEqual([result["position"] for result in results], [0])
+        self.assertEqual(
+            results[0]["edit_url"],
+            TranscriptionAdmin().url_helper.get_action_url(
+                "edit", self.transcription.pk
+            ),
+        )
+
+    def test_admin_search(self):
+        url = TranscriptionAdmin().url_helper.get_action_url("search_transcripts")
+        r = self.client.get(url, {"q": "everyone"})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Welcome <mark>everyone</mark>")
+
+    def test_index_transcripts_command(self):
+        TranscriptSegment.objects.all().delete()
+        stdout = io.StringIO()
+        call_command("index_transcripts", stdout=stdout)
+        self.assertIn("Indexed 1 transcriptions, 0 failed", stdout.getvalue())
+        self.assertEqual(
+            list(
+                TranscriptSegment.objects.values_list("start_ms", "text").order_by(
+                    "position"
+                )
+            ),
+            [(0, "Welcome everyone"), (61000, "Photosynthesis <b>matters</b>")],
+        )
+
+    def test_read_docx_phrases(self):
+        with self.transcription.file.open("rb") as file:
+            phrases = list(read_docx_phrases(file))
+        self.assertEqual([p["start_ms"] for p in phrases], [0, 61000])
+        self.assertEqual(parse_timestamp("1:00:05.25"), 3605250)
+        self.assertEqual(parse_timestamp("0:00:01.500000"), 1500)
+        self.assertIsNone(parse_timestamp("Hello"))
@@ -42,3 +42,16 @@ class TestTranscriptionModel(WagtailPageTests):
         self.assertEqual(
             transcription_num_before_delete - 1, Transcription.objects.all().count()
         )
+
+    def test_status_transitions(self):
+        transcription = Transcription.objects.get(video_id="aaaaaaaaaaa")
+        self.assertEqual(transcription.status, Transcription.STATUS_QUEUED)
+        self.assertIn(transcription, Transcription.objects.in_progress())
+        transcription.set_status(Transcription.STATUS_SUBMITTED)
+        transcription.set_status(Transcription.STATUS_FAILED, error="Audio is too short")
+        transcription.refresh_from_db()
+        self.assertEqual(transcription.error, "Audio is too short")
+        self.assertIsNotNone(transcription.submitted_at)
+        self.assertIsNotNone(transcription.failed_at)
+        self.assertFalse(transcription.completed)
+        self.assertNotIn(transcription, Transcription.objects.in_progress())
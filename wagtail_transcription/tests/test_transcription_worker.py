@@ -0,0 +1,175 @@
+from wagtail_transcription.models import Transcription, TranscriptionJob
+from wagtail_transcription.views import ReceiveTranscriptionView
+from django.test import TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls.base import reverse
+from unittest import mock
+from wagtail.models import Collection
+import io
+import json
+import requests
+import shutil
+import tempfile
+
+
+class TestTranscriptionWorker(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com"
+        )
+        # root collection created by wagtail migrations is flushed by previous tests
+        if not Collection.objects.exists():
+            Collection.add_root(name="Root")
+        Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa", video_id="aaaaaaaaaaa"
+        ).set_submitted("abc")
+        self.url = reverse(
+            "wagtail_transcription:receive_transcription",
+            kwargs={"video_id": "aaaaaaaaaaa", "user_id": self.user.id},
+        )
+
+    def send_webhook(self):
+        return self.client.post(
+            self.url,
+            data=json.dumps({"status": "completed", "transcript_id": "abc"}),
+            content_type="application/json",
+        )
+
+    @override_settings(TRANSCRIPTION_BACKGROUND_PROCESSING=True)
+    def test_webhook_records_job(self):
+        with mock.patch.object(
+            ReceiveTranscriptionView, "handle_transcription"
+        ) as handle_transcription:
+            r = self.send_webhook()
+        self.assertEqual(r.status_code, 202)
+        handle_transcription.assert_not_called()
+        job = TranscriptionJob.objects.get()
+        self.assertEqual(job.status, TranscriptionJob.STATUS_PENDING)
+        self.assertEqual(job.transcript_id, "abc")
+        self.assertEqual(job.transcript_status, "completed")
+
+        # repeated delivery of pending job is not recorded again
+        r = self.send_webhook()
+        self.assertEqual(r.json(), {"type": "duplicate"})
+        self.assertEqual(TranscriptionJob.objects.count(), 1)
+
+    @override_settings(TRANSCRIPTION_BACKGROUND_PROCESSING=True)
+    def test_worker_processes_job(self):
+        self.send_webhook()
+        with mock.patch.object(
+            ReceiveTranscriptionView, "handle_transcription", return_value="success"
+        ) as handle_transcription:
+            call_command("transcription_worker", "--once", stdout=io.StringIO())
+        handle_transcription.assert_called_once_with(
+            video_id="aaaaaaaaaaa",
+            user_id=self.user.id,
+            status="completed",
+            transcript_id="abc",
+            raise_errors=True,
+        )
+        self.assertEqual(TranscriptionJob.objects.get().status, TranscriptionJob.STATUS_DONE)
+
+    @override_settings(TRANSCRIPTION_BACKGROUND_PROCESSING=True)
+    def test_worker_retries_failed_job(self):
+        self.send_webhook()
+        with mock.patch.object(
+            ReceiveTranscriptionView, "handle_transcription", side_effect=ValueError
+        ):
+            call_command("transcription_worker", "--once", stdout=io.StringIO())
+        job = TranscriptionJob.objects.get()
+        self.assertEqual(job.status, TranscriptionJob.STATUS_PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNone(TranscriptionJob.objects.claim())
+
+    @override_settings(
+        TRANSCRIPTION_BACKGROUND_PROCESSING=True, TRANSCRIPTION_JOB_MAX_ATTEMPTS=2
+    )
+    def test_worker_retries_temporary_fetch_error(self):
+        self.send_webhook()
+        with mock.patch.object(
+            ReceiveTranscriptionView,
+            "get_transcription",
+            side_effect=requests.ConnectionError,
+        ):
+            call_command("transcription_worker", "--once", stdout=io.StringIO())
+            job = TranscriptionJob.objects.get()
+            self.assertEqual(job.status, TranscriptionJob.STATUS_PENDING)
+            # transcription waits for next attempt
+            self.assertEqual(
+                Transcription.objects.get().status, Transcription.STATUS_SUBMITTED
+            )
+
+            TranscriptionJob.objects.update(available_at=job.created_at)
+            call_command("transcription_worker", "--once", stdout=io.StringIO())
+        # all attempts were used
+        self.assertEqual(TranscriptionJob.objects.get().status, TranscriptionJob.STATUS_FAILED)
+        transcription = Transcription.objects.get()
+        self.assertEqual(transcription.status, Transcription.STATUS_FAILED)
+        self.assertIn("ConnectionError", transcription.error)
+
+    def test_outputs_are_stored_by_webhook(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        words = [{"text": "Hello", "start": 0, "end": 500, "speaker": "A"}]
+        with override_settings(MEDIA_ROOT=media_root), mock.patch.object(
+            ReceiveTranscriptionView, "get_transcription", return_value={"words": words}
+        ):
+            r = self.send_webhook()
+        self.assertEqual(r.json(), {"type": "success"})
+        # worker is not needed without background processing
+        self.assertFalse(TranscriptionJob.objects.exists())
+        transcription = Transcription.objects.get()
+        self.assertTrue(transcription.raw_payload)
+        self.assertEqual(transcription.segments.get().text, "Hello")
+        self.assertEqual(transcription.word_index.word_count, 1)
+
+    @override_settings(TRANSCRIPTION_BACKGROUND_PROCESSING=True)
+    def test_outputs_are_stored_by_worker(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        words = [{"text": "Hello", "start": 0, "end": 500, "speaker": "A"}]
+        view = ReceiveTranscriptionView()
+        # transcript processed during request
+        view.request = mock.Mock()
+        with override_settings(MEDIA_ROOT=media_root), mock.patch.object(
+            ReceiveTranscriptionView, "get_transcription", return_value={"words": words}
+        ) as get_transcription:
+            response_type = view.handle_transcription(
+                video_id="aaaaaaaaaaa",
+                user_id=self.user.id,
+                status="completed",
+                transcript_id="abc",
+            )
+            self.assertEqual(response_type, "success")
+            transcription = Transcription.objects.get()
+            self.assertEqual(transcription.status, Transcription.STATUS_DONE)
+            # request only rendered transcription file and stored fetched payload
+            self.assertTrue(transcription.raw_payload)
+            self.assertFalse(transcription.segments.exists())
+            job = TranscriptionJob.objects.get()
+            self.assertEqual(job.kind, TranscriptionJob.KIND_OUTPUTS)
+
+            call_command("transcription_worker", "--once", stdout=io.StringIO())
+            self.assertEqual(transcription.segments.get().text, "Hello")
+            self.assertEqual(transcription.word_index.word_count, 1)
+        # worker works from stored payload
+        get_transcription.assert_called_once_with("abc")
+        self.assertEqual(TranscriptionJob.objects.get().status, TranscriptionJob.STATUS_DONE)
+
+    @override_settings(TRANSCRIPTION_BACKGROUND_PROCESSING=True)
+    def test_queued_transcriptions_are_submitted_by_worker(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        with override_settings(MEDIA_ROOT=media_root), mock.patch.object(
+            ReceiveTranscriptionView, "get_transcription", return_value={"words": []}
+        ), mock.patch(
+            "wagtail_transcription.submission.claim_queued_transcriptions",
+            return_value=[],
+        ) as claim_queued_transcriptions:
+            self.send_webhook()
+            # webhook request does not wait for submissions
+            claim_queued_transcriptions.assert_not_called()
+            call_command("transcription_worker", "--once", stdout=io.StringIO())
+        # after processed job and when worker is idle
+        self.assertEqual(claim_queued_transcriptions.call_count, 2)
@@ -0,0 +1,113 @@
+from wagtail_transcription.decorators import video_data_validation
+from wagtail_transcription.views import AsyncValidateTranscriptionDataView
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.urls.base import reverse
+from home.models import HomePage
+from unittest import mock
+from wagtail.models import Page
+import json
+import time
+
+VALIDATION_MODULE = "wagtail_transcription.views.transcription.validation"
+ASYNC_VIEWS_MODULE = "wagtail_transcription.views.transcription.async_views"
+
+
+def slow(result, delay=0.2):
+    def _slow(*args, **kwargs):
+        time.sleep(delay)
+        return result
+
+    return _slow
+
+
+class TestValidateTranscriptionData(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com", password="superuser123"
+        )
+        self.client.login(username="superuser", password="superuser123")
+        page = Page.objects.get(depth=1).add_child(instance=HomePage(title="Video"))
+        self.data = {
+            "video_id": "aaaaaaaaaaa",
+            "parent_instance_str": f"home:HomePage:{page.pk}",
+            "field_name": "video_id",
+            "transcription_field": "transcription",
+            "transcription_field_id": "id_transcription",
+        }
+        self.stream_info = {"audio_url": "https://audio", "length": 125}
+        self.metadata = {
+            "video_id": "aaaaaaaaaaa",
+            "title": "Video title",
+            "channel_title": "Channel",
+            "thumbnail": "https://thumbnail",
+            "duration": 100,
+            "fetched_at": time.time(),
+        }
+
+    def validate(self):
+        return self.client.post(
+            reverse("wagtail_transcription:validate_transcription_data"), data=self.data
+        )
+
+    def test_streams_and_metadata_are_fetched_concurrently(self):
+        with mock.patch(
+            f"{VALIDATION_MODULE}.get_video_stream",
+            side_effect=slow((self.stream_info, None)),
+        ), mock.patch(
+            f"{VALIDATION_MODULE}.get_video_metadata", side_effect=slow(self.metadata)
+        ):
+            start = time.monotonic()
+            r = self.validate()
+            duration = time.monotonic() - start
+        self.assertEqual(r.json()["type"], "success")
+        self.assertIn("Video title", r.json()["message"])
+        self.assertLess(duration, 0.35)
+        stages = [metric.split(";")[0] for metric in r["Server-Timing"].split(", ")]
+        self.assertEqual(sorted(stages), ["db", "metadata", "render", "streams"])
+
+    @override_settings(TRANSCRIPTION_STREAMS_TIMEOUT=0.05)
+    def test_stage_timeout(self):
+        with mock.patch(
+            f"{VALIDATION_MODULE}.get_video_stream",
+            side_effect=slow((self.stream_info, None)),
+        ), mock.patch(
+            f"{VALIDATION_MODULE}.get_video_metadata", return_value=self.metadata
+        ):
+            r = self.validate()
+        self.assertEqual(r.json()["type"], "error")
+        self.assertIn("YouTube is not responding", r.json()["message"])
+        self.assertIn('streams;dur=50.0;desc="timeout"', r["Server-Timing"])
+
+    async def test_async_view(self):
+        request = AsyncRequestFactory().post("/", data=self.data)
+        request.user = self.user
+        with mock.patch(
+            f"{ASYNC_VIEWS_MODULE}.get_video_stream",
+            side_effect=slow((self.stream_info, None)),
+        ), mock.patch(
+            f"{ASYNC_VIEWS_MODULE}.aget_video_metadata", return_value=self.metadata
+        ):
+            r = await AsyncValidateTranscriptionDataView.as_view()(request)
+        self.assertEqual(json.loads(r.content)["type"], "success")
+        self.assertIn("streams;dur=", r["Server-Timing"])
+
+    def test_invalid_video(self):
+        with mock.patch(
+            f"{VALIDATION_MODULE}.get_video_stream",
+            return_value=(self.stream_info, None),
+        ), mock.patch(f"{VALIDATION_MODULE}.get_video_metadata", return_value=None):
+            r = self.validate()
+        self.assertEqual(r.json()["type"], "error")
+
+    def test_deprecated_video_data_validation(self):
+        with self.assertWarns(DeprecationWarning):
+            view = video_data_validation(lambda request, yt: JsonResponse({"video_id": yt.video_id}))
+        request = RequestFactory().post("/", data=self.data)
+        with mock.patch(
+            "wagtail_transcription.decorators.get_video_stream",
+            return_value=(self.stream_info, None),
+        ):
+            r = view(request)
+        self.assertEqual(json.loads(r.content), {"video_id": "aaaaaaaaaaa"})
@@ -1,11 +1,17 @@
 from wagtail_transcription.models import Transcription
+from wagtail_transcription.submission import get_or_create_transcription
 from wagtail_transcription.wagtail_hooks import TranscriptionAdmin
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.test import Client
 from django.contrib.auth.models import User
 from django.urls.base import reverse
 from notifications.signals import notify
 from notifications.models import Notification
+from unittest import mock
+from wagtail_transcription.views import ReceiveTranscriptionView
+import json
 
 class TestViews(TestCase):
     def setUp(self):
@@ -76,3 +82,128 @@ class TestViews(TestCase):
         self.assertEqual(r_json.get('new_transcription_id'), self.transcription.id)
         self.assertEqual(r_json.get('new_transcription_title'), self.transcription.title)
         self.assertEqual(r_json.get('new_transcription_edit_url'), TranscriptionAdmin().url_helper.get_action_url("edit", self.transcription.id))
+
+    # sync view does not keep WSGI worker waiting
+    @override_settings(TRANSCRIPTION_LONG_POLL_TIMEOUT=60)
+    def test_wait_processing_transcriptions_view(self):
+        url = reverse("wagtail_transcription:wait_processing_transcriptions")
+        self.check_if_regular_user_have_access(url)
+        # client without version gets current state immediately
+        r = self.logged_in_superuser.get(url)
+        version = r.json().get('version')
+        self.assertEqual(r.json().get('transcriptions'), {self.transcription.video_id: True})
+        # nothing changed
+        r = self.logged_in_superuser.get(url, data={'version': version})
+        self.assertEqual(r.json(), {'version': version, 'transcriptions': None})
+        # transcription completed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.transcription.completed = True
+            self.transcription.save()
+        r = self.logged_in_superuser.get(url, data={'version': version})
+        self.assertNotEqual(r.json().get('version'), version)
+        self.assertEqual(r.json().get('transcriptions'), {})
+
+    @override_settings(TRANSCRIPTION_SYNC_LONG_POLL_TIMEOUT=0.05, TRANSCRIPTION_LONG_POLL_INTERVAL=0.01)
+    def test_wait_processing_transcriptions_checks_only_status_version(self):
+        url = reverse("wagtail_transcription:wait_processing_transcriptions")
+        version = self.logged_in_superuser.get(url).json().get('version')
+        with CaptureQueriesContext(connection) as queries:
+            r = self.logged_in_superuser.get(url, data={'version': version})
+        self.assertEqual(r.json(), {'version': version, 'transcriptions': None})
+        # waiting request reads only counter row
+        self.assertFalse([q for q in queries if 'wagtail_transcription_transcription' in q['sql']])
+        self.assertGreater(len([q for q in queries if 'wagtail_transcription_statusversion' in q['sql']]), 1)
+
+    def test_get_processing_transcriptions_view_etag(self):
+        url = reverse("wagtail_transcription:processing_transcriptions")
+        r = self.logged_in_superuser.get(url)
+        etag = r.headers.get('ETag')
+        self.assertTrue(etag)
+        # nothing changed, transcriptions are not queried
+        with CaptureQueriesContext(connection) as queries:
+            r = self.logged_in_superuser.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 304)
+        self.assertFalse([q for q in queries if 'wagtail_transcription_transcription' in q['sql']])
+        self.assertEqual(len([q for q in queries if 'wagtail_transcription_statusversion' in q['sql']]), 1)
+        # transcription changed with queryset update that does not send signals
+        with self.captureOnCommitCallbacks(execute=True):
+            Transcription.objects.filter(pk=self.transcription.pk).update(status=Transcription.STATUS_DONE)
+        r = self.logged_in_superuser.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r.headers.get('ETag'), etag)
+        self.assertEqual(r.json(), {})
+
+    def test_get_processing_transcriptions_view_for_video_ids(self):
+        Transcription.objects.create(title='Other Transcription', video_id='bbbbbbbbbbb')
+        url = reverse("wagtail_transcription:processing_transcriptions")
+        r = self.logged_in_superuser.get(url, data={'video_ids': 'aaaaaaaaaaa,ccccccccccc,invalid'})
+        self.assertEqual(r.json(), {'aaaaaaaaaaa': True, 'ccccccccccc': False})
+        # etag depends on requested video ids
+        etag = r.headers.get('ETag')
+        r = self.logged_in_superuser.get(url, data={'video_ids': 'bbbbbbbbbbb'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json(), {'bbbbbbbbbbb': True})
+
+    def test_receive_transcription_error_keeps_failed_transcription(self):
+        url = reverse(
+            "wagtail_transcription:receive_transcription",
+            kwargs={"video_id": self.transcription.video_id, "user_id": self.superuser.id},
+        )
+        data = json.dumps({"status": "error", "transcript_id": "abc"})
+        transcription_response = {"error": "Audio is too short"}
+        with mock.patch.object(ReceiveTranscriptionView, "get_transcription", return_value=transcription_response):
+            r = self.client.post(url, data=data, content_type="application/json")
+        self.assertEqual(r.json(), {"type": "error"})
+        self.transcription.refresh_from_db()
+        self.assertEqual(self.transcription.status, Transcription.STATUS_FAILED)
+        self.assertEqual(self.transcription.error, "Audio is too short")
+        self.assertIsNotNone(self.transcription.processing_at)
+        # failed transcription is not processing anymore
+        r = self.logged_in_superuser.get(reverse("wagtail_transcription:processing_transcriptions"))
+        self.assertEqual(r.json(), {})
+
+    def test_receive_transcription_duplicate_delivery(self):
+        self.transcription.set_submitted("abc")
+        url = reverse(
+            "wagtail_transcription:receive_transcription",
+            kwargs={"video_id": self.transcription.video_id, "user_id": self.superuser.id},
+        )
+        data = json.dumps({"status": "completed", "transcript_id": "abc"})
+        words = [{"text": "Hello", "start": 0, "end": 500, "speaker": "A"}]
+        with mock.patch.object(
+            ReceiveTranscriptionView, "get_transcription", return_value={"words": words}
+        ) as get_transcription, mock.patch.object(
+            ReceiveTranscriptionView, "process_transcription_response", return_value=self.transcription
+        ):
+            r = self.client.post(url, data=data, content_type="application/json")
+            self.assertEqual(r.json(), {"type": "success"})
+            self.transcription.set_status(Transcription.STATUS_DONE)
+            # same delivery again and late delivery of other transcript do nothing
+            r = self.client.post(url, data=data, content_type="application/json")
+            self.assertEqual(r.json(), {"type": "duplicate"})
+            other_data = json.dumps({"status": "error", "transcript_id": "def"})
+            r = self.client.post(url, data=other_data, content_type="application/json")
+            self.assertEqual(r.json(), {"type": "duplicate"})
+        get_transcription.assert_called_once_with("abc")
+        self.transcription.refresh_from_db()
+        self.assertEqual(self.transcription.status, Transcription.STATUS_DONE)
+
+    def test_claim_transcription_once(self):
+        self.transcription.set_submitted("abc")
+        view = ReceiveTranscriptionView()
+        transcription = view.claim_transcription("aaaaaaaaaaa", "abc")
+        self.assertEqual(transcription.status, Transcription.STATUS_PROCESSING)
+        self.assertIsNone(view.claim_transcription("aaaaaaaaaaa", "abc"))
+        # transcription left in processing by dead worker is claimed again
+        with override_settings(TRANSCRIPTION_JOB_LOCK_TIMEOUT=-1):
+            self.assertIsNotNone(view.claim_transcription("aaaaaaaaaaa", "abc"))
+
+    def test_requeued_transcription_is_not_claimed_by_old_transcript(self):
+        self.transcription.set_submitted("abc")
+        self.transcription.set_status(Transcription.STATUS_FAILED)
+        transcription = get_or_create_transcription("aaaaaaaaaaa", "https://audio.example.com", self.user.id)
+        self.assertEqual(transcription.status, Transcription.STATUS_QUEUED)
+        self.assertEqual(transcription.transcript_id, "")
+        # late delivery of failed transcript
+        Transcription.objects.filter(pk=transcription.pk).update(transcript_id="abc")
+        self.assertIsNone(ReceiveTranscriptionView().claim_transcription("aaaaaaaaaaa", "abc"))
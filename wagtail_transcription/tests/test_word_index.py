@@ -0,0 +1,100 @@
+from wagtail_transcription.models import Transcription, TranscriptWordIndex
+from wagtail_transcription.word_index import (
+    WordIndex,
+    encode_word_index,
+    get_word_index,
+    store_word_index,
+)
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls.base import reverse
+from unittest import mock
+
+
+class TestWordIndex(SimpleTestCase):
+    def setUp(self):
+        self.words = [
+            {"text": "Hello", "start": 0, "end": 400, "speaker": "A"},
+            {"text": "żółw", "start": 450, "end": 800, "speaker": "A"},
+            {"text": "Hello", "start": 1500, "end": 1800, "speaker": "B"},
+            {"text": "again", "start": 1900, "end": 2500, "speaker": "B"},
+        ]
+        self.index = WordIndex(encode_word_index(self.words))
+
+    def test_words_are_decoded(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.duration, 2500)
+        self.assertEqual([self.index.word(i) for i in range(4)], self.words)
+        # duration is not computed again for cached index
+        with mock.patch.object(self.index, "ends", None):
+            self.assertEqual(self.index.duration, 2500)
+
+    def test_between(self):
+        self.assertEqual(self.index.between(0, 450), range(0, 1))
+        # word spoken at start of range is included
+        self.assertEqual(self.index.between(500, 1600), range(1, 3))
+        self.assertEqual(self.index.between(900, 1400), range(2, 2))
+        self.assertEqual(self.index.between(3000, 4000), range(4, 4))
+        self.assertEqual(
+            [w["text"] for w in self.index.words_between(0, 3000, limit=2)],
+            ["Hello", "żółw"],
+        )
+
+    def test_repeated_texts_are_stored_once(self):
+        words = [
+            {"text": "word", "start": i * 100, "end": i * 100 + 50, "speaker": "A"}
+            for i in range(1000)
+        ]
+        # 14 bytes per word and one string
+        self.assertLess(len(encode_word_index(words)), 1000 * 14 + 64)
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            WordIndex(b"\0" * 64)
+
+
+class TestTranscriptionWordsView(TestCase):
+    def setUp(self):
+        User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com", password="superuser123"
+        )
+        self.client.login(username="superuser", password="superuser123")
+        self.transcription = Transcription.objects.create(
+            title="auto_transcription-aaaaaaaaaaa", video_id="aaaaaaaaaaa"
+        )
+        store_word_index(
+            self.transcription,
+            [
+                {"text": "Hello", "start": 0, "end": 400, "speaker": "A"},
+                {"text": "world", "start": 450, "end": 800, "speaker": "A"},
+                {"text": "Hi", "start": 1500, "end": 1800, "speaker": "B"},
+            ],
+        )
+
+    def get(self, **params):
+        return self.client.get(
+            reverse("wagtail_transcription:transcription_words"),
+            {"video_id": "aaaaaaaaaaa", **params},
+        )
+
+    def test_words(self):
+        r = self.get(start=500, end=1600)
+        self.assertEqual([w["text"] for w in r.json()["words"]], ["world", "Hi"])
+        self.assertFalse(r.json()["truncated"])
+
+    def test_phrases(self):
+        r = self.get(unit="phrases")
+        self.assertEqual(
+            [(p["speaker"], p["text"]) for p in r.json()["phrases"]],
+            [("A", "Hello world"), ("B", "Hi")],
+        )
+
+    def test_replaced_index_is_reloaded(self):
+        self.assertEqual(len(get_word_index(self.transcription.pk)), 3)
+        store_word_index(self.transcription, [])
+        self.assertEqual(len(get_word_index(self.transcription.pk)), 0)
+        self.assertEqual(TranscriptWordIndex.objects.count(), 1)
+
+    def test_missing_transcription(self):
+        self.assertEqual(self.get(video_id="bbbbbbbbbbb").status_code, 404)
+        self.assertEqual(self.get(video_id="").status_code, 404)
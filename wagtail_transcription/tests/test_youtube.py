@@ -0,0 +1,135 @@
+from wagtail_transcription import youtube
+from wagtail_transcription.models import Transcription, VideoMetadata
+from wagtail_transcription.wagtail_hooks import TranscriptionAdmin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from unittest import mock
+
+
+def videos_response(*video_ids):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {
+        "items": [
+            {
+                "id": video_id,
+                "snippet": {
+                    "title": f"Title {video_id}",
+                    "channelTitle": "Channel",
+                    "thumbnails": {"default": {"url": f"https://i.ytimg.com/{video_id}"}},
+                },
+                "contentDetails": {"duration": "PT1H2M3S"},
+            }
+            for video_id in video_ids
+        ]
+    }
+    return response
+
+
+@override_settings(YOUTUBE_DATA_API_KEY="key")
+class TestVideoMetadata(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(youtube, "get_http_client")
+        self.http_client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def test_parse_duration(self):
+        self.assertEqual(youtube.parse_duration("PT1H2M3S"), 3723)
+        self.assertEqual(youtube.parse_duration("PT45S"), 45)
+        self.assertEqual(youtube.parse_duration("P1DT1M"), 86460)
+        self.assertIsNone(youtube.parse_duration("P0D1"))
+
+    def test_metadata_is_fetched_once(self):
+        self.http_client.get.return_value = videos_response("aaaaaaaaaaa")
+        metadata = youtube.get_video_metadata("aaaaaaaaaaa")
+        self.assertEqual(metadata["title"], "Title aaaaaaaaaaa")
+        self.assertEqual(metadata["channel_title"], "Channel")
+        self.assertEqual(metadata["duration"], 3723)
+        self.assertEqual(youtube.get_video_metadata("aaaaaaaaaaa"), metadata)
+        self.assertEqual(self.http_client.get.call_count, 1)
+
+    def test_database_fallback(self):
+        self.http_client.get.return_value = videos_response("aaaaaaaaaaa")
+        youtube.get_video_metadata("aaaaaaaaaaa")
+        cache.clear()
+        with self.assertNumQueries(1):
+            metadata = youtube.get_video_metadata("aaaaaaaaaaa")
+        self.assertEqual(metadata["title"], "Title aaaaaaaaaaa")
+        self.assertEqual(self.http_client.get.call_count, 1)
+        self.assertTrue(VideoMetadata.objects.filter(video_id="aaaaaaaaaaa").exists())
+
+    def test_missing_video_is_cached(self):
+        self.http_client.get.return_value = videos_response()
+        self.assertIsNone(youtube.get_video_metadata("bbbbbbbbbbb"))
+        self.assertIsNone(youtube.get_video_metadata("bbbbbbbbbbb"))
+        self.assertEqual(self.http_client.get.call_count, 1)
+
+    def test_error_response_is_not_cached(self):
+        self.http_client.get.return_value = videos_response("aaaaaaaaaaa")
+        youtube.get_video_metadata("aaaaaaaaaaa")
+        # e.g. exceeded quota
+        error_response = mock.Mock(status_code=403)
+        error_response.json.return_value = {"error": {"code": 403}}
+        self.http_client.get.return_value = error_response
+        youtube.refresh_videos_metadata(["aaaaaaaaaaa", "bbbbbbbbbbb"])
+        self.assertEqual(
+            youtube.get_video_metadata("aaaaaaaaaaa")["title"], "Title aaaaaaaaaaa"
+        )
+        self.assertIsNone(youtube.get_video_metadata("bbbbbbbbbbb"))
+        # video is requested again after error
+        self.http_client.get.return_value = videos_response("bbbbbbbbbbb")
+        self.assertEqual(
+            youtube.get_video_metadata("bbbbbbbbbbb")["title"], "Title bbbbbbbbbbb"
+        )
+        self.assertEqual(self.http_client.get.call_count, 4)
+
+    @override_settings(TRANSCRIPTION_VIDEO_METADATA_TTL=-1)
+    def test_stale_metadata_is_refreshed_in_background(self):
+        self.http_client.get.return_value = videos_response("aaaaaaaaaaa")
+        youtube.get_video_metadata("aaaaaaaaaaa")
+        with mock.patch.object(youtube, "schedule_refresh") as schedule_refresh:
+            metadata = youtube.get_video_metadata("aaaaaaaaaaa")
+        self.assertEqual(metadata["title"], "Title aaaaaaaaaaa")
+        schedule_refresh.assert_called_once_with(["aaaaaaaaaaa"])
+
+    def test_batched_lookup(self):
+        video_ids = [f"video{i:06d}" for i in range(120)]
+        self.http_client.get.side_effect = lambda url, params: videos_response(
+            *params["id"].split(",")
+        )
+        youtube.get_video_metadata(video_ids[0])
+        videos = youtube.get_videos_metadata(video_ids)
+        self.assertEqual(len(videos), 120)
+        # one request for first video, then 119 ids in batches of 50
+        requested = [
+            call.kwargs["params"]["id"].split(",")
+            for call in self.http_client.get.call_args_list
+        ]
+        self.assertEqual([len(ids) for ids in requested], [1, 50, 50, 19])
+        self.assertNotIn(video_ids[0], requested[1])
+
+
+@override_settings(YOUTUBE_DATA_API_KEY="key")
+class TestTranscriptionAdminIndex(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.superuser = User.objects.create_superuser(
+            username="superuser", email="superuser@gmail.com", password="superuser123"
+        )
+        self.client.login(username="superuser", password="superuser123")
+        for i in range(3):
+            Transcription.objects.create(
+                title=f"Transcription {i}", video_id=f"aaaaaaaaaa{i}"
+            )
+
+    def test_index_fetches_videos_in_one_request(self):
+        with mock.patch.object(youtube, "get_http_client") as get_http_client:
+            http_client = get_http_client.return_value
+            http_client.get.return_value = videos_response(
+                "aaaaaaaaaa0", "aaaaaaaaaa1", "aaaaaaaaaa2"
+            )
+            r = self.client.get(TranscriptionAdmin().url_helper.index_url)
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Title aaaaaaaaaa1")
+        self.assertEqual(http_client.get.call_count, 1)
@@ -0,0 +1,73 @@
+from django.http import HttpRequest, HttpResponse
+
+from contextlib import contextmanager
+from functools import wraps
+import threading
+import time
+from typing import Callable, Iterator, Type
+
+
+class StageTimer:
+    """
+    Collect durations of request stages (also from other threads)
+    and report them in Server-Timing header
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def record(self, name: str, duration: float, description: str = "") -> None:
+        """
+        Record stage that took duration milliseconds
+        """
+
+        with self.lock:
+            self.stages[name] = (duration, description)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """
+        Wrap func so every call is recorded as stage, used for
+        stages that run in thread pool
+        """
+
+        @wraps(func)
+        def _wrap(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+
+        return _wrap
+
+    def get_header(self) -> str:
+        with self.lock:
+            stages = list(self.stages.items())
+        metrics = []
+        for name, (duration, description) in stages:
+            metric = f"{name};dur={duration:.1f}"
+            if description:
+                metric += f';desc="{description}"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+    def add_header(self, response: Type[HttpResponse]) -> Type[HttpResponse]:
+        if self.stages:
+            response["Server-Timing"] = self.get_header()
+        return response
+
+
+def get_stage_timer(request: Type[HttpRequest]) -> Type[StageTimer]:
+    """
+    Return timer of request, decorators and view record their stages in it
+    """
+
+    if not hasattr(request, "stage_timer"):
+        request.stage_timer = StageTimer()
+    return request.stage_timer
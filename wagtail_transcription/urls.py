@@ -4,15 +4,31 @@ from .views import (
     RequestTranscriptionView,
     ReceiveTranscriptionView,
     DeleteNotificationView,
+    MarkAllNotificationsAsReadView,
     GetProcessingTranscriptionsView,
+    WaitProcessingTranscriptionsView,
     GetTranscriptionData,
+    SearchTranscriptsView,
+    TranscriptionWordsView,
+    TranscriptionExportView,
 )
 from django.utils.module_loading import import_string
 from django.conf import settings
 from .decorators import staff_or_group_required
 
+if getattr(settings, "TRANSCRIPTION_ASYNC_VIEWS", False):
+    # views that wait for YouTube and AssemblyAi do not block threads
+    # of ASGI server
+    from .views import (  # noqa: F811
+        AsyncValidateTranscriptionDataView as ValidateTranscriptionDataView,
+        AsyncRequestTranscriptionView as RequestTranscriptionView,
+        AsyncReceiveTranscriptionView as ReceiveTranscriptionView,
+        AsyncGetProcessingTranscriptionsView as GetProcessingTranscriptionsView,
+        AsyncWaitProcessingTranscriptionsView as WaitProcessingTranscriptionsView,
+    )
+
 if hasattr(settings, "RECEIVE_TRANSCRIPTION_VIEW"):
-    ReceiveTranscriptionView = import_string(settings.RECEIVE_TRANSCRIPTION)
+    ReceiveTranscriptionView = import_string(settings.RECEIVE_TRANSCRIPTION_VIEW)
 if hasattr(settings, "REQUEST_TRANSCRIPTION_VIEW"):
     RequestTranscriptionView = import_string(settings.REQUEST_TRANSCRIPTION_VIEW)
 
@@ -43,6 +59,14 @@ urlpatterns = [
         ),
         name="processing_transcriptions",
     ),
+    path(
+        "processing_transcriptions/wait/",
+        staff_or_group_required(
+            WaitProcessingTranscriptionsView.as_view(),
+            group_names=["moderators", "editors"],
+        ),
+        name="wait_processing_transcriptions",
+    ),
     path(
         "transcription_data/",
         staff_or_group_required(
@@ -51,6 +75,30 @@ urlpatterns = [
         ),
         name="transcription_data",
     ),
+    path(
+        "search_transcripts/",
+        staff_or_group_required(
+            SearchTranscriptsView.as_view(),
+            group_names=["moderators", "editors"],
+        ),
+        name="search_transcripts",
+    ),
+    path(
+        "transcription_words/",
+        staff_or_group_required(
+            TranscriptionWordsView.as_view(),
+            group_names=["moderators", "editors"],
+        ),
+        name="transcription_words",
+    ),
+    re_path(
+        r"^transcription_export/(?P<video_id>[0-9A-Za-z_-]{11})/(?P<export_format>[a-z]+)/$",
+        staff_or_group_required(
+            TranscriptionExportView.as_view(),
+            group_names=["moderators", "editors"],
+        ),
+        name="transcription_export",
+    ),
     re_path(
         r"^receive_transcription/(?P<video_id>[0-9A-Za-z_-]+)/(?P<user_id>[0-9]+)?$",
         ReceiveTranscriptionView.as_view(),
@@ -65,4 +113,12 @@ urlpatterns = [
         ),
         name="delete_notification",
     ),
+    path(
+        "mark_all_notifications_as_read/",
+        staff_or_group_required(
+            MarkAllNotificationsAsReadView.as_view(),
+            group_names=["moderators", "editors"],
+        ),
+        name="mark_all_notifications_as_read",
+    ),
 ]
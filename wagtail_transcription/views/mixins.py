@@ -1,9 +1,10 @@
-import requests
+from django.conf import settings
 from docx import Document as docx_document
-import tempfile
 import io
-import datetime
-from typing import Type
+from typing import Iterator, Type
+
+from wagtail_transcription.client import get_async_http_client, get_http_client
+from wagtail_transcription.segmentation import PhraseSegmenter
 
 
 class ProcessTranscriptionMixin:
@@ -18,45 +19,39 @@ class ProcessTranscriptionMixin:
         headers = {
             "authorization": self.api_token,
         }
-        r = requests.get(endpoint, headers=headers)
+        r = get_http_client().get(endpoint, headers=headers)
         return r.json()
 
-    def phreses_generator(self, words: list) -> list:
-        # phrase dict will store info about start of the
-        # sentence, text and speaker
-        phrase = {}
-
-        for word in words:
-            if phrase.get("speaker") != word["speaker"]:
-                if phrase:
-                    # if phrase is not empty dict
-                    yield phrase
-
-                # redefine phrase object
-                phrase = {
-                    "start": str(datetime.timedelta(milliseconds=word["start"]))[:-4],
-                    "speaker": word["speaker"],
-                    "text": word["text"] or "",
-                }
+    async def aget_transcription(self, transcript_id: str) -> dict:
+        endpoint = f"https://api.assemblyai.com/v2/transcript/{transcript_id}"
+        headers = {
+            "authorization": self.api_token,
+        }
+        r = await get_async_http_client().get(endpoint, headers=headers)
+        return r.json()
 
-            elif phrase["speaker"] == word["speaker"]:
-                # append word to phrase text
-                phrase["text"] += f" {word['text']}" if word["text"] else ""
+    def get_phrase_segmenter(self) -> Type[PhraseSegmenter]:
+        return PhraseSegmenter(
+            pause_gap=getattr(settings, "TRANSCRIPTION_PHRASE_PAUSE_GAP", None),
+            max_length=getattr(settings, "TRANSCRIPTION_PHRASE_MAX_LENGTH", None),
+        )
 
-        if phrase:
-            # return last phrase
-            yield phrase
+    def phreses_generator(self, words: list) -> Iterator[dict]:
+        # phrase dict will store info about start of the
+        # sentence, text and speaker
+        return self.get_phrase_segmenter().segment(words)
 
     def create_transcript_docx(self, words: list) -> Type[io.BytesIO]:
         document = docx_document()
-        with tempfile.NamedTemporaryFile() as tmp:
-            for phrase in self.phreses_generator(words):
-                start_paragraph = document.add_paragraph()
-                run = start_paragraph.add_run(str(phrase.get("start")))
-                run.bold = True
-                document.add_paragraph(phrase.get("text") + "\n")
-
-            document.save(tmp.name)
-            io_output = io.BytesIO(tmp.read())
-
+        for phrase in self.phreses_generator(words):
+            start_paragraph = document.add_paragraph()
+            run = start_paragraph.add_run(str(phrase.get("start")))
+            run.bold = True
+            document.add_paragraph(phrase.get("text") + "\n")
+
+        # save document straight into memory, storage backend
+        # will read it from there in chunks
+        io_output = io.BytesIO()
+        document.save(io_output)
+        io_output.seek(0)
         return io_output
@@ -1,6 +1,13 @@
-from django.http import JsonResponse, HttpRequest
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse, HttpRequest, HttpResponseRedirect
+from django.shortcuts import redirect
+from django.utils.encoding import iri_to_uri
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views import View
 from notifications.models import Notification
+from wagtail_transcription.notification_count import reset_unread_count
+from functools import partial
 from typing import Type
 
 
@@ -25,3 +32,27 @@ class DeleteNotificationView(View):
             return JsonResponse({"message": "Successfully deleted notification"})
         else:
             return JsonResponse({"message": "Notification does not exist"})
+
+
+class MarkAllNotificationsAsReadView(View):
+    """
+    Mark all notifications of user as read. Queryset update does not
+    send signals, so cached unread count is reset
+    """
+
+    http_method_names = ["get"]
+
+    def get(
+        self,
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[HttpResponseRedirect]:
+
+        request.user.notifications.mark_all_as_read()
+        transaction.on_commit(partial(reset_unread_count, request.user.pk))
+
+        _next = request.GET.get("next")
+        if _next and url_has_allowed_host_and_scheme(_next, settings.ALLOWED_HOSTS):
+            return redirect(iri_to_uri(_next))
+        return redirect("notifications:unread")
@@ -2,3 +2,7 @@ from .helpers import *  # noqa
 from .receive_transcription import *  # noqa
 from .request_transcription import *  # noqa
 from .validation import *  # noqa
+from .search import *  # noqa
+from .words import *  # noqa
+from .exports import *  # noqa
+from .async_views import *  # noqa
@@ -0,0 +1,312 @@
+# django
+from django.http import JsonResponse, HttpRequest
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+
+# wagtail transcription
+from wagtail_transcription.decorators import (
+    async_video_instance_validation,
+    get_error_response,
+    get_video_stream,
+)
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.status import aget_status_version
+from wagtail_transcription.submission import (
+    arequest_audio_transcription,
+    asubmit_queued_transcriptions,
+)
+from wagtail_transcription.timing import StageTimer, get_stage_timer
+from wagtail_transcription.tokens import validated_video_data_token
+from wagtail_transcription.youtube import aget_video_metadata
+from .helpers import (
+    GetProcessingTranscriptionsView,
+    WaitProcessingTranscriptionsView,
+    format_etag,
+    get_requested_video_ids,
+)
+from .receive_transcription import ReceiveTranscriptionView
+from .request_transcription import RequestTranscriptionView
+from .validation import ValidateTranscriptionDataView, get_stage_timeout
+
+# other packages
+from asgiref.sync import markcoroutinefunction, sync_to_async
+import asyncio
+import logging
+import requests
+import time
+import traceback
+from typing import Callable, Type, Union
+
+
+def async_method_decorator(decorator: Callable) -> Callable:
+    """
+    method_decorator that keeps decorated async method marked as
+    coroutine, Django does it only since 5.1
+    """
+
+    def _decorator(method: Callable) -> Callable:
+        return markcoroutinefunction(method_decorator(decorator)(method))
+
+    return _decorator
+
+
+class AsyncValidateTranscriptionDataView(ValidateTranscriptionDataView):
+    """
+    Async version of ValidateTranscriptionDataView, used when
+    TRANSCRIPTION_ASYNC_VIEWS setting is enabled. YouTube Data API is
+    requested with async client, so validation does not block thread
+    """
+
+    @async_method_decorator(async_video_instance_validation)
+    async def post(
+        self,
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+
+        timer = get_stage_timer(request)
+        video_id = request.POST.get("video_id")
+        # audio streams and video data do not depend on each other
+        streams, metadata = await asyncio.gather(
+            run_stage(
+                "streams",
+                sync_to_async(get_video_stream, thread_sensitive=False)(
+                    request, video_id
+                ),
+                timer,
+            ),
+            run_stage("metadata", aget_video_metadata(video_id), timer),
+            return_exceptions=True,
+        )
+        for result in (streams, metadata):
+            if isinstance(result, (requests.RequestException, asyncio.TimeoutError)):
+                logging.error("message", exc_info=result)
+                return timer.add_header(
+                    get_error_response(
+                        request,
+                        "base.html",
+                        msg="YouTube is not responding. Please try again later",
+                    )
+                )
+            if isinstance(result, BaseException):
+                raise result
+
+        self.stream_info, error_response = streams
+        if error_response is not None:
+            return timer.add_header(error_response)
+        if metadata is None:
+            return timer.add_header(
+                get_error_response(request, "invalid_video_id.html")
+            )
+
+        with timer.stage("render"):
+            data = await sync_to_async(self.render_context_data)(
+                request.POST, metadata
+            )
+        return timer.add_header(JsonResponse(data))
+
+
+async def run_stage(name: str, awaitable, timer: Type[StageTimer]):
+    """
+    Await stage bounded by its timeout and record its duration
+    """
+
+    timeout = get_stage_timeout(name)
+    try:
+        with timer.stage(name):
+            return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        timer.record(name, timeout * 1000, "timeout")
+        raise
+
+
+class AsyncRequestTranscriptionView(RequestTranscriptionView):
+    """
+    Async version of RequestTranscriptionView, transcription is
+    requested from AssemblyAi with async client
+    """
+
+    async def post(
+        self,
+        request: Type[HttpRequest],
+        token: str,
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+        user = await request.auser()
+        if not validated_video_data_token.check_token(
+            user, request.POST.get("video_id"), token
+        ):
+            return JsonResponse({"class": "success", "type": "success", "message": ""})
+
+        try:
+            transcription = await sync_to_async(self.queue_transcription)()
+            await asubmit_queued_transcriptions(
+                ids=[transcription.pk],
+                send=self.asend_queued_transcription,
+                notify_failed=False,
+            )
+            transcription = await Transcription.objects.only("status", "error").aget(
+                pk=transcription.pk
+            )
+            return self.get_submission_response(transcription)
+
+        except Exception:
+            logging.exception("message")
+            return self.get_error_response()
+
+    async def asend_queued_transcription(self, audio_url: str, *args) -> dict:
+        self.request.POST = self.request.POST.copy()
+        self.request.POST["audio_url"] = audio_url
+        return await self.arequest_audio_transcription()
+
+    async def arequest_audio_transcription(self) -> dict:
+        """
+        Async version of request_audio_transcription
+        """
+
+        user = await self.request.auser()
+        return await arequest_audio_transcription(
+            audio_url=self.request.POST.get("audio_url"),
+            video_id=self.request.POST.get("video_id"),
+            user_id=user.id,
+        )
+
+
+class AsyncReceiveTranscriptionView(ReceiveTranscriptionView):
+    """
+    Async version of ReceiveTranscriptionView. Transcript is fetched with
+    async client, creating transcription file runs in thread
+    """
+
+    async def post(
+        self,
+        request: Type[HttpRequest],
+        video_id: str,
+        user_id: str,
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+
+        status, transcript_id = self.parse_delivery(request)
+        response = await sync_to_async(self.record_delivery)(
+            video_id, user_id, status, transcript_id
+        )
+        if response is not None:
+            return response
+
+        response_type = await self.ahandle_transcription(
+            video_id=video_id,
+            user_id=user_id,
+            status=status,
+            transcript_id=transcript_id,
+        )
+        return JsonResponse({"type": response_type})
+
+    async def ahandle_transcription(
+        self,
+        video_id: str,
+        user_id: str,
+        status: str,
+        transcript_id: str,
+    ) -> str:
+        """
+        Async version of handle_transcription
+        """
+
+        claimed = await sync_to_async(self.claim_transcription)(video_id, transcript_id)
+        if claimed is None:
+            return "duplicate"
+        try:
+            transcription_response = await self.aget_transcription(transcript_id)
+        except Exception:
+            logging.exception("message")
+            return await sync_to_async(self.fail_transcription)(
+                video_id, user_id, traceback.format_exc()
+            )
+        return await sync_to_async(self.finish_transcription)(
+            video_id, user_id, status, transcript_id, transcription_response
+        )
+
+
+class AsyncGetProcessingTranscriptionsView(GetProcessingTranscriptionsView):
+    """
+    Async version of GetProcessingTranscriptionsView
+    """
+
+    async def get(
+        self,
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+        # condition decorator would read version from database in event loop
+        video_ids = get_requested_video_ids(request)
+        etag = f'"{format_etag(await aget_status_version(), video_ids)}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = JsonResponse(
+                await self.aget_processing_transcriptions(video_ids)
+            )
+            response.headers["ETag"] = etag
+        # browser has to revalidate response every time
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    async def aget_processing_transcriptions(
+        self, video_ids: Union[list, None] = None
+    ) -> dict:
+        transcriptions_video_ids = {
+            video_id
+            async for video_id in self.get_processing_queryset(video_ids).values_list(
+                "video_id", flat=True
+            )
+        }
+        return self.format_processing_transcriptions(
+            transcriptions_video_ids, video_ids
+        )
+
+
+class AsyncWaitProcessingTranscriptionsView(
+    AsyncGetProcessingTranscriptionsView, WaitProcessingTranscriptionsView
+):
+    """
+    Async version of WaitProcessingTranscriptionsView, waiting request
+    does not occupy any thread, so long polling can be used with many
+    open edit pages
+    """
+
+    def get_long_poll_timeout(self) -> float:
+        return getattr(settings, "TRANSCRIPTION_LONG_POLL_TIMEOUT", 25)
+
+    async def get(
+        self,
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+        client_version = request.GET.get("version")
+        timeout = self.get_long_poll_timeout()
+        interval = getattr(settings, "TRANSCRIPTION_LONG_POLL_INTERVAL", 1)
+
+        video_ids = get_requested_video_ids(request)
+        deadline = time.monotonic() + timeout
+        version = await aget_status_version()
+        while version == client_version and time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            version = await aget_status_version()
+
+        if version == client_version:
+            # nothing changed, client should wait again
+            return JsonResponse({"version": version, "transcriptions": None})
+
+        return JsonResponse(
+            {
+                "version": version,
+                "transcriptions": await self.aget_processing_transcriptions(
+                    video_ids
+                ),
+            }
+        )
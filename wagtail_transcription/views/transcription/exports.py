@@ -0,0 +1,63 @@
+# django
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
+
+# wagtail transcription
+from wagtail_transcription.exports import (
+    EXPORT_FORMATS,
+    get_export,
+    get_export_key,
+    get_export_max_age,
+)
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.views.mixins import ProcessTranscriptionMixin
+
+# other packages
+from typing import Type
+
+
+class TranscriptionExportView(ProcessTranscriptionMixin, View):
+    """
+    Return transcript of video as SRT, WebVTT, TXT or JSON. Export is
+    rendered on first request and stored, later requests serve stored
+    file. ETag is hash of transcript version, so unchanged export is
+    not sent again. With "download" parameter file is sent as attachment
+    """
+
+    http_method_names = ["get"]
+
+    def get(
+        self,
+        request: Type[HttpRequest],
+        video_id: str,
+        export_format: str,
+        *args,
+        **kwargs,
+    ) -> Type[HttpResponse]:
+        if export_format not in EXPORT_FORMATS:
+            raise Http404("Unknown export format")
+        transcription = get_object_or_404(
+            Transcription, video_id=video_id, status=Transcription.STATUS_DONE
+        )
+        if not transcription.file:
+            raise Http404("Transcription does not have transcript")
+
+        segmenter = self.get_phrase_segmenter()
+        key = get_export_key(transcription, export_format, segmenter)
+        etag = f'"{key}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            name = get_export(transcription, export_format, segmenter, key=key)
+            if name is None:
+                raise Http404("Transcript is not available")
+            response = FileResponse(
+                transcription.file.storage.open(name, "rb"),
+                content_type=EXPORT_FORMATS[export_format][1],
+                as_attachment="download" in request.GET,
+                filename=f"{video_id}.{EXPORT_FORMATS[export_format][2]}",
+            )
+            response["ETag"] = etag
+        patch_cache_control(response, private=True, max_age=get_export_max_age())
+        return response
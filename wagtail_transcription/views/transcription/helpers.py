@@ -2,6 +2,10 @@
 from django.http import JsonResponse, HttpRequest
 from django.views import View
 from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
 # notifications
 
@@ -11,35 +15,147 @@ from django.shortcuts import get_object_or_404
 # from wagtail_transcription.views.mixins import ReceiveTranscriptionMixin
 from wagtail_transcription.models import Transcription
 from wagtail_transcription.wagtail_hooks import TranscriptionAdmin
+from wagtail_transcription.status import get_status_version
 
 # other packages
 import re
-from typing import Type
+import time
+import zlib
+from typing import Type, Union
+
+
+# maximum number of video ids that can be checked in one request
+MAX_VIDEO_IDS = 100
+
+
+def get_requested_video_ids(request: Type[HttpRequest]) -> Union[list, None]:
+    """
+    Return sorted list of valid video ids from comma separated
+    "video_ids" parameter or None if parameter was not send
+    """
+
+    if "video_ids" not in request.GET:
+        return None
+    yt_id_regex = re.compile(r"^[a-zA-Z0-9_-]{11}$")
+    video_ids = {
+        video_id
+        for video_id in request.GET["video_ids"].split(",")
+        if yt_id_regex.match(video_id)
+    }
+    return sorted(video_ids)[:MAX_VIDEO_IDS]
+
+
+def format_etag(version: str, video_ids: Union[list, None]) -> str:
+    if video_ids is None:
+        return version
+    # response differs for different video ids
+    video_ids_hash = zlib.crc32(",".join(video_ids).encode())
+    return f"{version}-{video_ids_hash:x}"
+
+
+def processing_transcriptions_etag(request: Type[HttpRequest], *args, **kwargs) -> str:
+    video_ids = get_requested_video_ids(request)
+    return format_etag(get_status_version(), video_ids)
 
 
 class GetProcessingTranscriptionsView(View):
     """
-    Return ids of processing transcriptions
+    Return ids of processing transcriptions. Response has ETag with
+    status version, so if nothing changed since last request
+    (If-None-Match header) 304 is returned without response body
     """
 
     http_method_names = ["get"]
 
+    @method_decorator(condition(etag_func=processing_transcriptions_etag))
     def get(
         self,
         request: Type[HttpRequest],
         *args,
         **kwargs,
     ) -> Type[JsonResponse]:
-        transcriptions_video_ids = list(
-            Transcription.objects.filter(completed=False).values_list(
-                "video_id", flat=True
-            )
+        response = JsonResponse(
+            self.get_processing_transcriptions(get_requested_video_ids(request))
+        )
+        # browser has to revalidate response every time
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_processing_transcriptions(
+        self, video_ids: Union[list, None] = None
+    ) -> dict:
+        """
+        Return {video_id: True} for all processing transcriptions or,
+        if video_ids are specified, {video_id: is_processing} only
+        for specified videos
+        """
+
+        transcriptions_video_ids = set(
+            self.get_processing_queryset(video_ids).values_list("video_id", flat=True)
         )
+        return self.format_processing_transcriptions(
+            transcriptions_video_ids, video_ids
+        )
+
+    def get_processing_queryset(self, video_ids: Union[list, None] = None):
+        transcriptions = Transcription.objects.in_progress()
+        if video_ids is not None:
+            transcriptions = transcriptions.filter(video_id__in=video_ids)
+        return transcriptions
+
+    def format_processing_transcriptions(
+        self, transcriptions_video_ids: set, video_ids: Union[list, None] = None
+    ) -> dict:
+        if video_ids is not None:
+            return {
+                video_id: video_id in transcriptions_video_ids
+                for video_id in video_ids
+            }
+        return {video_id: True for video_id in transcriptions_video_ids}
 
-        transcriptions_video_ids = {
-            video_id: True for video_id in transcriptions_video_ids
-        }
-        return JsonResponse(transcriptions_video_ids)
+
+class WaitProcessingTranscriptionsView(GetProcessingTranscriptionsView):
+    """
+    Long polling version of GetProcessingTranscriptionsView. Request is
+    kept open until any transcription changes (status version differs
+    from "version" parameter) or timeout passes. While waiting only
+    status version is checked, transcriptions are listed only when
+    something changed. Waiting request occupies whole WSGI worker, so
+    sync view responds immediately unless
+    TRANSCRIPTION_SYNC_LONG_POLL_TIMEOUT is set, long polling is served
+    by AsyncWaitProcessingTranscriptionsView
+    """
+
+    def get_long_poll_timeout(self) -> float:
+        return getattr(settings, "TRANSCRIPTION_SYNC_LONG_POLL_TIMEOUT", 0)
+
+    def get(
+        self,
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+        client_version = request.GET.get("version")
+        timeout = self.get_long_poll_timeout()
+        interval = getattr(settings, "TRANSCRIPTION_LONG_POLL_INTERVAL", 1)
+
+        video_ids = get_requested_video_ids(request)
+        deadline = time.monotonic() + timeout
+        version = get_status_version()
+        while version == client_version and time.monotonic() < deadline:
+            time.sleep(interval)
+            version = get_status_version()
+
+        if version == client_version:
+            # nothing changed, client should wait again
+            return JsonResponse({"version": version, "transcriptions": None})
+
+        return JsonResponse(
+            {
+                "version": version,
+                "transcriptions": self.get_processing_transcriptions(video_ids),
+            }
+        )
 
 
 class GetTranscriptionData(View):
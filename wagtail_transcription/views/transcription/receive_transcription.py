@@ -7,18 +7,28 @@ from django.views.decorators.csrf import csrf_exempt
 from django.template import loader
 from django.core.files.base import File
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 
 # notifications
 from notifications.signals import notify
 
 # wagtail transcription
 from wagtail_transcription.views.mixins import ProcessTranscriptionMixin
-from wagtail_transcription.models import Transcription
+from wagtail_transcription.models import Transcription, TranscriptionJob
+from wagtail_transcription.payloads import load_raw_payload, store_raw_payload
+from wagtail_transcription.search import index_transcript
+from wagtail_transcription.word_index import store_word_index
 
 # other packages
+import datetime
+from functools import partial
+import hashlib
 import json
-from typing import Type
+from typing import Type, Union
 import logging
+import traceback
 
 
 # this allows to receive post request without csrf protection
@@ -41,16 +51,128 @@ class ReceiveTranscriptionView(ProcessTranscriptionMixin, View):
         **kwargs,
     ) -> Type[JsonResponse]:
 
+        status, transcript_id = self.parse_delivery(request)
+        response = self.record_delivery(video_id, user_id, status, transcript_id)
+        if response is not None:
+            return response
+
+        response_type = self.handle_transcription(
+            video_id=video_id,
+            user_id=user_id,
+            status=status,
+            transcript_id=transcript_id,
+        )
+        return JsonResponse({"type": response_type})
+
+    def parse_delivery(self, request: Type[HttpRequest]) -> tuple:
+        """
+        Return (status, transcript_id) of webhook delivery
+        """
+
         try:
             request_body = json.loads(request.body.decode("utf-8"))
-            status = request_body.get("status")
-            transcript_id = request_body.get("transcript_id")
+            return request_body.get("status"), request_body.get("transcript_id")
         except Exception:
             logging.exception("message")
-            status, transcript_id = None, None
+            return None, None
+
+    def record_delivery(
+        self,
+        video_id: str,
+        user_id: str,
+        status: Union[str, None],
+        transcript_id: Union[str, None],
+    ) -> Union[Type[JsonResponse], None]:
+        """
+        Return response for duplicated delivery or delivery recorded for
+        transcription_worker. None is returned if delivery should be
+        processed now
+        """
+
+        # AssemblyAi can deliver webhook more than once, answer
+        # duplicates without fetching or rendering anything
+        if not self.get_claimable_transcriptions(video_id, transcript_id).exists():
+            return JsonResponse({"type": "duplicate"})
+
+        if not getattr(settings, "TRANSCRIPTION_BACKGROUND_PROCESSING", False):
+            return None
+        if (
+            transcript_id
+            and TranscriptionJob.objects.filter(
+                kind=TranscriptionJob.KIND_TRANSCRIPT,
+                transcript_id=transcript_id,
+                status__in=[
+                    TranscriptionJob.STATUS_PENDING,
+                    TranscriptionJob.STATUS_RUNNING,
+                ],
+            ).exists()
+        ):
+            return JsonResponse({"type": "duplicate"})
+        # only record job, transcription_worker command will process it
+        TranscriptionJob.objects.create(
+            video_id=video_id,
+            user_id=int(user_id),
+            transcript_id=transcript_id or "",
+            transcript_status=status or "",
+        )
+        return JsonResponse({"type": "queued"}, status=202)
+
+    def handle_transcription(
+        self,
+        video_id: str,
+        user_id: str,
+        status: str,
+        transcript_id: str,
+        transcription_response: Union[dict, None] = None,
+        raise_errors: bool = False,
+    ) -> str:
+        """
+        Fetch transcript (unless it was already fetched), create
+        transcription file and notify user about result. Used by webhook,
+        transcription_worker and reconcile_transcriptions commands.
+        Returns "success", "error" or "duplicate" if transcript was
+        already processed by other delivery. With raise_errors
+        transcription is released and error is raised, so caller can
+        try again later
+        """
 
+        if self.claim_transcription(video_id, transcript_id) is None:
+            return "duplicate"
+        try:
+            if transcription_response is None:
+                transcription_response = self.get_transcription(transcript_id)
+        except Exception:
+            logging.exception("message")
+            if raise_errors:
+                self.release_transcription(video_id)
+                raise
+            return self.fail_transcription(video_id, user_id, traceback.format_exc())
+        return self.finish_transcription(
+            video_id,
+            user_id,
+            status,
+            transcript_id,
+            transcription_response,
+            raise_errors=raise_errors,
+        )
+
+    def finish_transcription(
+        self,
+        video_id: str,
+        user_id: str,
+        status: str,
+        transcript_id: str,
+        transcription_response: dict,
+        raise_errors: bool = False,
+    ) -> str:
+        """
+        Create transcription file from fetched transcript (or record
+        error) and notify user about result
+        """
+
+        # worker process does not have any request
+        request = getattr(self, "request", None)
         try:
-            transcription_response = self.get_transcription(transcript_id)
             if status == "completed" and transcript_id:
                 # process transcription
                 transcription = self.process_transcription_response(
@@ -60,34 +182,60 @@ class ReceiveTranscriptionView(ProcessTranscriptionMixin, View):
                 notification_message = loader.render_to_string(
                     "wagtail_transcription/components/transcription_received_popup.html",
                     context={"transcription": transcription, "video_id": video_id},
-                    request=self.request,
+                    request=request,
                 )
                 response_type = "success"
             else:
-                # If error delete uncompleted Transcription
-                Transcription.objects.filter(video_id=video_id).delete()
+                # keep failed transcription, so it can be requested again
+                error = transcription_response.get("error", "")
+                self.set_status(video_id, Transcription.STATUS_FAILED, error=error)
                 notification_message = loader.render_to_string(
                     "wagtail_transcription/components/transcription_received_popup.html",
                     context={
                         "error": True,
                         "video_id": video_id,
-                        "extra_text": transcription_response.get("error", ""),
+                        "extra_text": error,
                     },
-                    request=self.request,
+                    request=request,
                 )
                 response_type = "error"
 
         except Exception:
             logging.exception("message")
-            # If error delete uncompleted Transcription
-            Transcription.objects.filter(video_id=video_id).delete()
-            notification_message = loader.render_to_string(
-                "wagtail_transcription/components/transcription_received_popup.html",
-                context={"error": True, "video_id": video_id},
-                request=self.request,
-            )
-            response_type = "error"
+            if raise_errors:
+                self.release_transcription(video_id)
+                raise
+            return self.fail_transcription(video_id, user_id, traceback.format_exc())
+
+        self.notify_user(user_id, notification_message)
+        return response_type
 
+    def release_transcription(self, video_id: str) -> None:
+        """
+        Move claimed transcription back to submitted, so delivery can be
+        processed again
+        """
+
+        Transcription.objects.filter(
+            video_id=video_id,
+            status__in=[
+                Transcription.STATUS_PROCESSING,
+                Transcription.STATUS_RENDERING,
+            ],
+        ).update(status=Transcription.STATUS_SUBMITTED, processing_at=None)
+
+    def fail_transcription(self, video_id: str, user_id: str, error: str) -> str:
+        # keep failed transcription, so it can be requested again
+        self.set_status(video_id, Transcription.STATUS_FAILED, error=error)
+        notification_message = loader.render_to_string(
+            "wagtail_transcription/components/transcription_received_popup.html",
+            context={"error": True, "video_id": video_id},
+            request=getattr(self, "request", None),
+        )
+        self.notify_user(user_id, notification_message)
+        return "error"
+
+    def notify_user(self, user_id: str, notification_message: str) -> None:
         # send notification
         user = get_user_model().objects.get(id=int(user_id))
         notify.send(
@@ -96,7 +244,86 @@ class ReceiveTranscriptionView(ProcessTranscriptionMixin, View):
             verb="Message",
             description=notification_message,
         )
-        return JsonResponse({"type": response_type})
+
+    def get_claimable_transcriptions(
+        self, video_id: str, transcript_id: Union[str, None]
+    ) -> Type[QuerySet]:
+        """
+        Transcription of video that waits for transcript_id delivery.
+        Transcription left in processing by dead worker can be claimed
+        again after TRANSCRIPTION_JOB_LOCK_TIMEOUT seconds
+        """
+
+        lock_timeout = getattr(settings, "TRANSCRIPTION_JOB_LOCK_TIMEOUT", 600)
+        queryset = Transcription.objects.filter(video_id=video_id).filter(
+            Q(status__in=[Transcription.STATUS_QUEUED, Transcription.STATUS_SUBMITTED])
+            | Q(
+                status__in=[
+                    Transcription.STATUS_PROCESSING,
+                    Transcription.STATUS_RENDERING,
+                ],
+                processing_at__lt=timezone.now()
+                - datetime.timedelta(seconds=lock_timeout),
+            )
+        )
+        if transcript_id:
+            # transcriptions submitted before transcript id was stored have it
+            # empty, queued again transcription can not receive old transcript
+            queryset = queryset.filter(transcript_id__in=[transcript_id, ""]).exclude(
+                status=Transcription.STATUS_QUEUED, transcript_id=transcript_id
+            )
+        return queryset
+
+    def claim_transcription(
+        self, video_id: str, transcript_id: Union[str, None]
+    ) -> Union[Type[Transcription], None]:
+        """
+        Lock transcription and move it to processing, so only one
+        delivery processes it. Returns None if transcription was already
+        claimed by other delivery
+        """
+
+        with transaction.atomic():
+            transcription = (
+                self.get_claimable_transcriptions(video_id, transcript_id)
+                .select_for_update(skip_locked=True)
+                .first()
+            )
+            if transcription is None:
+                return None
+
+            # conditional update protects databases without row locks
+            now = timezone.now()
+            # transcriptions submitted before transcript id was stored get it
+            transcript_id = transcript_id or transcription.transcript_id
+            claimed = Transcription.objects.filter(
+                pk=transcription.pk,
+                status=transcription.status,
+                processing_at=transcription.processing_at,
+            ).update(
+                status=Transcription.STATUS_PROCESSING,
+                processing_at=now,
+                error="",
+                transcript_id=transcript_id,
+            )
+            if not claimed:
+                return None
+
+        transcription.status = Transcription.STATUS_PROCESSING
+        transcription.processing_at = now
+        transcription.error = ""
+        transcription.transcript_id = transcript_id
+        return transcription
+
+    def set_status(self, video_id: str, status: str, error: str = "") -> None:
+        """
+        Move not finished transcription of video to new status
+        """
+
+        for transcription in Transcription.objects.in_progress().filter(
+            video_id=video_id
+        ):
+            transcription.set_status(status, error=error)
 
     def process_transcription_response(
         self,
@@ -110,18 +337,98 @@ class ReceiveTranscriptionView(ProcessTranscriptionMixin, View):
         -   video_id - id of youtube video for which transcription was made
         """
 
+        self.set_status(video_id, Transcription.STATUS_RENDERING)
+        transcription = Transcription.objects.get(video_id=video_id)
+        transcription = self.render_transcription(transcription, transcription_response)
+        try:
+            # keep response, so transcription can be rendered again offline
+            store_raw_payload(transcription, transcription_response)
+            if self.defer_outputs() and transcription.transcript_id:
+                transaction.on_commit(partial(self.schedule_outputs, transcription))
+            else:
+                self.store_outputs(transcription, transcription_response)
+        except Exception:
+            logging.exception("message")
+        return transcription
+
+    def render_transcription(
+        self,
+        transcription: Type[Transcription],
+        transcription_response: dict,
+    ) -> Type[Transcription]:
+        """
+        Create transcription file from AssemblyAi response. Used also to
+        render transcription again from stored raw payload
+        """
+
         words = transcription_response.get("words")
         transcript_docx_io = self.create_transcript_docx(words)
 
         # create file instance
         docx_file = File(
             transcript_docx_io,
-            name=f"auto_transcription-{video_id}.docx",
+            name=f"auto_transcription-{transcription.video_id}.docx",
         )
         # update Transcription instance
-        transcription = Transcription.objects.get(video_id=video_id)
         transcription.file = docx_file
-        transcription.completed = True
+        content = transcript_docx_io.getbuffer()
+        transcription.file_size = content.nbytes
+        # content hash identifies version of exports created from transcript
+        transcription.file_hash = hashlib.sha1(content).hexdigest()
+        content.release()
+        transcription.set_status(Transcription.STATUS_DONE, save=False)
         transcription.save()
         # return transcription
         return transcription
+
+    def defer_outputs(self) -> bool:
+        """
+        With TRANSCRIPTION_BACKGROUND_PROCESSING outputs of transcript
+        processed while AssemblyAi waits for webhook response are stored
+        later by transcription_worker
+        """
+
+        return getattr(self, "request", None) is not None and getattr(
+            settings, "TRANSCRIPTION_BACKGROUND_PROCESSING", False
+        )
+
+    def schedule_outputs(self, transcription: Type[Transcription]) -> None:
+        TranscriptionJob.objects.create(
+            kind=TranscriptionJob.KIND_OUTPUTS,
+            video_id=transcription.video_id,
+            transcript_id=transcription.transcript_id,
+        )
+
+    def store_outputs(
+        self,
+        transcription: Type[Transcription],
+        transcription_response: dict,
+    ) -> None:
+        """
+        Store searchable text and word timings of transcript
+        """
+
+        words = transcription_response.get("words") or []
+        # store plain text of transcript, so it can be searched
+        index_transcript(transcription, self.phreses_generator(words))
+        # keep word timings for playback synchronization
+        store_word_index(transcription, words)
+
+    def handle_outputs(self, video_id: str, transcript_id: str) -> str:
+        """
+        Store outputs from raw payload stored by webhook. Used by
+        transcription_worker, errors are raised so job is retried
+        """
+
+        transcription = Transcription.objects.filter(
+            video_id=video_id,
+            transcript_id=transcript_id,
+            status=Transcription.STATUS_DONE,
+        ).first()
+        transcription_response = transcription and load_raw_payload(transcription)
+        if transcription_response is None:
+            # transcription was deleted, requested again or its payload
+            # was replaced
+            return "duplicate"
+        self.store_outputs(transcription, transcription_response)
+        return "success"
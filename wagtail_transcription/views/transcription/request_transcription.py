@@ -1,18 +1,22 @@
 # django
-from django.http import JsonResponse, HttpRequest
+from django.http import JsonResponse, HttpRequest, QueryDict
 from django.views import View
-from django.shortcuts import reverse
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db.models import Model
 from django.db import transaction
-from django.apps import apps
 
 # wagtail transcription
+from wagtail_transcription import submission
 from wagtail_transcription.models import Transcription
 from wagtail_transcription.tokens import validated_video_data_token
+from wagtail_transcription.submission import (
+    get_or_create_transcription,
+    get_parent_instance,
+    submit_queued_transcriptions,
+)
 
 # other packages
-import requests
 from typing import Type
 import logging
 
@@ -62,43 +66,59 @@ class RequestTranscriptionView(View):
                 }
             )
 
-        error_msg = None
         try:
-            with transaction.atomic():
-                # create transcription with completed=False
-                transcription = Transcription.objects.create(
-                    title=f"auto_transcription-{data.get('video_id')}",
-                    video_id=data.get("video_id"),
-                )
-                # set transcription for parent model
-                model_instance = self.get_parent_instance(
-                    data.get("parent_instance_str")
-                )
-                # set video_id
-                setattr(model_instance, data.get("field_name"), data.get("video_id"))
-                # set transcription instance
-                setattr(model_instance, data.get("transcription_field"), transcription)
-                model_instance.save()
-
-                response = self.request_audio_transcription()
-                # if response do not have id raise error
-                if response.get("id") is None:
-                    error_msg = response.get("error")
-                    raise ValueError()
-
-            return JsonResponse({"class": "success", "type": "success"})
+            transcription = self.queue_transcription()
+
+            # request is sent after queued transcription is committed, so
+            # transaction is not open during request. If submission limits
+            # are reached transcription stays queued and is submitted later.
+            # Audio url is resolved again if it expires before submission
+            submit_queued_transcriptions(
+                ids=[transcription.pk],
+                send=self.send_queued_transcription,
+                notify_failed=False,
+            )
+            transcription.refresh_from_db(fields=["status", "error"])
+            return self.get_submission_response(transcription)
 
         except Exception:
             logging.exception("message")
-            return JsonResponse(
-                {
-                    "class": "error",
-                    "type": "error",
-                    "message": (
-                        error_msg or "Ops... Something went wrong. Try again later."
-                    ),
-                }
+            return self.get_error_response()
+
+    def queue_transcription(self) -> Type[Transcription]:
+        """
+        Create queued transcription and set it for parent instance
+        """
+
+        data = self.request.POST
+        with transaction.atomic():
+            transcription = get_or_create_transcription(
+                data.get("video_id"), data.get("audio_url"), self.request.user.id
             )
+            # set transcription for parent model
+            model_instance = self.get_parent_instance(data.get("parent_instance_str"))
+            # set video_id
+            setattr(model_instance, data.get("field_name"), data.get("video_id"))
+            # set transcription instance
+            setattr(model_instance, data.get("transcription_field"), transcription)
+            model_instance.save()
+        return transcription
+
+    def get_submission_response(
+        self, transcription: Type[Transcription]
+    ) -> Type[JsonResponse]:
+        if transcription.status == Transcription.STATUS_FAILED:
+            return self.get_error_response(transcription.error)
+        return JsonResponse({"class": "success", "type": "success"})
+
+    def get_error_response(self, message: str = "") -> Type[JsonResponse]:
+        return JsonResponse(
+            {
+                "class": "error",
+                "type": "error",
+                "message": message or "Ops... Something went wrong. Try again later.",
+            }
+        )
 
     def get_parent_instance(
         self,
@@ -109,39 +129,46 @@ class RequestTranscriptionView(View):
         representation. "app:model_name:instance_id"
         """
 
-        try:
-            app, model, instance_id = parent_instance_str.split(":")
-            model_instance = apps.get_model(app, model).objects.get(id=str(instance_id))
-            return model_instance
-        except (AttributeError, ValueError, LookupError):
-            return None
+        return get_parent_instance(parent_instance_str)
+
+    @classmethod
+    def for_submission(
+        cls, audio_url: str, video_id: str, user_id: int
+    ) -> "RequestTranscriptionView":
+        """
+        View with request data of queued transcription, used to send it
+        with request_audio_transcription outside of request (e.g. by
+        transcription_worker or bulk_transcribe)
+        """
+
+        request = HttpRequest()
+        request.method = "POST"
+        request.POST = QueryDict(mutable=True)
+        request.POST.update({"audio_url": audio_url, "video_id": video_id})
+        user = get_user_model()(pk=user_id)
+
+        async def auser():
+            return user
+
+        request.user = user
+        request.auser = auser
+        view = cls()
+        view.setup(request)
+        return view
+
+    def send_queued_transcription(self, audio_url: str, *args) -> dict:
+        # audio url is resolved again if it expired before submission
+        self.request.POST = self.request.POST.copy()
+        self.request.POST["audio_url"] = audio_url
+        return self.request_audio_transcription()
 
     def request_audio_transcription(self) -> dict:
         """
         Send transcription request to assemblyai
         """
 
-        # webhook_url will be then used by assemblyai to send
-        # request about finished transcription or errors
-        webhook_url = settings.BASE_URL.strip("/") + reverse(
-            "wagtail_transcription:receive_transcription",
-            kwargs={
-                "video_id": self.request.POST.get("video_id"),
-                "user_id": self.request.user.id,
-            },
+        return submission.request_audio_transcription(
+            audio_url=self.request.POST.get("audio_url"),
+            video_id=self.request.POST.get("video_id"),
+            user_id=self.request.user.id,
         )
-
-        # send request to assemblyai
-        endpoint = "https://api.assemblyai.com/v2/transcript"
-        json = {
-            "audio_url": self.request.POST.get("audio_url"),
-            "webhook_url": webhook_url,
-            "speaker_labels": True,
-        }
-        headers = {
-            "authorization": self.api_token,
-            "content-type": "application/json",
-        }
-
-        r = requests.post(endpoint, json=json, headers=headers)
-        return r.json()
@@ -0,0 +1,35 @@
+# django
+from django.http import JsonResponse, HttpRequest
+from django.views import View
+
+# wagtail transcription
+from wagtail_transcription.search import get_search_limit, search_transcripts
+from wagtail_transcription.wagtail_hooks import TranscriptionAdmin
+
+# other packages
+from typing import Type
+
+
+class SearchTranscriptsView(View):
+    """
+    Return transcript segments matching "q" parameter ordered by rank,
+    with snippet and timestamp of every match. At most "limit" (max 100)
+    results are returned
+    """
+
+    http_method_names = ["get"]
+
+    def get(
+        self,
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+        query = request.GET.get("q", "")
+        results = search_transcripts(query, get_search_limit(request.GET.get("limit")))
+        url_helper = TranscriptionAdmin().url_helper
+        for result in results:
+            result["edit_url"] = url_helper.get_action_url(
+                "edit", result["transcription_id"]
+            )
+        return JsonResponse({"query": query, "results": results})
@@ -2,20 +2,78 @@
 from django.http import JsonResponse, HttpRequest
 from django.views import View
 from django.conf import settings
+from django.db import close_old_connections, connection
 from django.utils.decorators import method_decorator
 from django.template import loader
 
-# pytube
-from pytube import YouTube
-
 # wagtail transcription
-from wagtail_transcription.decorators import video_data_validation
+from wagtail_transcription.decorators import (
+    get_error_response,
+    get_video_stream,
+    video_instance_validation,
+)
+from wagtail_transcription.timing import StageTimer, get_stage_timer
 from wagtail_transcription.tokens import validated_video_data_token
+from wagtail_transcription.youtube import get_video_metadata
 
 # other packages
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 import requests
+import logging
+import threading
 import time
-from typing import Type
+from typing import Type, Union
+
+
+# threads resolving YouTube streams and video data of validated videos
+_validation_executor = None
+_validation_executor_lock = threading.Lock()
+
+
+def get_validation_executor() -> Type[ThreadPoolExecutor]:
+    global _validation_executor
+    with _validation_executor_lock:
+        if _validation_executor is None:
+            _validation_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "TRANSCRIPTION_VALIDATION_WORKERS", 8),
+                thread_name_prefix="transcription-validation",
+            )
+        return _validation_executor
+
+
+def get_stage_timeout(stage: str) -> float:
+    """
+    Seconds after which validation stops waiting for "streams"
+    (TRANSCRIPTION_STREAMS_TIMEOUT) or "metadata"
+    (TRANSCRIPTION_METADATA_TIMEOUT) stage
+    """
+
+    return getattr(
+        settings,
+        f"TRANSCRIPTION_{stage.upper()}_TIMEOUT",
+        {"streams": 15, "metadata": 10}[stage],
+    )
+
+
+def wait_for_stage(
+    future: Type[Future],
+    stage: str,
+    timeout: float,
+    started: float,
+    timer: Type[StageTimer],
+):
+    """
+    Return result of stage started at started (time.monotonic) or
+    raise TimeoutError if it did not finish within timeout seconds
+    """
+
+    try:
+        return future.result(timeout=max(0, started + timeout - time.monotonic()))
+    except FuturesTimeoutError:
+        # thread is not interrupted, it only stops being waited for
+        timer.record(stage, timeout * 1000, "timeout")
+        raise TimeoutError(f"{stage} did not finish in {timeout} seconds")
 
 
 class ValidateTranscriptionDataView(View):
@@ -44,29 +102,60 @@ class ValidateTranscriptionDataView(View):
 
     http_method_names = ["post"]
 
-    @method_decorator(video_data_validation)
+    @method_decorator(video_instance_validation)
     def post(
         self,
         request: Type[HttpRequest],
-        youtube_instance: Type[YouTube],
         *args,
         **kwargs,
     ) -> Type[JsonResponse]:
 
-        self.youtube_instance = youtube_instance
-        data = self.get_context_data(request.POST)
-        return JsonResponse(data)
-
-    def get_context_data(self, data: dict) -> dict:
-        """
-        return data that will be returned by JsonResponse
-        """
-
-        # get video data (title, thumbnail, channel etc)
-        url = f"https://www.googleapis.com/youtube/v3/videos?part=snippet&id={data.get('video_id')}&key={settings.YOUTUBE_DATA_API_KEY}"
-        r = requests.get(url)
-        snippet = r.json()["items"][0]["snippet"]
-
+        timer = get_stage_timer(request)
+        video_id = request.POST.get("video_id")
+        # audio streams and video data do not depend on each other
+        executor = get_validation_executor()
+        streams = executor.submit(
+            timer.timed("streams", get_video_stream), request, video_id
+        )
+        metadata = executor.submit(
+            timer.timed("metadata", self.get_video_metadata_in_thread), video_id
+        )
+        started = time.monotonic()
+        try:
+            self.stream_info, error_response = wait_for_stage(
+                streams, "streams", get_stage_timeout("streams"), started, timer
+            )
+            if error_response is not None:
+                return timer.add_header(error_response)
+            metadata = wait_for_stage(
+                metadata, "metadata", get_stage_timeout("metadata"), started, timer
+            )
+        except (requests.RequestException, TimeoutError):
+            logging.exception("message")
+            return timer.add_header(
+                get_error_response(
+                    request,
+                    "base.html",
+                    msg="YouTube is not responding. Please try again later",
+                )
+            )
+        if metadata is None:
+            return timer.add_header(
+                get_error_response(request, "invalid_video_id.html")
+            )
+
+        with timer.stage("render"):
+            data = self.render_context_data(request.POST, metadata)
+        return timer.add_header(JsonResponse(data))
+
+    def get_video_metadata_in_thread(self, video_id: str) -> Union[dict, None]:
+        close_old_connections()
+        try:
+            return get_video_metadata(video_id)
+        finally:
+            connection.close()
+
+    def render_context_data(self, data: dict, metadata: dict) -> dict:
         # generate video info popup content
         message = loader.render_to_string(
             "wagtail_transcription/components/transcription_info_popup.html",
@@ -75,12 +164,12 @@ class ValidateTranscriptionDataView(View):
                     self.request.user, data.get("video_id")
                 ),
                 "audio_duration": time.strftime(
-                    "%H:%M:%S", time.gmtime(self.youtube_instance.length // 1.25)
+                    "%H:%M:%S", time.gmtime(self.stream_info["length"] // 1.25)
                 ),
-                "video_title": snippet["title"],
-                "video_thumbnail": snippet["thumbnails"]["default"]["url"],
-                "channel_name": snippet["channelTitle"],
-                "audio_url": self.youtube_instance.streams[0].url,
+                "video_title": metadata["title"],
+                "video_thumbnail": metadata["thumbnail"],
+                "channel_name": metadata["channel_title"],
+                "audio_url": self.stream_info["audio_url"],
                 **{k: data.get(k) for k, _ in data.items()},
             },
             request=self.request,
@@ -0,0 +1,65 @@
+# django
+from django.conf import settings
+from django.http import Http404, JsonResponse, HttpRequest
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+# wagtail transcription
+from wagtail_transcription.models import Transcription
+from wagtail_transcription.submission import VIDEO_ID_REGEX
+from wagtail_transcription.views.mixins import ProcessTranscriptionMixin
+from wagtail_transcription.word_index import get_word_index
+
+# other packages
+from typing import Type, Union
+
+
+def get_milliseconds(value: Union[str, None], default: int) -> int:
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+class TranscriptionWordsView(ProcessTranscriptionMixin, View):
+    """
+    Return words (or phrases if "unit" parameter is "phrases") of video
+    transcript spoken between "start" and "end" milliseconds. Words are
+    found with binary search in stored word index, so lookup does not
+    depend on length of recording
+    """
+
+    http_method_names = ["get"]
+
+    def get(
+        self,
+        request: Type[HttpRequest],
+        *args,
+        **kwargs,
+    ) -> Type[JsonResponse]:
+        video_id = request.GET.get("video_id")
+        if not VIDEO_ID_REGEX.match(str(video_id)):
+            raise Http404("Invalid video id")
+        transcription = get_object_or_404(
+            Transcription.objects.only("pk"), video_id=video_id
+        )
+        index = get_word_index(transcription.pk)
+        if index is None:
+            raise Http404("Transcription does not have word timings")
+
+        start = get_milliseconds(request.GET.get("start"), 0)
+        end = get_milliseconds(request.GET.get("end"), index.duration + 1)
+        max_words = getattr(settings, "TRANSCRIPTION_WORDS_MAX_RESULTS", 5000)
+        indexes = index.between(start, end)
+        words = index.words_between(start, end, limit=max_words)
+        data = {
+            "video_id": video_id,
+            "start": start,
+            "end": end,
+            "truncated": len(indexes) > len(words),
+        }
+        if request.GET.get("unit") == "phrases":
+            data["phrases"] = list(self.get_phrase_segmenter().segment(words))
+        else:
+            data["words"] = words
+        return JsonResponse(data)
@@ -1,17 +1,139 @@
 from typing import Type
 
+import logging
 import requests
 from django.conf import settings
+from django.contrib import messages
+from django.shortcuts import redirect
 from django.template import loader
-from django.urls import reverse
+from django.urls import re_path, reverse
 from django.utils.translation import gettext_lazy as _
 from wagtail import VERSION as WAGTAIL_VERSION
 from wagtail import hooks
 from wagtail.admin.menu import Menu, SubmenuMenuItem
+from wagtail_modeladmin.helpers import AdminURLHelper
 from wagtail_modeladmin.options import ModelAdmin, modeladmin_register
+from wagtail_modeladmin.views import IndexView, WMABaseView
 from wagtail.documents.wagtail_hooks import DocumentsMenuItem
+from django.views.generic import TemplateView
+from django.views.generic.edit import FormView
 
+from .bulk import get_progress, start_bulk_transcription
+from .forms import BulkTranscriptionForm, TranscriptSearchForm
 from .models import Transcription
+from .search import search_transcripts
+from .youtube import get_video_metadata, get_videos_metadata
+
+
+class TranscriptionURLHelper(AdminURLHelper):
+    # actions that do not need object id
+    NON_OBJECT_ACTIONS = (
+        "create",
+        "choose_parent",
+        "index",
+        "bulk_transcribe",
+        "search_transcripts",
+    )
+
+    def get_action_url_pattern(self, action):
+        if action in self.NON_OBJECT_ACTIONS:
+            return self._get_action_url_pattern(action)
+        return self._get_object_specific_action_url_pattern(action)
+
+    def get_action_url(self, action, *args, **kwargs):
+        if action in self.NON_OBJECT_ACTIONS:
+            return reverse(self.get_action_url_name(action))
+        return super().get_action_url(action, *args, **kwargs)
+
+
+class TranscriptionIndexView(IndexView):
+    """
+    Fetch YouTube data of all videos displayed on page at once,
+    instead of requesting it separately for every row
+    """
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        object_list = list(context["object_list"])
+        try:
+            videos = get_videos_metadata(
+                [obj.video_id for obj in object_list if obj.video_id]
+            )
+        except (KeyError, ValueError, requests.RequestException):
+            logging.exception("message")
+            videos = {}
+
+        for obj in object_list:
+            obj.video_metadata = videos.get(obj.video_id)
+        context["object_list"] = object_list
+        context["bulk_transcribe_url"] = self.url_helper.get_action_url(
+            "bulk_transcribe"
+        )
+        context["search_transcripts_url"] = self.url_helper.get_action_url(
+            "search_transcripts"
+        )
+        return context
+
+
+class BulkTranscriptionView(WMABaseView, FormView):
+    """
+    Request transcriptions of many videos at once. Videos are
+    processed in background and user is notified when all of
+    them are submitted
+    """
+
+    page_title = "Bulk transcription"
+    form_class = BulkTranscriptionForm
+    template_name = "wagtail_transcription/admin/bulk_transcription.html"
+
+    def check_action_permitted(self, user):
+        return self.permission_helper.user_can_create(user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["progress"] = get_progress(self.request.user.id)
+        if context["progress"]:
+            context["processed"] = sum(context["progress"]["counts"].values())
+        return context
+
+    def form_valid(self, form):
+        targets = form.get_targets()
+        if start_bulk_transcription(
+            self.request.user, targets, dry_run=form.cleaned_data["dry_run"]
+        ):
+            messages.success(
+                self.request,
+                f"Processing {len(targets)} videos. You will be notified when it finishes",
+            )
+        else:
+            messages.error(self.request, "Previous bulk transcription is still running")
+        return redirect(self.url_helper.get_action_url("bulk_transcribe"))
+
+
+class TranscriptSearchView(WMABaseView, TemplateView):
+    """
+    Search text of all transcripts. Matches are ranked and displayed
+    with snippet and timestamp of phrase
+    """
+
+    page_title = "Search transcripts"
+    template_name = "wagtail_transcription/admin/search_transcripts.html"
+
+    def check_action_permitted(self, user):
+        return self.permission_helper.user_can_list(user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = TranscriptSearchForm(self.request.GET or None)
+        results = []
+        if form.is_valid():
+            results = search_transcripts(form.cleaned_data["q"], limit=50)
+        for result in results:
+            result["edit_url"] = self.url_helper.get_action_url(
+                "edit", result["transcription_id"]
+            )
+        context.update({"form": form, "results": results})
+        return context
 
 
 class TranscriptionAdmin(ModelAdmin):
@@ -26,11 +148,34 @@ class TranscriptionAdmin(ModelAdmin):
     list_display = (
         "title",
         "video",
-        "completed",
+        "status",
         "verified",
     )
-    list_filter = ["completed", "verified"]
+    list_filter = ["status", "verified"]
     search_fields = ["title"]
+    index_view_class = TranscriptionIndexView
+    index_template_name = "wagtail_transcription/admin/index.html"
+    url_helper_class = TranscriptionURLHelper
+
+    def bulk_transcription_view(self, request):
+        return BulkTranscriptionView.as_view(model_admin=self)(request)
+
+    def search_transcripts_view(self, request):
+        return TranscriptSearchView.as_view(model_admin=self)(request)
+
+    def get_admin_urls_for_registration(self):
+        return super().get_admin_urls_for_registration() + (
+            re_path(
+                self.url_helper.get_action_url_pattern("bulk_transcribe"),
+                self.bulk_transcription_view,
+                name=self.url_helper.get_action_url_name("bulk_transcribe"),
+            ),
+            re_path(
+                self.url_helper.get_action_url_pattern("search_transcripts"),
+                self.search_transcripts_view,
+                name=self.url_helper.get_action_url_name("search_transcripts"),
+            ),
+        )
 
     def video(self, obj: Type[Transcription]):
         """
@@ -38,19 +183,24 @@ class TranscriptionAdmin(ModelAdmin):
         data (thumbnail, title, url)
         """
 
-        url = f"https://www.googleapis.com/youtube/v3/videos?part=snippet&id={obj.video_id}&key={settings.YOUTUBE_DATA_API_KEY}"  # noqa
-        r = requests.get(url)
-        context = {"obj": obj}
+        context = {"obj": obj, "thumbnail": None, "title": None}
         try:
-            snippet = r.json()["items"][0]["snippet"]
+            if hasattr(obj, "video_metadata"):
+                # prefetched by TranscriptionIndexView
+                metadata = obj.video_metadata
+            else:
+                metadata = get_video_metadata(obj.video_id) if obj.video_id else None
+        except (KeyError, ValueError, requests.RequestException):
+            logging.exception("message")
+            metadata = None
+
+        if metadata is not None:
             context.update(
                 {
-                    "thumbnail": snippet["thumbnails"]["default"]["url"],
-                    "title": snippet["title"],
+                    "thumbnail": metadata["thumbnail"],
+                    "title": metadata["title"],
                 }
             )
-        except IndexError:
-            context.update({"thumbnail": None, "title": None})
 
         return loader.render_to_string(
             "wagtail_transcription/admin/video_data.html",
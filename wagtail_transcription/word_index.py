@@ -0,0 +1,189 @@
+from django.conf import settings
+
+from wagtail_transcription.models import Transcription, TranscriptWordIndex
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import cached_property
+import struct
+import sys
+import threading
+from typing import Iterable, Type, Union
+
+# Binary layout (little endian), every section starts at 4 byte boundary:
+#   header: magic, version, padding, word count, string count, speaker count
+#   starts: uint32 * words - start of word in milliseconds, sorted
+#   ends: uint32 * words - end of word in milliseconds
+#   texts: uint32 * words - index of word text in string table
+#   offsets: uint32 * (strings + speakers + 1) - offsets in string table
+#   speakers: uint16 * words - index of speaker (strings + index in table)
+#   string table: utf-8 texts of words followed by speaker labels
+MAGIC = b"WTWI"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def encode_word_index(words: Iterable[dict]) -> bytes:
+    """
+    Pack AssemblyAi words (text, start, end, speaker) into binary blob.
+    Repeated texts and speakers are stored only once
+    """
+
+    strings, speakers = {}, {}
+    starts, ends, texts, speaker_ids = array("I"), array("I"), array("I"), array("H")
+    for word in sorted(words, key=lambda word: word["start"]):
+        start = max(int(word["start"]), 0)
+        starts.append(start)
+        ends.append(max(int(word.get("end") or start), start))
+        texts.append(strings.setdefault(word.get("text") or "", len(strings)))
+        speaker_ids.append(
+            speakers.setdefault(str(word.get("speaker") or ""), len(speakers))
+        )
+
+    table = [text.encode("utf-8") for text in list(strings) + list(speakers)]
+    offsets = array("I", [0])
+    for encoded in table:
+        offsets.append(offsets[-1] + len(encoded))
+    sections = [starts, ends, texts, offsets, speaker_ids]
+    if not LITTLE_ENDIAN:
+        for section in sections:
+            section.byteswap()
+
+    speakers_bytes = speaker_ids.tobytes()
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, VERSION, 0, len(starts), len(strings), len(speakers)),
+            *(section.tobytes() for section in sections[:-1]),
+            speakers_bytes,
+            # keep string table aligned
+            b"\0" * (-len(speakers_bytes) % 4),
+            b"".join(table),
+        ]
+    )
+
+
+class WordIndex:
+    """
+    Read only view of blob created by encode_word_index. Arrays are not
+    copied, texts are decoded only for returned words, so lookups take
+    O(log n) time and little memory even for very long recordings
+    """
+
+    def __init__(self, data: bytes):
+        magic, version, _, words, strings, speakers = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Unsupported word index format")
+        self.buffer = memoryview(data)
+        self.strings = strings
+        offset = HEADER.size
+        self.starts, offset = self.section("I", offset, words)
+        self.ends, offset = self.section("I", offset, words)
+        self.texts, offset = self.section("I", offset, words)
+        self.offsets, offset = self.section("I", offset, strings + speakers + 1)
+        self.speakers, offset = self.section("H", offset, words)
+        self.table = self.buffer[offset + (-offset % 4) :]
+
+    def section(self, typecode: str, offset: int, count: int) -> tuple:
+        end = offset + array(typecode).itemsize * count
+        if LITTLE_ENDIAN:
+            return self.buffer[offset:end].cast(typecode), end
+        values = array(typecode)
+        values.frombytes(self.buffer[offset:end])
+        values.byteswap()
+        return values, end
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @cached_property
+    def duration(self) -> int:
+        # ends are not sorted, index is cached so they are scanned once
+        return max(self.ends) if len(self) else 0
+
+    def string(self, index: int) -> str:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return bytes(self.table[start:end]).decode("utf-8")
+
+    def word(self, index: int) -> dict:
+        return {
+            "text": self.string(self.texts[index]),
+            "start": self.starts[index],
+            "end": self.ends[index],
+            "speaker": self.string(self.strings + self.speakers[index]),
+        }
+
+    def between(self, start: int, end: int) -> range:
+        """
+        Range of indexes of words spoken between start and end
+        milliseconds (words overlapping boundaries are included)
+        """
+
+        first = bisect_left(self.starts, start)
+        # previous word can still be spoken at start
+        if first > 0 and self.ends[first - 1] > start:
+            first -= 1
+        last = bisect_left(self.starts, end, lo=first)
+        return range(first, max(first, last))
+
+    def words_between(
+        self, start: int, end: int, limit: Union[int, None] = None
+    ) -> list:
+        indexes = self.between(start, end)
+        if limit is not None:
+            indexes = indexes[:limit]
+        return [self.word(index) for index in indexes]
+
+
+def store_word_index(
+    transcription: Type[Transcription], words: Iterable[dict]
+) -> Type[TranscriptWordIndex]:
+    data = encode_word_index(words)
+    index = WordIndex(data)
+    word_index, _ = TranscriptWordIndex.objects.update_or_create(
+        transcription=transcription,
+        defaults={
+            "data": data,
+            "word_count": len(index),
+            "duration_ms": index.duration,
+        },
+    )
+    return word_index
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_word_index(transcription_id: int) -> Union[WordIndex, None]:
+    """
+    Return word index of transcription or None if it was not stored.
+    Recently used indexes are kept in memory of process
+    (TRANSCRIPTION_WORD_INDEX_CACHE_SIZE) until they are replaced
+    """
+
+    row = (
+        TranscriptWordIndex.objects.filter(transcription_id=transcription_id)
+        .values_list("pk", "updated_at")
+        .first()
+    )
+    if row is None:
+        return None
+    key = (transcription_id, row[1])
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    data = TranscriptWordIndex.objects.values_list("data", flat=True).get(pk=row[0])
+    index = WordIndex(bytes(data))
+    cache_size = getattr(settings, "TRANSCRIPTION_WORD_INDEX_CACHE_SIZE", 8)
+    with _cache_lock:
+        # forget replaced index of the same transcription
+        for stale_key in [k for k in _cache if k[0] == transcription_id]:
+            del _cache[stale_key]
+        _cache[key] = index
+        while len(_cache) > cache_size:
+            _cache.popitem(last=False)
+    return index
@@ -0,0 +1,258 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from wagtail_transcription.client import get_async_http_client, get_http_client
+from wagtail_transcription.models import VideoMetadata
+
+import datetime
+import logging
+import re
+import threading
+import time
+from typing import Union
+
+VIDEOS_API_URL = "https://www.googleapis.com/youtube/v3/videos"
+# YouTube Data API accepts at most 50 ids in one videos request
+MAX_IDS_PER_REQUEST = 50
+ISO_DURATION_REGEX = re.compile(
+    r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+
+def get_cache_key(video_id: str) -> str:
+    return f"wagtail_transcription:video_metadata:{video_id}"
+
+
+def get_ttl() -> int:
+    """
+    Number of seconds after which metadata is refreshed in background
+    """
+    return getattr(settings, "TRANSCRIPTION_VIDEO_METADATA_TTL", 60 * 60 * 24)
+
+
+def get_max_age() -> int:
+    """
+    Number of seconds after which not refreshed metadata is removed
+    """
+    return getattr(settings, "TRANSCRIPTION_VIDEO_METADATA_MAX_AGE", 60 * 60 * 24 * 30)
+
+
+def parse_duration(duration: str) -> Union[int, None]:
+    """
+    Convert ISO 8601 duration used by YouTube ("PT1H2M3S") to seconds
+    """
+
+    match = ISO_DURATION_REGEX.match(duration or "")
+    if not match:
+        return None
+    parts = {k: int(v or 0) for k, v in match.groupdict().items()}
+    return (
+        parts["days"] * 86400
+        + parts["hours"] * 3600
+        + parts["minutes"] * 60
+        + parts["seconds"]
+    )
+
+
+def fetch_videos_metadata(video_ids: list) -> Union[dict, None]:
+    """
+    Request YouTube Data API for metadata of (at most 50) videos and
+    return dict {video_id: metadata}. Videos that do not exist are
+    missing in returned dict. None is returned if API responded with
+    error (e.g. exceeded quota), so nothing is known about videos
+    """
+
+    r = get_http_client().get(VIDEOS_API_URL, params=get_videos_params(video_ids))
+    return parse_videos_response(r.status_code, r.json())
+
+
+async def afetch_videos_metadata(video_ids: list) -> Union[dict, None]:
+    """
+    Async version of fetch_videos_metadata
+    """
+
+    r = await get_async_http_client().get(
+        VIDEOS_API_URL, params=get_videos_params(video_ids)
+    )
+    return parse_videos_response(r.status_code, r.json())
+
+
+def get_videos_params(video_ids: list) -> dict:
+    return {
+        "part": "snippet,contentDetails",
+        "id": ",".join(video_ids),
+        "key": settings.YOUTUBE_DATA_API_KEY,
+    }
+
+
+def parse_videos_response(status_code: int, response: dict) -> Union[dict, None]:
+    if status_code != 200 or not isinstance(response.get("items"), list):
+        logging.error(f"YouTube Data API responded with {status_code}")
+        return None
+    fetched_at = time.time()
+    videos = {}
+    for item in response["items"]:
+        snippet = item.get("snippet", {})
+        videos[item["id"]] = {
+            "video_id": item["id"],
+            "title": snippet.get("title", ""),
+            "channel_title": snippet.get("channelTitle", ""),
+            "thumbnail": snippet.get("thumbnails", {}).get("default", {}).get("url", ""),
+            "duration": parse_duration(
+                item.get("contentDetails", {}).get("duration")
+            ),
+            "fetched_at": fetched_at,
+        }
+    return videos
+
+
+def store_videos_metadata(video_ids: list, videos: Union[dict, None]) -> None:
+    """
+    Save fetched metadata in cache and database. Videos that were not
+    found are cached as None so they are not requested on every render.
+    Nothing is changed if API responded with error
+    """
+
+    if videos is None:
+        return
+    cache.set_many(
+        {get_cache_key(video_id): videos[video_id] for video_id in videos},
+        get_max_age(),
+    )
+    cache.set_many(
+        {
+            get_cache_key(video_id): None
+            for video_id in video_ids
+            if video_id not in videos
+        },
+        get_ttl(),
+    )
+    for video_id, metadata in videos.items():
+        VideoMetadata.objects.update_or_create(
+            video_id=video_id,
+            defaults={
+                "title": metadata["title"][:255],
+                "channel_title": metadata["channel_title"][:255],
+                "thumbnail": metadata["thumbnail"],
+                "duration": metadata["duration"],
+                "fetched_at": datetime.datetime.fromtimestamp(
+                    metadata["fetched_at"], tz=datetime.timezone.utc
+                ),
+            },
+        )
+
+
+def refresh_videos_metadata(video_ids: list) -> dict:
+    videos = fetch_videos_metadata(video_ids)
+    store_videos_metadata(video_ids, videos)
+    return videos or {}
+
+
+def _refresh_in_background(video_ids: list) -> None:
+    try:
+        close_old_connections()
+        refresh_videos_metadata(video_ids)
+        # evict metadata of videos that were not displayed for long time
+        VideoMetadata.objects.filter(
+            fetched_at__lt=timezone.now() - datetime.timedelta(seconds=get_max_age())
+        ).delete()
+    except Exception:
+        logging.exception("message")
+    finally:
+        connection.close()
+
+
+def schedule_refresh(video_ids: list) -> None:
+    """
+    Refresh stale metadata in background thread. Lock in cache makes
+    sure that only one process refreshes the same video at once
+    """
+
+    video_ids = [
+        video_id
+        for video_id in video_ids
+        if cache.add(f"{get_cache_key(video_id)}:refresh", True, 60)
+    ]
+    if video_ids:
+        threading.Thread(
+            target=_refresh_in_background, args=(video_ids,), daemon=True
+        ).start()
+
+
+def is_stale(metadata: dict) -> bool:
+    return time.time() - metadata["fetched_at"] > get_ttl()
+
+
+def get_stored_videos_metadata(video_ids: list) -> tuple:
+    """
+    Return ({video_id: metadata}, not_stored_video_ids) for videos stored
+    in cache or database and schedule refresh of stale ones
+    """
+
+    cached = cache.get_many([get_cache_key(video_id) for video_id in video_ids])
+    videos, missing = {}, []
+    for video_id in video_ids:
+        cache_key = get_cache_key(video_id)
+        if cache_key not in cached:
+            missing.append(video_id)
+        elif cached[cache_key] is not None:
+            videos[video_id] = cached[cache_key]
+
+    if missing:
+        stored = {
+            metadata.video_id: metadata.as_dict()
+            for metadata in VideoMetadata.objects.filter(video_id__in=missing)
+        }
+        if stored:
+            cache.set_many(
+                {get_cache_key(k): v for k, v in stored.items()}, get_max_age()
+            )
+            videos.update(stored)
+
+    stale = [video_id for video_id, metadata in videos.items() if is_stale(metadata)]
+    for i in range(0, len(stale), MAX_IDS_PER_REQUEST):
+        schedule_refresh(stale[i : i + MAX_IDS_PER_REQUEST])
+
+    not_stored = [video_id for video_id in missing if video_id not in videos]
+    return videos, not_stored
+
+
+def get_videos_metadata(video_ids: list) -> dict:
+    """
+    Return dict {video_id: metadata} for many videos at once. Videos
+    missing in cache are read from database with one query and videos
+    that are not stored anywhere are requested from YouTube Data API
+    in batches of 50 ids. Videos that do not exist are not returned.
+    """
+
+    videos, not_stored = get_stored_videos_metadata(list(dict.fromkeys(video_ids)))
+    for i in range(0, len(not_stored), MAX_IDS_PER_REQUEST):
+        videos.update(refresh_videos_metadata(not_stored[i : i + MAX_IDS_PER_REQUEST]))
+    return videos
+
+
+def get_video_metadata(video_id: str) -> Union[dict, None]:
+    """
+    Return metadata of YouTube video (title, channel_title, thumbnail,
+    duration) or None if video does not exist. Metadata is read from
+    cache, then from database and only if it is not stored anywhere
+    YouTube Data API is requested. Stale metadata is returned
+    immediately and refreshed in background.
+    """
+
+    return get_videos_metadata([video_id]).get(video_id)
+
+
+async def aget_video_metadata(video_id: str) -> Union[dict, None]:
+    """
+    Async version of get_video_metadata used by async views
+    """
+
+    videos, not_stored = await sync_to_async(get_stored_videos_metadata)([video_id])
+    if not_stored:
+        videos = await afetch_videos_metadata(not_stored)
+        await sync_to_async(store_videos_metadata)(not_stored, videos)
+    return (videos or {}).get(video_id)